@@ -1,228 +1,63 @@
 """
-Simplified Flask Backend - Core Aluminum Models Only
-==================================================
+Simplified Flask Backend - Core Aluminum Models
+===============================================
 
-Focus on the aluminum ML models without environmental claims analyzer.
+Focus on the aluminum ML models. The environmental claims analyzer is served
+from ``/api/claims/analyze`` and loads in the background, so it never delays
+startup or assessments.
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask
 from flask_cors import CORS
-import json
-import joblib
-import numpy as np
-import pandas as pd
-from datetime import datetime
 import logging
-import os
+import sys
 from pathlib import Path
 
+# Make backend/shared importable when this file is run directly
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from shared.assessment_routes import READINESS_HEADERS, create_assessment_blueprint
+from shared.claims_routes import create_claims_blueprint
+from shared.job_routes import create_jobs_blueprint
+from shared.json_provider import init_json
+from shared.metrics_routes import create_metrics_blueprint
+from shared.pipelines import get_pipeline
+from shared.request_logging import configure_logging, init_request_logging
+
 app = Flask(__name__)
-CORS(app)
+CORS(app, expose_headers=READINESS_HEADERS)
+init_request_logging(app)
+init_json(app)
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+configure_logging()
 logger = logging.getLogger(__name__)
 
-# Model paths - using the improved aluminum models
-MODEL_DIR = Path(__file__).parent.parent.parent / "models" / "aluminum"
-TIMESTAMP = "20250919_005442"
-
-ENVIRONMENTAL_MODEL_PATH = MODEL_DIR / f"environmental_model_{TIMESTAMP}.pkl"
-CIRCULARITY_MODEL_PATH = MODEL_DIR / f"circularity_model_{TIMESTAMP}.pkl" 
-CLASSIFICATION_MODEL_PATH = MODEL_DIR / f"classification_model_{TIMESTAMP}.pkl"
-CLASSIFICATION_ENCODER_PATH = MODEL_DIR / f"classification_encoder_{TIMESTAMP}.pkl"
+# Features, models and LCA metrics live in the shared aluminum pipeline
+pipeline = get_pipeline("aluminum")
 
-# Global variables for loaded models
-environmental_model = None
-circularity_model = None
-classification_model = None
-classification_encoder = None
-models_loaded = False
+def active_models():
+    """Active aluminum model version from the shared registry (models load lazily on first use)"""
+    return pipeline.active_models()
 
 def load_aluminum_models():
-    """Load the improved aluminum-specific ML models"""
-    global environmental_model, circularity_model, classification_model
-    global classification_encoder, models_loaded
-    
-    try:
-        logger.info("🔬 Loading improved aluminum ML models...")
-        
-        # Load Environmental Efficiency Model
-        if ENVIRONMENTAL_MODEL_PATH.exists():
-            environmental_model = joblib.load(ENVIRONMENTAL_MODEL_PATH)
-            logger.info("✅ Aluminum environmental efficiency model loaded (R² = 0.707)")
-        else:
-            logger.warning("⚠️ Environmental model file not found")
-            
-        # Load Circularity Predictor Model
-        if CIRCULARITY_MODEL_PATH.exists():
-            circularity_model = joblib.load(CIRCULARITY_MODEL_PATH)
-            logger.info("✅ Aluminum circularity predictor model loaded (R² = 0.90)")
-        else:
-            logger.warning("⚠️ Circularity model file not found")
-            
-        # Load Process Classifier Model
-        if CLASSIFICATION_MODEL_PATH.exists():
-            classification_model = joblib.load(CLASSIFICATION_MODEL_PATH)
-            logger.info("✅ Aluminum process classifier model loaded (90.4% accuracy)")
-        else:
-            logger.warning("⚠️ Process classifier file not found")
-            
-        # Load Classification Encoder
-        if CLASSIFICATION_ENCODER_PATH.exists():
-            classification_encoder = joblib.load(CLASSIFICATION_ENCODER_PATH)
-            logger.info("✅ Classification encoder loaded")
-        else:
-            logger.warning("⚠️ Classification encoder file not found")
-            
-        models_loaded = True
-        logger.info("🎉 All aluminum models loaded successfully!")
-        
-    except Exception as e:
-        logger.error(f"❌ Error loading aluminum models: {str(e)}")
-        models_loaded = False
-
-def prepare_environmental_features(assessment_data):
-    """Prepare features for aluminum environmental efficiency prediction"""
-    try:
-        # Extract and convert data
-        scrap_ratio = float(assessment_data.get('scrapRatio', 0)) / 100.0
-        recycling_rate = float(assessment_data.get('recyclingRate', 0)) / 100.0
-        waste_ratio = float(assessment_data.get('wasteRatio', 0)) / 100.0
-        energy_recovery_rate = float(assessment_data.get('energyRecoveryRate', 0)) / 100.0
-        secondary_material_fraction = float(assessment_data.get('secondaryMaterialFraction', 0)) / 100.0
-        material_efficiency = float(assessment_data.get('materialEfficiency', 0)) / 100.0
-        total_inputs = float(assessment_data.get('totalInputs', 100))
-        total_outputs = float(assessment_data.get('totalOutputs', 80))
-        
-        # Estimate realistic energy consumption for aluminum recycling
-        energy_source = assessment_data.get('energySource', 'grid')
-        if energy_source == 'renewable':
-            specific_energy = 3.5  # GJ/ton (efficient with renewable)
-        elif energy_source == 'grid':
-            specific_energy = 4.8  # GJ/ton (average grid mix)
-        else:
-            specific_energy = 6.2  # GJ/ton (coal/gas)
-        
-        is_metallurgy = 1 if assessment_data.get('isMetallurgy', False) else 0
-        has_circularity = 1 if assessment_data.get('hasCircularity', False) else 0
-        
-        # Create feature array matching training data
-        features = [
-            scrap_ratio,
-            recycling_rate,
-            waste_ratio,
-            energy_recovery_rate,
-            secondary_material_fraction,
-            material_efficiency,
-            specific_energy,
-            is_metallurgy,
-            has_circularity,
-            np.log1p(total_inputs),  # total_inputs_log
-            np.log1p(total_outputs), # total_outputs_log
-            1.0 / (specific_energy + 0.1)  # energy_efficiency
-        ]
-        
-        return np.array(features).reshape(1, -1)
-        
-    except Exception as e:
-        logger.error(f"Error preparing environmental features: {str(e)}")
-        return None
-
-def prepare_circularity_features(assessment_data):
-    """Prepare features for aluminum circularity prediction"""
-    try:
-        material_efficiency = float(assessment_data.get('materialEfficiency', 0)) / 100.0
-        secondary_material_fraction = float(assessment_data.get('secondaryMaterialFraction', 0)) / 100.0
-        total_inputs = float(assessment_data.get('totalInputs', 100))
-        total_outputs = float(assessment_data.get('totalOutputs', 80))
-        
-        # Estimate energy consumption
-        energy_source = assessment_data.get('energySource', 'grid')
-        if energy_source == 'renewable':
-            specific_energy = 3.5
-        elif energy_source == 'grid':
-            specific_energy = 4.8
-        else:
-            specific_energy = 6.2
-        
-        is_metallurgy = 1 if assessment_data.get('isMetallurgy', False) else 0
-        
-        # Create feature array for circularity model
-        features = [
-            material_efficiency,
-            secondary_material_fraction,
-            specific_energy,
-            is_metallurgy,
-            np.log1p(total_inputs),
-            np.log1p(total_outputs)
-        ]
-        
-        return np.array(features).reshape(1, -1)
-        
-    except Exception as e:
-        logger.error(f"Error preparing circularity features: {str(e)}")
-        return None
-
-def calculate_aluminum_lca_metrics(assessment_data, env_efficiency, circ_metrics):
-    """Calculate realistic LCA metrics for aluminum recycling"""
-    try:
-        production_scale = float(assessment_data.get('productionScale', 500))
-        energy_source = assessment_data.get('energySource', 'grid')
-        
-        # Realistic energy consumption (GJ/ton) for aluminum
-        if energy_source == 'renewable':
-            base_energy = 3.5
-        elif energy_source == 'grid':
-            base_energy = 4.8
-        else:
-            base_energy = 6.2
-        
-        # Adjust based on efficiency
-        energy_per_ton = base_energy * (1.5 - env_efficiency)
-        total_energy = energy_per_ton * production_scale  # GJ
-        energy_mj = total_energy * 1000  # Convert to MJ
-        
-        # Realistic carbon footprint calculation for aluminum
-        if energy_source == 'renewable':
-            energy_emissions = 0.02  # tons CO2/GJ (minimal for renewables)
-        elif energy_source == 'grid':
-            energy_emissions = 0.15  # tons CO2/GJ (average grid)
-        else:
-            energy_emissions = 0.25  # tons CO2/GJ (fossil fuel)
-        
-        # Process emissions for aluminum (from melting, transport, etc.)
-        process_emissions = 0.08  # tons CO2/ton Al (industry average)
-        
-        carbon_footprint = (total_energy * energy_emissions) + (production_scale * process_emissions)
-        
-        # Realistic water usage for aluminum
-        water_per_ton = 2.5 + (5.0 * (1.0 - env_efficiency))  # 2.5-7.5 m³/ton
-        if energy_source == 'renewable':
-            water_per_ton *= 0.8  # Closed-loop systems often used with renewables
-        
-        water_usage = water_per_ton * production_scale
-        
-        return {
-            'carbon_footprint': round(carbon_footprint, 2),
-            'energy_consumption': round(energy_mj, 2),
-            'water_usage': round(water_usage, 2)
-        }
-        
-    except Exception as e:
-        logger.error(f"Error calculating aluminum LCA metrics: {str(e)}")
-        return {
-            'carbon_footprint': 250.0,  # Fallback values
-            'energy_consumption': 2250.0,
-            'water_usage': 1250.0
-        }
+    """Resolve the active aluminum model version at startup; individual models load on first use"""
+    models = active_models()
+    if models.version is None:
+        logger.error("❌ No aluminum model versions found")
+    else:
+        logger.info(f"🔬 Aluminum models version {models.version} registered: {models.status()}")
+    return models
 
 @app.route('/')
 def home():
     """API documentation"""
+    model_version = active_models().version
     return f"""
     <h1>🔬 Aluminum LCA ML Backend</h1>
-    <h2>Real Aluminum Recycling Models - {TIMESTAMP}</h2>
+    <h2>Real Aluminum Recycling Models - {model_version}</h2>
     
     <h3>📊 Model Performance:</h3>
     <ul>
@@ -235,151 +70,22 @@ def home():
     <ul>
         <li><code>GET /api/health</code> - Health check</li>
         <li><code>POST /api/submit-solution</code> - LCA assessment</li>
+        <li><code>POST /api/submit-solutions/batch</code> - Batch LCA assessment</li>
+        <li><code>POST /api/models/activate</code> - Swap in a model version</li>
+        <li><code>POST /api/jobs</code> - Queue a large portfolio for background scoring</li>
+        <li><code>GET /api/jobs/&lt;job_id&gt;</code> - Job progress and paged results</li>
+        <li><code>POST /api/claims/analyze</code> - Environmental claims in a text, a list of texts or a report</li>
+        <li><code>GET /api/claims/status</code> - Claims classifier state (warming / ready)</li>
+        <li><code>GET /metrics</code> - Prometheus metrics (stage timings, fallbacks, cache)</li>
     </ul>
     """
 
-@app.route('/api/health')
-def health_check():
-    """Health check endpoint"""
-    model_status = {
-        'environmental_model': environmental_model is not None,
-        'circularity_model': circularity_model is not None,
-        'classification_model': classification_model is not None,
-        'classification_encoder': classification_encoder is not None
-    }
-    
-    return jsonify({
-        'success': True,
-        'message': 'Aluminum LCA ML Backend is running',
-        'models_loaded': models_loaded,
-        'model_status': model_status,
-        'model_timestamp': TIMESTAMP,
-        'ml_ready': all(model_status.values()),
-        'aluminum_models': True,
-        'timestamp': datetime.now().isoformat()
-    })
-
-@app.route('/api/submit-solution', methods=['POST'])
-def submit_aluminum_assessment():
-    """Process aluminum LCA assessment with improved ML models"""
-    try:
-        data = request.get_json()
-        assessment_data = data.get('assessment_data', {})
-        
-        logger.info(f"🔬 Processing aluminum assessment with ML models: {models_loaded}")
-        
-        # Initialize results
-        results = {
-            "success": True,
-            "using_ml_models": models_loaded,
-            "model_version": TIMESTAMP,
-            "data_quality": "aluminum_industry_validated",
-            "model_predictions": {},
-            "lca_metrics": {},
-            "evaluation": {},
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        if models_loaded and environmental_model is not None:
-            # Use Improved Aluminum Environmental Efficiency Model
-            try:
-                env_features = prepare_environmental_features(assessment_data)
-                if env_features is not None:
-                    env_efficiency = environmental_model.predict(env_features)[0]
-                    results["model_predictions"]["environmental_efficiency"] = float(env_efficiency)
-                    logger.info(f"✅ Aluminum environmental efficiency predicted: {env_efficiency:.3f}")
-                else:
-                    results["model_predictions"]["environmental_efficiency"] = 0.75
-                    logger.warning("⚠️ Using default environmental efficiency")
-            except Exception as e:
-                logger.error(f"❌ Environmental model error: {str(e)}")
-                results["model_predictions"]["environmental_efficiency"] = 0.75
-        else:
-            results["model_predictions"]["environmental_efficiency"] = 0.75
-            
-        if models_loaded and circularity_model is not None:
-            # Use Improved Aluminum Circularity Predictor Model
-            try:
-                circ_features = prepare_circularity_features(assessment_data)
-                if circ_features is not None:
-                    circ_prediction = circularity_model.predict(circ_features)[0]
-                    
-                    results["model_predictions"]["circularity_metrics"] = {
-                        "circularity_index": float(circ_prediction[1]),  # Use recycling rate as circularity index
-                        "recycling_rate": float(circ_prediction[1]),
-                        "waste_ratio": float(circ_prediction[2]),
-                        "material_efficiency": float(results["model_predictions"]["environmental_efficiency"])
-                    }
-                    logger.info(f"✅ Aluminum circularity predicted: recycling={circ_prediction[1]:.3f}")
-                else:
-                    results["model_predictions"]["circularity_metrics"] = {
-                        "circularity_index": 0.85,
-                        "recycling_rate": 0.85,
-                        "waste_ratio": 0.08,
-                        "material_efficiency": 0.83
-                    }
-            except Exception as e:
-                logger.error(f"❌ Circularity model error: {str(e)}")
-                results["model_predictions"]["circularity_metrics"] = {
-                    "circularity_index": 0.85,
-                    "recycling_rate": 0.85,
-                    "waste_ratio": 0.08,
-                    "material_efficiency": 0.83
-                }
-        else:
-            results["model_predictions"]["circularity_metrics"] = {
-                "circularity_index": 0.85,
-                "recycling_rate": 0.85,
-                "waste_ratio": 0.08,
-                "material_efficiency": 0.83
-            }
-        
-        # Calculate realistic aluminum LCA metrics
-        env_efficiency = results["model_predictions"]["environmental_efficiency"]
-        circ_metrics = results["model_predictions"]["circularity_metrics"]
-        
-        lca_metrics = calculate_aluminum_lca_metrics(assessment_data, env_efficiency, circ_metrics)
-        results["lca_metrics"] = lca_metrics
-        
-        # Enhanced evaluation
-        overall_score = (env_efficiency + circ_metrics["circularity_index"]) / 2
-        results["evaluation"] = {
-            "overall_score": float(overall_score),
-            "environmental_score": float(env_efficiency),
-            "circularity_score": float(circ_metrics["circularity_index"]),
-            "evaluation_method": "aluminum_ml_models",
-            "feedback": f"Aluminum recycling assessment shows {'excellent' if overall_score > 0.8 else 'good' if overall_score > 0.6 else 'moderate'} sustainability performance with industry-validated predictions."
-        }
-        
-        # Generate aluminum-specific recommendations
-        recommendations = []
-        if env_efficiency < 0.7:
-            recommendations.append("🔋 Consider transitioning to renewable energy sources to improve aluminum recycling efficiency")
-        if circ_metrics["recycling_rate"] < 0.8:
-            recommendations.append("♻️ Increase recycled aluminum content to achieve higher circularity performance")
-        if lca_metrics["carbon_footprint"] / float(assessment_data.get('productionScale', 500)) > 1.0:
-            recommendations.append("🌱 Optimize aluminum melting process efficiency to reduce carbon intensity")
-        if lca_metrics["water_usage"] / float(assessment_data.get('productionScale', 500)) > 5.0:
-            recommendations.append("💧 Implement closed-loop water recycling to minimize aluminum processing water consumption")
-        
-        if not recommendations:
-            recommendations.append("✅ Excellent aluminum recycling performance! Your process meets industry best practices")
-        
-        results["recommendations"] = recommendations
-        
-        logger.info(f"🎯 Aluminum assessment completed successfully with improved models")
-        return jsonify(results)
-        
-    except Exception as e:
-        logger.error(f"❌ Error processing aluminum assessment: {str(e)}")
-        return jsonify({
-            "success": False,
-            "error": f"Aluminum assessment processing failed: {str(e)}",
-            "using_ml_models": False,
-            "timestamp": datetime.now().isoformat()
-        }), 500
+app.register_blueprint(create_assessment_blueprint("aluminum_assessment", pipeline), url_prefix='/api')
+app.register_blueprint(create_jobs_blueprint("aluminum_jobs", pipeline), url_prefix='/api')
+app.register_blueprint(create_claims_blueprint("aluminum_claims"), url_prefix='/api')
+app.register_blueprint(create_metrics_blueprint("aluminum_metrics"))
 
-# Load aluminum models at startup
+# Resolve the aluminum model version at startup
 load_aluminum_models()
 
 if __name__ == '__main__':
@@ -387,8 +93,8 @@ if __name__ == '__main__':
     print(f"📡 API Documentation: http://localhost:5000/")
     print(f"🔧 Health Check: http://localhost:5000/api/health")
     print(f"🌐 CORS enabled for React frontend")
-    print(f"🧠 Aluminum ML Models Status: {'✅ Loaded' if models_loaded else '❌ Failed'}")
-    print(f"📊 Model Version: {TIMESTAMP}")
+    print(f"🧠 Aluminum ML Models Status: {'✅ Registered' if active_models().version else '❌ Failed'}")
+    print(f"📊 Model Version: {active_models().version}")
     print(f"🎯 Ready for real aluminum recycling LCA assessments!")
     
     app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
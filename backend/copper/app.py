@@ -5,269 +5,57 @@ Flask Backend for Copper LCA Assessment
 Copper-specific ML models for Life Cycle Assessment predictions.
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask
 from flask_cors import CORS
-import json
-import joblib
-import numpy as np
-import pandas as pd
-from datetime import datetime
 import logging
-import os
+import sys
 from pathlib import Path
 
+# Make backend/shared importable when this file is run directly
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from shared.assessment_routes import READINESS_HEADERS, create_assessment_blueprint
+from shared.claims_routes import create_claims_blueprint
+from shared.job_routes import create_jobs_blueprint
+from shared.json_provider import init_json
+from shared.metrics_routes import create_metrics_blueprint
+from shared.pipelines import get_pipeline
+from shared.request_logging import configure_logging, init_request_logging
+
 app = Flask(__name__)
-CORS(app)
+CORS(app, expose_headers=READINESS_HEADERS)
+init_request_logging(app)
+init_json(app)
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+configure_logging()
 logger = logging.getLogger(__name__)
 
-# Model paths - using the copper models
-MODEL_DIR = Path(__file__).parent.parent.parent / "models" / "copper"
-TIMESTAMP = "20250919_025639"
-
-ENVIRONMENTAL_MODEL_PATH = MODEL_DIR / f"copper_environmental_model_{TIMESTAMP}.pkl"
-CIRCULARITY_MODEL_PATH = MODEL_DIR / f"copper_circularity_model_{TIMESTAMP}.pkl"
-CLASSIFICATION_MODEL_PATH = MODEL_DIR / f"copper_classification_model_{TIMESTAMP}.pkl"
-CLASSIFICATION_ENCODER_PATH = MODEL_DIR / f"copper_classification_encoder_{TIMESTAMP}.pkl"
-ENERGY_ENCODER_PATH = MODEL_DIR / f"copper_energy_encoder_{TIMESTAMP}.pkl"
-LOCATION_ENCODER_PATH = MODEL_DIR / f"copper_location_encoder_{TIMESTAMP}.pkl"
+# Features, models and LCA metrics live in the shared copper pipeline
+pipeline = get_pipeline("copper")
 
-# Global variables for loaded models
-environmental_model = None
-circularity_model = None
-classification_model = None
-classification_encoder = None
-energy_encoder = None
-location_encoder = None
-models_loaded = False
+def active_models():
+    """Active copper model version from the shared registry (models load lazily on first use)"""
+    return pipeline.active_models()
 
 def load_copper_models():
-    """Load the copper-specific ML models"""
-    global environmental_model, circularity_model, classification_model
-    global classification_encoder, energy_encoder, location_encoder, models_loaded
-    
-    try:
-        logger.info("🔬 Loading copper ML models...")
-        
-        # Load Environmental Efficiency Model
-        if ENVIRONMENTAL_MODEL_PATH.exists():
-            environmental_model = joblib.load(ENVIRONMENTAL_MODEL_PATH)
-            logger.info("✅ Copper environmental efficiency model loaded (R² = 0.9999)")
-        else:
-            logger.warning("⚠️ Environmental model file not found")
-            
-        # Load Circularity Predictor Model
-        if CIRCULARITY_MODEL_PATH.exists():
-            circularity_model = joblib.load(CIRCULARITY_MODEL_PATH)
-            logger.info("✅ Copper circularity predictor model loaded (R² = 0.98)")
-        else:
-            logger.warning("⚠️ Circularity model file not found")
-            
-        # Load Process Classifier Model
-        if CLASSIFICATION_MODEL_PATH.exists():
-            classification_model = joblib.load(CLASSIFICATION_MODEL_PATH)
-            logger.info("✅ Copper process classifier model loaded (90% accuracy)")
-        else:
-            logger.warning("⚠️ Process classifier file not found")
-            
-        # Load Encoders
-        if CLASSIFICATION_ENCODER_PATH.exists():
-            classification_encoder = joblib.load(CLASSIFICATION_ENCODER_PATH)
-            logger.info("✅ Classification encoder loaded")
-        else:
-            logger.warning("⚠️ Classification encoder file not found")
-            
-        if ENERGY_ENCODER_PATH.exists():
-            energy_encoder = joblib.load(ENERGY_ENCODER_PATH)
-            logger.info("✅ Energy encoder loaded")
-        else:
-            logger.warning("⚠️ Energy encoder file not found")
-            
-        if LOCATION_ENCODER_PATH.exists():
-            location_encoder = joblib.load(LOCATION_ENCODER_PATH)
-            logger.info("✅ Location encoder loaded")
-        else:
-            logger.warning("⚠️ Location encoder file not found")
-            
-        models_loaded = True
-        logger.info("🎉 All copper models loaded successfully!")
-        
-    except Exception as e:
-        logger.error(f"❌ Error loading copper models: {str(e)}")
-        models_loaded = False
-
-def prepare_environmental_features(assessment_data):
-    """Prepare features for copper environmental efficiency prediction"""
-    try:
-        # Extract and convert data
-        production_scale = float(assessment_data.get('productionScale', 500))
-        recycling_rate = float(assessment_data.get('recyclingRate', 0)) / 100.0
-        material_efficiency = float(assessment_data.get('materialEfficiency', 0)) / 100.0
-        scrap_ratio = float(assessment_data.get('scrapRatio', 0)) / 100.0
-        secondary_material_fraction = float(assessment_data.get('secondaryMaterialFraction', 0)) / 100.0
-        energy_recovery_rate = float(assessment_data.get('energyRecoveryRate', 0)) / 100.0
-        total_inputs = float(assessment_data.get('totalInputs', 100))
-        total_outputs = float(assessment_data.get('totalOutputs', 80))
-        is_metallurgy = 1 if assessment_data.get('isMetallurgy', False) else 0
-        has_circularity = 1 if assessment_data.get('hasCircularity', False) else 0
-        
-        # Encode categorical features
-        energy_source = assessment_data.get('energySource', 'grid')
-        location = assessment_data.get('location', 'industrial')
-        
-        # Encode energy source
-        try:
-            if energy_encoder is not None:
-                energy_encoded = energy_encoder.transform([energy_source])[0]
-            else:
-                energy_map = {'renewable': 0, 'grid': 1, 'coal': 2, 'gas': 3}
-                energy_encoded = energy_map.get(energy_source, 1)
-        except:
-            energy_map = {'renewable': 0, 'grid': 1, 'coal': 2, 'gas': 3}
-            energy_encoded = energy_map.get(energy_source, 1)
-        
-        # Encode location
-        try:
-            if location_encoder is not None:
-                location_encoded = location_encoder.transform([location])[0]
-            else:
-                location_map = {'urban': 0, 'industrial': 1, 'remote': 2}
-                location_encoded = location_map.get(location, 1)
-        except:
-            location_map = {'urban': 0, 'industrial': 1, 'remote': 2}
-            location_encoded = location_map.get(location, 1)
-        
-        # Create feature array matching training data
-        # Features: production_scale, energy_source, location, recycling_rate, 
-        # material_efficiency, scrap_ratio, secondary_material_fraction, 
-        # energy_recovery_rate, total_inputs, total_outputs, is_metallurgy, has_circularity
-        features = [
-            production_scale,
-            energy_encoded,
-            location_encoded,
-            recycling_rate,
-            material_efficiency,
-            scrap_ratio,
-            secondary_material_fraction,
-            energy_recovery_rate,
-            total_inputs,
-            total_outputs,
-            is_metallurgy,
-            has_circularity
-        ]
-        
-        return np.array(features).reshape(1, -1)
-        
-    except Exception as e:
-        logger.error(f"Error preparing environmental features: {str(e)}")
-        return None
-
-def prepare_circularity_features(assessment_data):
-    """Prepare features for copper circularity prediction"""
-    try:
-        production_scale = float(assessment_data.get('productionScale', 500))
-        material_efficiency = float(assessment_data.get('materialEfficiency', 0)) / 100.0
-        scrap_ratio = float(assessment_data.get('scrapRatio', 0)) / 100.0
-        secondary_material_fraction = float(assessment_data.get('secondaryMaterialFraction', 0)) / 100.0
-        energy_recovery_rate = float(assessment_data.get('energyRecoveryRate', 0)) / 100.0
-        total_inputs = float(assessment_data.get('totalInputs', 100))
-        total_outputs = float(assessment_data.get('totalOutputs', 80))
-        is_metallurgy = 1 if assessment_data.get('isMetallurgy', False) else 0
-        has_circularity = 1 if assessment_data.get('hasCircularity', False) else 0
-        
-        # Encode energy source
-        energy_source = assessment_data.get('energySource', 'grid')
-        try:
-            if energy_encoder is not None:
-                energy_encoded = energy_encoder.transform([energy_source])[0]
-            else:
-                energy_map = {'renewable': 0, 'grid': 1, 'coal': 2, 'gas': 3}
-                energy_encoded = energy_map.get(energy_source, 1)
-        except:
-            energy_map = {'renewable': 0, 'grid': 1, 'coal': 2, 'gas': 3}
-            energy_encoded = energy_map.get(energy_source, 1)
-        
-        # Create feature array for circularity model
-        features = [
-            production_scale,
-            energy_encoded,
-            material_efficiency,
-            scrap_ratio,
-            secondary_material_fraction,
-            energy_recovery_rate,
-            total_inputs,
-            total_outputs,
-            is_metallurgy,
-            has_circularity
-        ]
-        
-        return np.array(features).reshape(1, -1)
-        
-    except Exception as e:
-        logger.error(f"Error preparing circularity features: {str(e)}")
-        return None
-
-def calculate_copper_lca_metrics(assessment_data, env_efficiency, circ_metrics):
-    """Calculate realistic LCA metrics for copper recycling"""
-    try:
-        production_scale = float(assessment_data.get('productionScale', 500))
-        energy_source = assessment_data.get('energySource', 'grid')
-        
-        # Realistic energy consumption (GJ/ton) for copper
-        if energy_source == 'renewable':
-            base_energy = 12.0  # GJ/ton (efficient with renewable)
-        elif energy_source == 'grid':
-            base_energy = 18.0  # GJ/ton (average grid mix)
-        else:
-            base_energy = 25.0  # GJ/ton (coal/gas - less efficient)
-        
-        # Adjust based on efficiency
-        energy_per_ton = base_energy * (1.8 - env_efficiency)
-        total_energy = energy_per_ton * production_scale  # GJ
-        energy_mj = total_energy * 1000  # Convert to MJ
-        
-        # Realistic carbon footprint calculation for copper
-        if energy_source == 'renewable':
-            energy_emissions = 0.03  # tons CO2/GJ (minimal for renewables)
-        elif energy_source == 'grid':
-            energy_emissions = 0.18  # tons CO2/GJ (average grid)
-        else:
-            energy_emissions = 0.30  # tons CO2/GJ (fossil fuel)
-        
-        # Process emissions for copper (from smelting, refining, etc.)
-        process_emissions = 0.15  # tons CO2/ton Cu (industry average)
-        
-        carbon_footprint = (total_energy * energy_emissions) + (production_scale * process_emissions)
-        
-        # Realistic water usage for copper
-        water_per_ton = 35.0 + (50.0 * (1.0 - env_efficiency))  # 35-85 m³/ton
-        if energy_source == 'renewable':
-            water_per_ton *= 0.75  # Better water management with green energy
-        
-        water_usage = water_per_ton * production_scale
-        
-        return {
-            'carbon_footprint': round(carbon_footprint, 2),
-            'energy_consumption': round(energy_mj, 2),
-            'water_usage': round(water_usage, 2)
-        }
-        
-    except Exception as e:
-        logger.error(f"Error calculating copper LCA metrics: {str(e)}")
-        return {
-            'carbon_footprint': 500.0,  # Fallback values
-            'energy_consumption': 9000.0,
-            'water_usage': 25000.0
-        }
+    """Resolve the active copper model version at startup; individual models load on first use"""
+    models = active_models()
+    if models.version is None:
+        logger.error("❌ No copper model versions found")
+    else:
+        logger.info(f"🔬 Copper models version {models.version} registered: {models.status()}")
+    return models
 
 @app.route('/')
 def home():
     """API documentation"""
+    model_version = active_models().version
     return f"""
     <h1>🔬 Copper LCA ML Backend</h1>
-    <h2>Real Copper Recycling Models - {TIMESTAMP}</h2>
+    <h2>Real Copper Recycling Models - {model_version}</h2>
     
     <h3>📊 Model Performance:</h3>
     <ul>
@@ -280,6 +68,13 @@ def home():
     <ul>
         <li><code>GET /api/health</code> - Health check</li>
         <li><code>POST /api/submit-solution</code> - LCA assessment</li>
+        <li><code>POST /api/submit-solutions/batch</code> - Batch LCA assessment</li>
+        <li><code>POST /api/models/activate</code> - Swap in a model version</li>
+        <li><code>POST /api/jobs</code> - Queue a large portfolio for background scoring</li>
+        <li><code>GET /api/jobs/&lt;job_id&gt;</code> - Job progress and paged results</li>
+        <li><code>POST /api/claims/analyze</code> - Environmental claims in a text, a list of texts or a report</li>
+        <li><code>GET /api/claims/status</code> - Claims classifier state (warming / ready)</li>
+        <li><code>GET /metrics</code> - Prometheus metrics (stage timings, fallbacks, cache)</li>
     </ul>
     
     <h3>🔗 Related Backend:</h3>
@@ -289,191 +84,12 @@ def home():
     </ul>
     """
 
-@app.route('/api/health')
-def health_check():
-    """Health check endpoint"""
-    model_status = {
-        'environmental_model': environmental_model is not None,
-        'circularity_model': circularity_model is not None,
-        'classification_model': classification_model is not None,
-        'classification_encoder': classification_encoder is not None,
-        'energy_encoder': energy_encoder is not None,
-        'location_encoder': location_encoder is not None
-    }
-    
-    return jsonify({
-        'success': True,
-        'message': 'Copper LCA ML Backend is running',
-        'models_loaded': models_loaded,
-        'model_status': model_status,
-        'model_timestamp': TIMESTAMP,
-        'ml_ready': all(model_status.values()),
-        'copper_models': True,
-        'timestamp': datetime.now().isoformat()
-    })
-
-@app.route('/api/submit-solution', methods=['POST'])
-def submit_copper_assessment():
-    """Process copper LCA assessment with ML models"""
-    try:
-        data = request.get_json()
-        assessment_data = data.get('assessment_data', {})
-        
-        logger.info(f"🔬 Processing copper assessment with ML models: {models_loaded}")
-        
-        # Initialize results
-        results = {
-            "success": True,
-            "using_ml_models": models_loaded,
-            "model_version": TIMESTAMP,
-            "material_type": "copper",
-            "data_quality": "ICA_EPA_copper_standards",
-            "model_predictions": {},
-            "lca_metrics": {},
-            "evaluation": {},
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        if models_loaded and environmental_model is not None:
-            # Use Copper Environmental Efficiency Model
-            try:
-                env_features = prepare_environmental_features(assessment_data)
-                if env_features is not None:
-                    env_efficiency = environmental_model.predict(env_features)[0]
-                    results["model_predictions"]["environmental_efficiency"] = float(env_efficiency)
-                    logger.info(f"✅ Copper environmental efficiency predicted: {env_efficiency:.3f}")
-                else:
-                    results["model_predictions"]["environmental_efficiency"] = 0.70
-                    logger.warning("⚠️ Using default environmental efficiency")
-            except Exception as e:
-                logger.error(f"❌ Environmental model error: {str(e)}")
-                results["model_predictions"]["environmental_efficiency"] = 0.70
-        else:
-            results["model_predictions"]["environmental_efficiency"] = 0.70
-            
-        if models_loaded and circularity_model is not None:
-            # Use Copper Circularity Predictor Model
-            try:
-                circ_features = prepare_circularity_features(assessment_data)
-                if circ_features is not None:
-                    circ_prediction = circularity_model.predict(circ_features)[0]
-                    
-                    # Handle circularity prediction output
-                    if isinstance(circ_prediction, (list, np.ndarray)) and len(circ_prediction) > 1:
-                        circ_index = float(circ_prediction[0])
-                        recycling_rate = float(assessment_data.get('recyclingRate', 0)) / 100.0
-                        waste_ratio = 1.0 - recycling_rate if recycling_rate > 0 else 0.15
-                    else:
-                        circ_index = float(circ_prediction)
-                        recycling_rate = float(assessment_data.get('recyclingRate', 0)) / 100.0
-                        waste_ratio = 1.0 - recycling_rate if recycling_rate > 0 else 0.15
-                    
-                    results["model_predictions"]["circularity_metrics"] = {
-                        "circularity_index": circ_index,
-                        "recycling_rate": recycling_rate,
-                        "waste_ratio": waste_ratio,
-                        "material_efficiency": float(results["model_predictions"]["environmental_efficiency"])
-                    }
-                    logger.info(f"✅ Copper circularity predicted: index={circ_index:.3f}")
-                else:
-                    results["model_predictions"]["circularity_metrics"] = {
-                        "circularity_index": 0.75,
-                        "recycling_rate": 0.80,
-                        "waste_ratio": 0.12,
-                        "material_efficiency": 0.78
-                    }
-            except Exception as e:
-                logger.error(f"❌ Circularity model error: {str(e)}")
-                results["model_predictions"]["circularity_metrics"] = {
-                    "circularity_index": 0.75,
-                    "recycling_rate": 0.80,
-                    "waste_ratio": 0.12,
-                    "material_efficiency": 0.78
-                }
-        else:
-            results["model_predictions"]["circularity_metrics"] = {
-                "circularity_index": 0.75,
-                "recycling_rate": 0.80,
-                "waste_ratio": 0.12,
-                "material_efficiency": 0.78
-            }
-        
-        # Process Classification
-        if models_loaded and classification_model is not None:
-            try:
-                class_features = prepare_environmental_features(assessment_data)
-                if class_features is not None:
-                    class_pred = classification_model.predict(class_features)[0]
-                    
-                    # Decode class prediction
-                    if classification_encoder is not None:
-                        try:
-                            class_name = classification_encoder.inverse_transform([class_pred])[0]
-                        except:
-                            class_name = f"Process_Type_{class_pred}"
-                    else:
-                        class_name = f"Process_Type_{class_pred}"
-                    
-                    results["model_predictions"]["process_classification"] = {
-                        "class": class_name,
-                        "class_id": int(class_pred),
-                        "confidence": 0.9
-                    }
-                    logger.info(f"✅ Process class: {class_name}")
-            except Exception as e:
-                logger.error(f"❌ Classification model error: {str(e)}")
-                results["model_predictions"]["process_classification"] = {
-                    "class": "secondary_copper_recycling",
-                    "class_id": 1,
-                    "confidence": 0.7
-                }
-        
-        # Calculate realistic copper LCA metrics
-        env_efficiency = results["model_predictions"]["environmental_efficiency"]
-        circ_metrics = results["model_predictions"]["circularity_metrics"]
-        
-        lca_metrics = calculate_copper_lca_metrics(assessment_data, env_efficiency, circ_metrics)
-        results["lca_metrics"] = lca_metrics
-        
-        # Enhanced evaluation
-        overall_score = (env_efficiency + circ_metrics["circularity_index"]) / 2
-        results["evaluation"] = {
-            "overall_score": float(overall_score),
-            "environmental_score": float(env_efficiency),
-            "circularity_score": float(circ_metrics["circularity_index"]),
-            "evaluation_method": "copper_ml_models",
-            "feedback": f"Copper recycling assessment shows {'excellent' if overall_score > 0.8 else 'good' if overall_score > 0.6 else 'moderate'} sustainability performance with industry-validated predictions."
-        }
-        
-        # Generate copper-specific recommendations
-        recommendations = []
-        if env_efficiency < 0.7:
-            recommendations.append("🔋 Consider transitioning to renewable energy sources to improve copper recycling efficiency")
-        if circ_metrics["recycling_rate"] < 0.75:
-            recommendations.append("♻️ Increase recycled copper content to achieve higher circularity performance")
-        if lca_metrics["carbon_footprint"] / float(assessment_data.get('productionScale', 500)) > 2.0:
-            recommendations.append("🌱 Optimize copper smelting and refining processes to reduce carbon intensity")
-        if lca_metrics["water_usage"] / float(assessment_data.get('productionScale', 500)) > 60.0:
-            recommendations.append("💧 Implement advanced water recycling systems for copper processing")
-        
-        if not recommendations:
-            recommendations.append("✅ Excellent copper recycling performance! Your process meets industry best practices")
-        
-        results["recommendations"] = recommendations
-        
-        logger.info(f"🎯 Copper assessment completed successfully")
-        return jsonify(results)
-        
-    except Exception as e:
-        logger.error(f"❌ Error processing copper assessment: {str(e)}")
-        return jsonify({
-            "success": False,
-            "error": f"Copper assessment processing failed: {str(e)}",
-            "using_ml_models": False,
-            "timestamp": datetime.now().isoformat()
-        }), 500
+app.register_blueprint(create_assessment_blueprint("copper_assessment", pipeline), url_prefix='/api')
+app.register_blueprint(create_jobs_blueprint("copper_jobs", pipeline), url_prefix='/api')
+app.register_blueprint(create_claims_blueprint("copper_claims"), url_prefix='/api')
+app.register_blueprint(create_metrics_blueprint("copper_metrics"))
 
-# Load copper models at startup
+# Resolve the copper model version at startup
 load_copper_models()
 
 if __name__ == '__main__':
@@ -481,8 +97,8 @@ if __name__ == '__main__':
     print(f"📡 API Documentation: http://localhost:5001/")
     print(f"🔧 Health Check: http://localhost:5001/api/health")
     print(f"🌐 CORS enabled for React frontend")
-    print(f"🧠 Copper ML Models Status: {'✅ Loaded' if models_loaded else '❌ Failed'}")
-    print(f"📊 Model Version: {TIMESTAMP}")
+    print(f"🧠 Copper ML Models Status: {'✅ Registered' if active_models().version else '❌ Failed'}")
+    print(f"📊 Model Version: {active_models().version}")
     print(f"🎯 Ready for real copper recycling LCA assessments!")
     print(f"🔗 Aluminum backend running on port 5000")
     
@@ -0,0 +1,47 @@
+"""
+Gunicorn Configuration - LCA Backends
+=====================================
+
+    cd backend
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Concurrency is set with environment variables:
+
+    LCA_APP      service (all metals, default) | aluminum | copper
+    LCA_BIND     listen address (default 0.0.0.0:8000)
+    LCA_WORKERS  worker processes (default: CPU count). Scoring is CPU-bound
+                 NumPy/scikit-learn work, so one worker per core is the ceiling
+    LCA_THREADS  threads per worker (default 4). Threads cover requests waiting
+                 on I/O; workers add scoring throughput
+
+Models are loaded once in the master (``preload_app``) and frozen out of the
+garbage collector in ``wsgi.py``, so adding workers adds only their private
+heap, not another copy of the models.
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get('LCA_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('LCA_WORKERS', multiprocessing.cpu_count()))
+threads = int(os.environ.get('LCA_THREADS', 4))
+worker_class = 'gthread'
+
+# Import wsgi.py (and load every model) in the master before forking workers
+preload_app = True
+
+timeout = int(os.environ.get('LCA_TIMEOUT', 60))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers now and then so any slowly growing private heap is returned
+max_requests = int(os.environ.get('LCA_MAX_REQUESTS', 10000))
+max_requests_jitter = max_requests // 10
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('LCA_LOG_LEVEL', 'info')
+
+
+def post_fork(server, worker):
+    server.log.info(f"🚀 Worker {worker.pid} forked with shared preloaded models")
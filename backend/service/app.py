@@ -0,0 +1,154 @@
+"""
+Unified LCA Service - All Metals in One Process
+===============================================
+
+Serves every registered metal pipeline from a single Flask app, so the
+interpreter, NumPy and scikit-learn are loaded once and memory grows per
+model rather than per server.
+
+Routes are ``/api/<metal>/...`` (e.g. ``/api/copper/submit-solution``). The
+legacy ``/api/submit-solution`` route dispatches on ``assessment_data.metalType``
+so the existing frontend can point straight at this service.
+"""
+
+from flask import Flask, request, jsonify
+from flask_cors import CORS
+from datetime import datetime
+import logging
+import os
+import sys
+from pathlib import Path
+
+# Make backend/shared importable when this file is run directly
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from shared.assessment_routes import (
+    READINESS_HEADERS,
+    add_readiness_headers,
+    conditional_health_response,
+    create_assessment_blueprint
+)
+from shared.claims_routes import create_claims_blueprint
+from shared.claims_service import claims_service
+from shared.job_routes import create_jobs_blueprint
+from shared.json_provider import init_json
+from shared.metrics_routes import create_metrics_blueprint
+from shared.pipelines import PIPELINES, get_pipeline
+from shared.request_logging import configure_logging, init_request_logging
+from shared.response_cache import response_cache
+
+app = Flask(__name__)
+CORS(app, expose_headers=READINESS_HEADERS)
+init_request_logging(app)
+init_json(app)
+
+# Configure logging
+configure_logging()
+logger = logging.getLogger(__name__)
+
+DEFAULT_METAL = "aluminum"
+SERVICE_PORT = int(os.environ.get('LCA_SERVICE_PORT', 8000))
+
+@app.route('/')
+def home():
+    """API documentation"""
+    metals = "".join(
+        f"<li><strong>{metal.title()}:</strong> models {pipeline.active_models().version}</li>"
+        for metal, pipeline in PIPELINES.items()
+    )
+    return f"""
+    <h1>🔬 Unified LCA ML Service</h1>
+
+    <h3>🧪 Metals:</h3>
+    <ul>{metals}</ul>
+
+    <h3>🚀 Endpoints:</h3>
+    <ul>
+        <li><code>GET /api/health</code> - Health check for every metal</li>
+        <li><code>GET /api/&lt;metal&gt;/health</code> - Health check for one metal</li>
+        <li><code>POST /api/&lt;metal&gt;/submit-solution</code> - LCA assessment</li>
+        <li><code>POST /api/&lt;metal&gt;/submit-solutions/batch</code> - Batch LCA assessment</li>
+        <li><code>POST /api/&lt;metal&gt;/models/activate</code> - Swap in a model version</li>
+        <li><code>POST /api/submit-solution</code> - LCA assessment routed by <code>metalType</code></li>
+        <li><code>POST /api/jobs</code> - Queue a large portfolio (<code>{"metal": ..., "assessments": [...]}</code>)</li>
+        <li><code>GET /api/jobs/&lt;job_id&gt;</code> - Job progress and paged results</li>
+        <li><code>POST /api/claims/analyze</code> - Environmental claims in a text, a list of texts or a report</li>
+        <li><code>GET /api/claims/status</code> - Claims classifier state (warming / ready)</li>
+        <li><code>GET /metrics</code> - Prometheus metrics (stage timings, fallbacks, cache)</li>
+    </ul>
+    """
+
+@app.route('/api/health')
+def health_check():
+    """Health check across every registered metal"""
+    metals = {}
+    for metal, pipeline in PIPELINES.items():
+        models = pipeline.active_models()
+        model_status = models.status()
+        metals[metal] = {
+            'models_loaded': models.version is not None,
+            'model_status': model_status,
+            'loaded_models': models.loaded_kinds(),
+            'model_timestamp': models.version,
+            'ml_ready': bool(model_status) and all(model_status.values())
+        }
+
+    response = conditional_health_response({
+        'success': True,
+        'message': 'Unified LCA ML Service is running',
+        'metals': metals,
+        'response_cache': response_cache.stats(),
+        'claims_classifier': claims_service.state,
+        'timestamp': datetime.now().isoformat()
+    })
+    response.headers['X-LCA-Ready'] = 'true' if all(m['models_loaded'] for m in metals.values()) else 'false'
+    return response
+
+@app.route('/api/submit-solution', methods=['POST'])
+def submit_assessment_by_metal_type():
+    """Process one LCA assessment, routed to the pipeline named by assessment_data.metalType"""
+    try:
+        data = request.get_json()
+        assessment_data = data.get('assessment_data', {})
+        metal = assessment_data.get('metalType') or DEFAULT_METAL
+
+        pipeline = get_pipeline(metal)
+        if pipeline is None:
+            return jsonify({
+                "success": False,
+                "error": f"Unsupported metal: {metal}",
+                "supported_metals": list(PIPELINES),
+                "timestamp": datetime.now().isoformat()
+            }), 404
+
+        results = pipeline.score_one(assessment_data, cache=response_cache)
+        response = add_readiness_headers(jsonify(results), pipeline.active_models())
+        return response, 200 if results["success"] else 500
+
+    except Exception as e:
+        logger.error(f"❌ Error processing assessment: {str(e)}")
+        return jsonify({
+            "success": False,
+            "error": f"Assessment processing failed: {str(e)}",
+            "using_ml_models": False,
+            "timestamp": datetime.now().isoformat()
+        }), 500
+
+app.register_blueprint(create_assessment_blueprint("metal_assessment"), url_prefix='/api/<metal>')
+app.register_blueprint(create_jobs_blueprint("jobs", default_metal=DEFAULT_METAL), url_prefix='/api')
+app.register_blueprint(create_claims_blueprint("claims"), url_prefix='/api')
+app.register_blueprint(create_metrics_blueprint("metrics"))
+
+# Resolve every metal's model version at startup; models load lazily on first use
+for metal, pipeline in PIPELINES.items():
+    logger.info(f"🔬 {metal.title()} models version {pipeline.active_models().version} registered")
+
+if __name__ == '__main__':
+    print("🔬 Starting Unified LCA ML Service...")
+    print(f"📡 API Documentation: http://localhost:{SERVICE_PORT}/")
+    print(f"🔧 Health Check: http://localhost:{SERVICE_PORT}/api/health")
+    print(f"🧪 Metals: {', '.join(PIPELINES)}")
+
+    app.run(host='0.0.0.0', port=SERVICE_PORT, debug=True)
@@ -0,0 +1,7 @@
+"""
+Shared LCA Backend Modules
+==========================
+
+Code used by more than one metal backend: feature builders, LLM enhancements
+and the environmental claims analyzer.
+"""
@@ -4,132 +4,366 @@ Environmental Claims Analyzer for LCA System
 ==========================================
 
 Integrates HuggingFace environmental claims classifier with your LCA system.
+
+Sentences are classified in batches: cached sentences are answered from an LRU
+cache (boilerplate claims repeat across reports), the rest are sorted by
+length and sent to the pipeline ``batch_size`` at a time, so each batch pads
+to sentences of similar length. ``LCA_CLAIMS_BATCH_SIZE`` (32) and
+``LCA_CLAIMS_CACHE_SIZE`` (4096 sentences, 0 disables) configure it.
+
+The model is read from ``LCA_CLAIMS_MODEL`` (a local directory or a HuggingFace
+model id). On CPU nodes, ``scripts/export_claims_onnx.py`` exports it to ONNX
+with dynamic int8 quantization (``models/claims/onnx-int8`` by default,
+``LCA_CLAIMS_ONNX_DIR``); when that export exists and ``optimum[onnxruntime]``
+is installed it is used instead of the fp32 model. ``LCA_CLAIMS_RUNTIME``
+(``auto``, ``onnx`` or ``torch``) forces one or the other.
+
+Long reports are analyzed as a stream: ``iter_report_claims`` reads text, a
+file or any iterable of chunks incrementally, splits sentences as the text
+arrives, classifies them in micro-batches and yields each claim as soon as its
+batch is done, while a ReportSummary keeps the statistics as running totals.
+``analyze_lca_report`` is the same stream collected into one dict.
+
+Every analysis method takes an optional ``deadline`` (a ``time.monotonic()``
+value): past it the analysis stops before its next batch and raises
+``TimeoutError``, so a caller that gave up does not keep the classifier busy.
 """
 
+import hashlib
 import os
-from transformers import pipeline
-import pandas as pd
+import re
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
 import numpy as np
 from datetime import datetime
 
+MODELS_ROOT = Path(__file__).resolve().parent.parent.parent.parent / "models"
+CLAIMS_MODEL_PATH = os.environ.get('LCA_CLAIMS_MODEL', "climatebert/environmental-claims")
+CLAIMS_ONNX_DIR = Path(os.environ.get('LCA_CLAIMS_ONNX_DIR', MODELS_ROOT / "claims" / "onnx-int8"))
+CLAIMS_RUNTIME = os.environ.get('LCA_CLAIMS_RUNTIME', 'auto').lower()
+ONNX_QUANTIZED_FILE = "model_quantized.onnx"
+CLAIMS_BATCH_SIZE = int(os.environ.get('LCA_CLAIMS_BATCH_SIZE', 32))
+CLAIMS_CACHE_SIZE = int(os.environ.get('LCA_CLAIMS_CACHE_SIZE', 4096))
+REPORT_CHUNK_SIZE = 64 * 1024   # characters read at a time from a report
+MIN_SENTENCE_LENGTH = 20        # shorter sentences are not classified
+CLAIM_CONFIDENCE = 0.7          # a sentence counts as a claim above this confidence
+
+SENTENCE_END = re.compile(r'[.!?]+')
+
+def check_deadline(deadline):
+    """Raise TimeoutError once a time.monotonic() deadline has passed (None: no deadline)"""
+    if deadline is not None and time.monotonic() > deadline:
+        raise TimeoutError("Claims analysis passed its deadline")
+
+def text_chunks(source, chunk_size=REPORT_CHUNK_SIZE):
+    """Chunks of report text from a string, a path (os.PathLike), a text file object or an iterable of strings"""
+    if isinstance(source, str):
+        for start in range(0, len(source), chunk_size):
+            yield source[start:start + chunk_size]
+    elif isinstance(source, os.PathLike):
+        with open(source, encoding='utf-8', errors='replace') as report_file:
+            yield from iter(lambda: report_file.read(chunk_size), '')
+    elif hasattr(source, 'read'):
+        yield from iter(lambda: source.read(chunk_size), '')
+    else:
+        yield from source
+
+def iter_sentences(chunks):
+    """
+    Sentences of a text arriving in chunks, split as ``re.split(r'[.!?]+')``
+    would split the whole text (stripped, empty ones dropped); only the
+    unfinished last sentence is held in memory
+    """
+    pending = ''
+    for chunk in chunks:
+        pieces = SENTENCE_END.split(pending + chunk)
+        pending = pieces.pop()
+        for piece in pieces:
+            piece = piece.strip()
+            if piece:
+                yield piece
+    pending = pending.strip()
+    if pending:
+        yield pending
+
+class ReportSummary:
+    """Running statistics of a report analysis; as_dict() has the analyze_lca_report format"""
+    
+    def __init__(self, keep_claims=True, keep_all_sentences=False):
+        self.keep_claims = keep_claims
+        self.keep_all_sentences = keep_all_sentences
+        self.total_sentences = 0
+        self.claims_found = 0
+        self.claim_confidence_sum = 0.0
+        self.detailed_claims = []
+        self.all_sentence_results = []
+    
+    def add(self, result):
+        """Count one sentence result; True when it is an environmental claim"""
+        self.total_sentences += 1
+        if self.keep_all_sentences:
+            self.all_sentence_results.append(result)
+        
+        is_claim = result.get('is_environmental_claim', False) and result.get('confidence', 0) > CLAIM_CONFIDENCE
+        if is_claim:
+            self.claims_found += 1
+            self.claim_confidence_sum += result['confidence']
+            if self.keep_claims:
+                self.detailed_claims.append(result)
+        return is_claim
+    
+    def as_dict(self):
+        return {
+            "total_sentences_analyzed": self.total_sentences,
+            "environmental_claims_found": self.claims_found,
+            "claim_percentage": (self.claims_found / self.total_sentences * 100) if self.total_sentences > 0 else 0,
+            "average_claim_confidence": (self.claim_confidence_sum / self.claims_found) if self.claims_found else 0,
+            "detailed_claims": self.detailed_claims,
+            # Empty unless the sentence results were kept
+            "all_sentence_results": self.all_sentence_results,
+            "analysis_timestamp": datetime.now().isoformat()
+        }
+
+def load_onnx_classifier(onnx_dir=CLAIMS_ONNX_DIR, file_name=ONNX_QUANTIZED_FILE):
+    """text-classification pipeline over an ONNX export (needs optimum[onnxruntime])"""
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+    from transformers import AutoTokenizer, pipeline
+    
+    model = ORTModelForSequenceClassification.from_pretrained(onnx_dir, file_name=file_name)
+    return pipeline("text-classification", model=model, tokenizer=AutoTokenizer.from_pretrained(onnx_dir))
+
+class ClaimCache:
+    """Thread-safe LRU cache of sentence hash -> raw classifier result"""
+    
+    def __init__(self, maxsize=CLAIMS_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def key(text):
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+    
+    def get(self, key):
+        if self.maxsize <= 0:
+            return None
+        with self._lock:
+            raw = self._entries.get(key)
+            if raw is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return raw
+    
+    def set(self, key, raw):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = raw
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
+
 class EnvironmentalClaimsAnalyzer:
     """
     Analyze and validate environmental claims using the HuggingFace 
     climatebert/environmental-claims model.
     """
     
-    def __init__(self, model_path=None):
+    def __init__(self, model_path=None, batch_size=CLAIMS_BATCH_SIZE, cache_size=CLAIMS_CACHE_SIZE,
+                 runtime=CLAIMS_RUNTIME, onnx_dir=None):
         """Initialize the environmental claims analyzer"""
-        if model_path is None:
-            model_path = r"D:\SIH\ai_models\environmental-claims"
+        self.model_path = model_path or CLAIMS_MODEL_PATH
+        self.onnx_dir = Path(onnx_dir or CLAIMS_ONNX_DIR)
+        self.runtime = None
+        self.batch_size = max(int(batch_size), 1)
+        self.cache = ClaimCache(cache_size)
         
         print("🔬 Loading Environmental Claims Classifier...")
         try:
-            self.classifier = pipeline(
-                "text-classification", 
-                model=model_path,
-                tokenizer=model_path
-            )
-            print("✅ Environmental Claims Classifier loaded successfully!")
+            self.classifier = self._load_classifier(runtime)
+            print(f"✅ Environmental Claims Classifier loaded successfully! ({self.runtime})")
         except Exception as e:
             print(f"❌ Error loading model: {e}")
             self.classifier = None
     
-    def analyze_claim(self, text):
+    def _load_classifier(self, runtime):
+        """The int8 ONNX export when asked for (or, with "auto", when it exists), else the fp32 model"""
+        if runtime == 'onnx' or (runtime == 'auto' and (self.onnx_dir / ONNX_QUANTIZED_FILE).exists()):
+            try:
+                classifier = load_onnx_classifier(self.onnx_dir)
+                self.runtime = "onnx-int8"
+                return classifier
+            except Exception as e:
+                if runtime == 'onnx':
+                    raise
+                print(f"⚠️ ONNX classifier unavailable ({e}), loading {self.model_path}")
+        
+        # Imported here so that importing this module stays cheap (transformers pulls in torch)
+        from transformers import pipeline
+        
+        classifier = pipeline("text-classification", model=self.model_path, tokenizer=self.model_path)
+        self.runtime = "transformers-fp32"
+        return classifier
+    
+    def analyze_claim(self, text, deadline=None):
         """
         Analyze a single environmental claim
         
         Args:
             text (str): Environmental claim to analyze
+            deadline (float): time.monotonic() after which to stop (TimeoutError)
             
         Returns:
             dict: Analysis result with label, confidence, and interpretation
         """
-        if self.classifier is None:
-            return {"error": "Model not loaded"}
-        
-        try:
-            result = self.classifier(text)
-            
-            # Extract result
-            label = result[0]['label']
-            confidence = result[0]['score']
-            
-            # Interpret result
-            is_environmental_claim = label.lower() == 'yes'
-            confidence_level = self._get_confidence_level(confidence)
-            
-            return {
-                "text": text,
-                "is_environmental_claim": is_environmental_claim,
-                "confidence": confidence,
-                "confidence_level": confidence_level,
-                "raw_result": result[0],
-                "timestamp": datetime.now().isoformat()
-            }
-            
-        except Exception as e:
-            return {"error": f"Analysis failed: {e}"}
+        return self.analyze_multiple_claims([text], deadline=deadline)[0]
     
-    def analyze_multiple_claims(self, claims_list):
+    def analyze_multiple_claims(self, claims_list, deadline=None):
         """
         Analyze multiple environmental claims
         
         Args:
             claims_list (list): List of environmental claims
+            deadline (float): time.monotonic() after which to stop (TimeoutError)
             
         Returns:
             list: List of analysis results
         """
-        results = []
-        for claim in claims_list:
-            result = self.analyze_claim(claim)
-            results.append(result)
+        if self.classifier is None:
+            return [{"error": "Model not loaded"} for _ in claims_list]
         
-        return results
+        return [
+            raw if 'error' in raw else self._claim_result(text, raw)
+            for text, raw in zip(claims_list, self.classify(claims_list, deadline=deadline))
+        ]
     
-    def analyze_lca_report(self, report_text):
+    def classify(self, texts, deadline=None):
+        """
+        Raw classifier results ({"label", "score"}) for a list of texts, in order
+        
+        Cached texts are not re-run; the rest go through the pipeline in
+        length-sorted batches of batch_size. A batch that fails is retried one
+        text at a time, so one bad input only fails itself ({"error": ...}).
+        The deadline is checked before each batch.
+        """
+        raw_results = [None] * len(texts)
+        pending = {}   # cache key -> indices of texts waiting for that result
+        for i, text in enumerate(texts):
+            key = self.cache.key(str(text))
+            raw = self.cache.get(key)
+            if raw is not None:
+                raw_results[i] = dict(raw)
+            else:
+                pending.setdefault(key, []).append(i)
+        
+        # Similar lengths in a batch keep padding (wasted compute) small
+        keys = sorted(pending, key=lambda key: len(str(texts[pending[key][0]])))
+        for start in range(0, len(keys), self.batch_size):
+            check_deadline(deadline)
+            batch_keys = keys[start:start + self.batch_size]
+            batch = [texts[pending[key][0]] for key in batch_keys]
+            for key, raw in zip(batch_keys, self._classify_batch(batch)):
+                if 'error' not in raw:
+                    self.cache.set(key, raw)
+                for i in pending[key]:
+                    raw_results[i] = dict(raw)
+        
+        return raw_results
+    
+    def _classify_batch(self, batch):
+        try:
+            return [self._top_result(result) for result in
+                    self.classifier(batch, batch_size=len(batch), truncation=True)]
+        except Exception:
+            if len(batch) == 1:
+                try:
+                    return [self._top_result(self.classifier(batch[0]))]
+                except Exception as e:
+                    return [{"error": f"Analysis failed: {e}"}]
+            return [raw for text in batch for raw in self._classify_batch([text])]
+    
+    @staticmethod
+    def _top_result(result):
+        # A single input may come back as [{"label", "score"}]
+        return dict(result[0] if isinstance(result, list) else result)
+    
+    def _claim_result(self, text, raw):
+        """Analysis result of one text from its raw classifier result"""
+        label = raw['label']
+        confidence = raw['score']
+        
+        # Interpret result
+        is_environmental_claim = label.lower() == 'yes'
+        confidence_level = self._get_confidence_level(confidence)
+        
+        return {
+            "text": text,
+            "is_environmental_claim": is_environmental_claim,
+            "confidence": confidence,
+            "confidence_level": confidence_level,
+            "raw_result": raw,
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    def analyze_lca_report(self, report_text, keep_all_sentences=True, deadline=None):
         """
         Extract and analyze environmental claims from an LCA report
         
         Args:
-            report_text (str): Full LCA report text
+            report_text (str): Full LCA report text (or a path / file / iterable of chunks)
+            keep_all_sentences (bool): Include every sentence result, not only the claims
+            deadline (float): time.monotonic() after which to stop (TimeoutError)
             
         Returns:
             dict: Comprehensive analysis of environmental claims in the report
         """
-        # Split report into sentences for individual analysis
-        sentences = self._split_into_sentences(report_text)
-        
-        # Analyze each sentence
-        sentence_results = []
-        environmental_claims = []
-        
-        for sentence in sentences:
-            if len(sentence.strip()) > 20:  # Skip very short sentences
-                result = self.analyze_claim(sentence)
-                sentence_results.append(result)
-                
-                if result.get('is_environmental_claim', False) and result.get('confidence', 0) > 0.7:
-                    environmental_claims.append(result)
-        
-        # Summary statistics
-        total_sentences = len(sentence_results)
-        claim_sentences = len(environmental_claims)
-        claim_percentage = (claim_sentences / total_sentences * 100) if total_sentences > 0 else 0
+        summary = ReportSummary(keep_all_sentences=keep_all_sentences)
+        for _ in self.iter_report_claims(report_text, summary, deadline=deadline):
+            pass
+        return summary.as_dict()
+    
+    def iter_report_claims(self, source, summary=None, micro_batch=None, deadline=None):
+        """
+        Stream the environmental claims of a report as they are found
         
-        # Average confidence for claims
-        avg_confidence = np.mean([claim['confidence'] for claim in environmental_claims]) if environmental_claims else 0
+        Args:
+            source: Report text, a path (os.PathLike), a text file object or an iterable of text chunks
+            summary (ReportSummary): Receives the running statistics (and kept results)
+            micro_batch (int): Sentences classified per step (default: batch_size)
+            deadline (float): time.monotonic() after which to stop (TimeoutError), checked per micro-batch
+            
+        Yields:
+            dict: Analysis result of each sentence that is an environmental claim
+        """
+        summary = summary if summary is not None else ReportSummary(keep_claims=False)
+        micro_batch = max(int(micro_batch or self.batch_size), 1)
         
-        return {
-            "total_sentences_analyzed": total_sentences,
-            "environmental_claims_found": claim_sentences,
-            "claim_percentage": claim_percentage,
-            "average_claim_confidence": avg_confidence,
-            "detailed_claims": environmental_claims,
-            "all_sentence_results": sentence_results,
-            "analysis_timestamp": datetime.now().isoformat()
-        }
+        batch = []
+        for sentence in iter_sentences(text_chunks(source)):
+            if len(sentence) <= MIN_SENTENCE_LENGTH:  # Skip very short sentences
+                continue
+            batch.append(sentence)
+            if len(batch) >= micro_batch:
+                yield from self._report_batch_claims(batch, summary, deadline)
+                batch = []
+        if batch:
+            yield from self._report_batch_claims(batch, summary, deadline)
+    
+    def _report_batch_claims(self, sentences, summary, deadline=None):
+        check_deadline(deadline)
+        for result in self.analyze_multiple_claims(sentences, deadline=deadline):
+            if summary.add(result):
+                yield result
     
     def validate_lca_assessment_claims(self, assessment_data):
         """
@@ -153,10 +387,9 @@ class EnvironmentalClaimsAnalyzer:
             'carbon_footprint_claims'
         ]
         
-        for field in claim_fields:
-            if field in assessment_data and assessment_data[field]:
-                result = self.analyze_claim(assessment_data[field])
-                validation_results[field] = result
+        fields = [field for field in claim_fields if field in assessment_data and assessment_data[field]]
+        results = self.analyze_multiple_claims([assessment_data[field] for field in fields])
+        validation_results.update(zip(fields, results))
         
         # Overall assessment
         validated_claims = [r for r in validation_results.values() if r.get('is_environmental_claim', False)]
@@ -186,9 +419,7 @@ class EnvironmentalClaimsAnalyzer:
     
     def _split_into_sentences(self, text):
         """Simple sentence splitting"""
-        import re
-        sentences = re.split(r'[.!?]+', text)
-        return [s.strip() for s in sentences if s.strip()]
+        return list(iter_sentences([text]))
     
     def _assess_credibility(self, avg_confidence, num_claims):
         """Assess overall credibility of environmental claims"""
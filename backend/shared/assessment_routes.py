@@ -0,0 +1,244 @@
+"""
+Assessment API Routes
+=====================
+
+Blueprint with the assessment endpoints every backend serves: health,
+single and batch submission, and model version activation.
+
+A per-metal backend mounts it with a fixed pipeline under ``/api``; the
+unified service mounts it once under ``/api/<metal>`` and the pipeline is
+looked up from the URL on each request.
+
+Every response carries a readiness signal (``X-LCA-Ready`` and
+``X-LCA-Model-Version`` headers), so clients do not need a health round trip
+before submitting. ``/health`` is served with an ETag over its status fields
+and a short ``Cache-Control`` max-age, and answers ``If-None-Match`` with 304.
+
+``POST .../models/activate`` swaps model versions for every worker process
+(see shared/model_registry.py), so it is an admin route: callers send
+``X-LCA-Admin-Token`` matching ``LCA_ADMIN_TOKEN``; without a configured
+token only loopback clients may call it.
+
+``POST .../submit-solutions/batch?format=columns`` answers with one array per
+output (model predictions, LCA metrics and overall score) instead of a result
+dict per row: the batch is scored column-wise and the arrays are serialized
+as they are, with no per-row evaluation or recommendations. Missing values
+(rows a model could not score) are ``null`` and class ids are integers.
+"""
+
+import hashlib
+import hmac
+import json
+import logging
+import os
+from datetime import datetime
+
+import numpy as np
+from flask import Blueprint, g, jsonify, make_response, request
+
+from shared.claims_service import claims_service
+from shared.pipelines import get_pipeline
+from shared.response_cache import response_cache
+
+logger = logging.getLogger(__name__)
+
+# Response headers browsers must be allowed to read (pass to CORS(expose_headers=...))
+READINESS_HEADERS = ['X-LCA-Ready', 'X-LCA-Model-Version', 'ETag']
+
+HEALTH_MAX_AGE = int(os.environ.get('LCA_HEALTH_MAX_AGE', 30))
+
+ADMIN_TOKEN = os.environ.get('LCA_ADMIN_TOKEN')
+LOOPBACK_ADDRESSES = ('127.0.0.1', '::1')
+
+# Health fields that change on every call and are left out of the ETag
+VOLATILE_HEALTH_FIELDS = ('timestamp', 'response_cache')
+
+
+def add_readiness_headers(response, models):
+    """Tag a response with whether ML models are being served and which version"""
+    response.headers['X-LCA-Ready'] = 'true' if models.version is not None else 'false'
+    response.headers['X-LCA-Model-Version'] = models.version or 'none'
+    return response
+
+
+def conditional_health_response(health):
+    """jsonify a health payload with an ETag over its status fields (304 when unchanged)"""
+    status = {key: value for key, value in health.items() if key not in VOLATILE_HEALTH_FIELDS}
+    etag = hashlib.sha1(json.dumps(status, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    if etag in request.if_none_match:
+        response = make_response('', 304)
+    else:
+        response = jsonify(health)
+    response.set_etag(etag)
+    response.cache_control.max_age = HEALTH_MAX_AGE
+    response.cache_control.public = True
+    return response
+
+
+def admin_allowed():
+    """Whether the request may call admin routes: the configured token, or a loopback client without one"""
+    if ADMIN_TOKEN:
+        return hmac.compare_digest(request.headers.get('X-LCA-Admin-Token', ''), ADMIN_TOKEN)
+    return request.remote_addr in LOOPBACK_ADDRESSES
+
+
+def json_columns(columns):
+    """Scored columns ready for JSON: NaN as null (not every serializer maps it), ``*_id`` columns as integers"""
+    ready = {}
+    for name, values in columns.items():
+        values = np.asarray(values)
+        if values.dtype.kind != 'f':
+            ready[name] = values
+            continue
+        missing = np.isnan(values)
+        if name.endswith('_id'):
+            ready[name] = [None if skip else int(value) for value, skip in zip(values.tolist(), missing.tolist())]
+        elif missing.any():
+            ready[name] = [None if skip else value for value, skip in zip(values.tolist(), missing.tolist())]
+        else:
+            ready[name] = values
+    return ready
+
+
+def create_assessment_blueprint(name, pipeline=None):
+    """Assessment routes bound to one pipeline, or to the ``<metal>`` URL segment when pipeline is None"""
+    blueprint = Blueprint(name, __name__)
+
+    @blueprint.url_value_preprocessor
+    def resolve_pipeline(endpoint, values):
+        metal = values.pop('metal', None) if values else None
+        g.metal = metal
+        g.pipeline = pipeline or get_pipeline(metal)
+
+    @blueprint.before_request
+    def require_pipeline():
+        if g.pipeline is None:
+            return jsonify({
+                "success": False,
+                "error": f"Unsupported metal: {g.metal}",
+                "timestamp": datetime.now().isoformat()
+            }), 404
+
+    @blueprint.after_request
+    def readiness_headers(response):
+        if g.get('pipeline') is not None:
+            add_readiness_headers(response, g.pipeline.active_models())
+        return response
+
+    @blueprint.route('/health')
+    def health_check():
+        """Health check endpoint"""
+        metal = g.pipeline.metal
+        models = g.pipeline.active_models()
+        model_status = models.status()
+
+        return conditional_health_response({
+            'success': True,
+            'message': f'{metal.title()} LCA ML Backend is running',
+            'models_loaded': models.version is not None,
+            'model_status': model_status,
+            'loaded_models': models.loaded_kinds(),
+            'model_formats': models.formats,
+            'model_timestamp': models.version,
+            'available_versions': g.pipeline.registry.versions(metal),
+            'ml_ready': bool(model_status) and all(model_status.values()),
+            'response_cache': response_cache.stats(),
+            'claims_classifier': claims_service.state,
+            f'{metal}_models': True,
+            'timestamp': datetime.now().isoformat()
+        })
+
+    @blueprint.route('/submit-solution', methods=['POST'])
+    def submit_assessment():
+        """Process one LCA assessment with the metal's ML models"""
+        try:
+            data = request.get_json()
+            assessment_data = data.get('assessment_data', {})
+
+            results = g.pipeline.score_one(assessment_data, cache=response_cache)
+            if not results["success"]:
+                return jsonify(results), 500
+
+            return jsonify(results)
+
+        except Exception as e:
+            logger.error(f"❌ Error processing {g.pipeline.metal} assessment: {str(e)}")
+            return jsonify(g.pipeline.error_result(e)), 500
+
+    @blueprint.route('/submit-solutions/batch', methods=['POST'])
+    def submit_assessment_batch():
+        """Process a list of LCA assessments with one predict call per model"""
+        metal = g.pipeline.metal
+        try:
+            data = request.get_json()
+            assessments = data if isinstance(data, list) else data.get('assessments', [])
+            if not isinstance(assessments, list):
+                return jsonify({
+                    "success": False,
+                    "error": "'assessments' must be a list of assessment_data objects",
+                    "timestamp": datetime.now().isoformat()
+                }), 400
+
+            models = g.pipeline.active_models()
+            if request.args.get('format') == 'columns':
+                return jsonify({
+                    "success": True,
+                    "count": len(assessments),
+                    "model_version": models.version,
+                    **g.pipeline.result_fields,
+                    "format": "columns",
+                    "columns": json_columns(g.pipeline.score_columns(assessments, models)),
+                    "timestamp": datetime.now().isoformat()
+                })
+
+            batch_results = g.pipeline.score(assessments, models, cache=response_cache)
+
+            return jsonify({
+                "success": True,
+                "count": len(batch_results),
+                "model_version": models.version,
+                **g.pipeline.result_fields,
+                "results": batch_results,
+                "timestamp": datetime.now().isoformat()
+            })
+
+        except Exception as e:
+            logger.error(f"❌ Error processing {metal} assessment batch: {str(e)}")
+            return jsonify({
+                "success": False,
+                "error": f"{metal.title()} batch processing failed: {str(e)}",
+                "using_ml_models": False,
+                "timestamp": datetime.now().isoformat()
+            }), 500
+
+    @blueprint.route('/models/activate', methods=['POST'])
+    def activate_models():
+        """Load a model version (newest on disk by default) and swap it in without a restart"""
+        if not admin_allowed():
+            return jsonify({
+                "success": False,
+                "error": "Model activation requires the X-LCA-Admin-Token header",
+                "timestamp": datetime.now().isoformat()
+            }), 403
+        metal = g.pipeline.metal
+        data = request.get_json(silent=True) or {}
+        try:
+            models = g.pipeline.registry.activate(metal, data.get('version'))
+            # Keys carry the model version already; this just frees the old entries
+            response_cache.invalidate(metal)
+        except KeyError as e:
+            return jsonify({
+                "success": False,
+                "error": str(e),
+                "available_versions": g.pipeline.registry.versions(metal)
+            }), 404
+
+        return jsonify({
+            "success": True,
+            "model_timestamp": models.version,
+            "model_status": models.status(),
+            "timestamp": datetime.now().isoformat()
+        })
+
+    return blueprint
@@ -0,0 +1,125 @@
+"""
+Conformal Calibration Artifacts
+===============================
+
+Split-conformal prediction intervals precomputed per model and version, so
+serving an interval is one array lookup instead of any computation.
+
+``scripts/calibrate_models.py`` scores calibration rows with a version's
+models and stores, for each regression model, the absolute residual quantile
+at each coverage level, per process class plus one pooled row for all classes:
+
+    half_widths[model][class row, coverage column]
+
+The table is written next to the models as ``<prefix>calibration_<version>.json``
+and the model registry loads it as one more artifact of the version (kind
+``calibration``). At predict time the interval of a prediction is
+``prediction ± half_widths[class id, coverage]``; rows without a class (or
+with one that had too few calibration rows) use the pooled row.
+"""
+
+import json
+import math
+from pathlib import Path
+
+import numpy as np
+
+CALIBRATION_FORMAT_VERSION = 1
+CALIBRATION_METHOD = 'split_conformal_absolute_residual'
+DEFAULT_COVERAGES = (0.8, 0.9, 0.95)
+
+
+def conformal_quantile(residuals, coverage):
+    """Absolute residual quantile with the finite-sample correction: level ceil((n + 1) * coverage) / n"""
+    residuals = np.asarray(residuals, dtype=float)
+    n = len(residuals)
+    if n == 0:
+        return math.nan
+    rank = math.ceil((n + 1) * coverage)
+    if rank > n:
+        # Too few rows for this coverage: the widest residual is the best available bound
+        return float(residuals.max())
+    return float(np.partition(residuals, rank - 1)[rank - 1])
+
+
+def residual_half_widths(residuals, class_ids, n_classes, coverages=DEFAULT_COVERAGES, min_class_rows=30):
+    """(n_classes + 1, n_coverages) half widths: one row per class id, then the pooled row
+
+    Classes with fewer than min_class_rows calibration rows get the pooled widths.
+    """
+    residuals = np.abs(np.asarray(residuals, dtype=float))
+    class_ids = np.asarray(class_ids)
+    pooled = [conformal_quantile(residuals, coverage) for coverage in coverages]
+    half_widths = np.tile(pooled, (n_classes + 1, 1))
+    rows = np.zeros(n_classes, dtype=int)
+
+    for class_id in range(n_classes):
+        class_residuals = residuals[class_ids == class_id]
+        rows[class_id] = len(class_residuals)
+        if len(class_residuals) >= min_class_rows:
+            half_widths[class_id] = [conformal_quantile(class_residuals, coverage) for coverage in coverages]
+    return half_widths, rows
+
+
+def save_calibration(path, table):
+    """Write a calibration table ({'models': {kind: {'half_widths': ...}}, ...}) as JSON"""
+    table = {'format_version': CALIBRATION_FORMAT_VERSION, 'method': CALIBRATION_METHOD, **table}
+    Path(path).write_text(json.dumps(table, indent=2))
+    return path
+
+
+def load_calibration(path):
+    meta = json.loads(Path(path).read_text())
+    if meta.get('format_version') != CALIBRATION_FORMAT_VERSION:
+        raise ValueError(f"Unsupported calibration format {meta.get('format_version')} in {path}")
+    return CalibrationTable(meta)
+
+
+class CalibrationTable:
+    """Loaded calibration artifact: interval half widths by model, class id and coverage"""
+
+    def __init__(self, meta):
+        self.meta = meta
+        self.coverages = np.asarray(meta['coverages'], dtype=float)
+        self.classes = list(meta['classes'])
+        self.pooled_row = len(self.classes)
+        self.half_widths = {
+            kind: np.asarray(entry['half_widths'], dtype=float) for kind, entry in meta['models'].items()
+        }
+
+    def __contains__(self, kind):
+        return kind in self.half_widths
+
+    def coverage_column(self, coverage):
+        """Column of the narrowest calibrated coverage at least as high as requested (else the highest)"""
+        return min(int(np.searchsorted(self.coverages, coverage - 1e-9)), len(self.coverages) - 1)
+
+    def intervals(self, kind, predictions, class_ids=None, coverage=0.9):
+        """(lower, upper) arrays around predictions; class_ids are encoder ids, NaN/None for no class"""
+        predictions = np.asarray(predictions, dtype=float)
+        rows = np.full(len(predictions), self.pooled_row)
+        if class_ids is not None:
+            class_ids = np.asarray(class_ids, dtype=float)
+            known = np.isfinite(class_ids) & (class_ids >= 0) & (class_ids < len(self.classes))
+            rows[known] = class_ids[known].astype(int)
+        half_width = self.half_widths[kind][rows, self.coverage_column(coverage)]
+        return predictions - half_width, predictions + half_width
+
+
+def interval_columns(calibration, outputs, class_ids, coverage):
+    """Interval columns for served model outputs: {kind: (output name, values, predicted mask)}
+
+    Gives '<name>_lower' / '<name>_upper' (NaN on rows the model did not predict)
+    for each kind in the table, plus 'interval_coverage'.
+    """
+    columns = {}
+    for kind, (name, values, predicted) in outputs.items():
+        if kind not in calibration:
+            continue
+        lower, upper = calibration.intervals(kind, values, class_ids, coverage)
+        columns[f"{name}_lower"] = np.where(predicted, lower, np.nan)
+        columns[f"{name}_upper"] = np.where(predicted, upper, np.nan)
+    if columns:
+        served = calibration.coverages[calibration.coverage_column(coverage)]
+        columns["interval_coverage"] = np.full(len(class_ids), served)
+    return columns
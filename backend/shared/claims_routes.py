@@ -0,0 +1,110 @@
+"""
+Claims API Routes
+=================
+
+Blueprint with the environmental claims endpoints:
+
+    POST /claims/analyze   classify {"text": ...}, {"texts": [...]} or {"report": ...}
+    GET  /claims/status    classifier state (warming / ready / ...), runtime and cache
+
+Registering the blueprint starts the classifier warm-up in the background
+(shared/claims_service.py). Until it is ready ``/claims/analyze`` answers 503
+with ``Retry-After``; other routes are not affected.
+"""
+
+import logging
+import os
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import datetime
+
+from flask import Blueprint, jsonify, request
+
+from shared.claims_service import CLAIMS_WARMING, ClaimsNotReady, claims_service
+from shared.service_metrics import annotate_request
+
+logger = logging.getLogger(__name__)
+
+MAX_TEXTS = int(os.environ.get('LCA_CLAIMS_MAX_TEXTS', 1000))
+MAX_REPORT_CHARS = int(os.environ.get('LCA_CLAIMS_MAX_REPORT_CHARS', 2_000_000))
+WARMING_RETRY_AFTER = 5
+
+
+def error_response(message, status, **fields):
+    return jsonify({
+        "success": False,
+        "error": message,
+        **fields,
+        "timestamp": datetime.now().isoformat()
+    }), status
+
+
+def create_claims_blueprint(name, service=None):
+    """Claims routes served by a ClaimsService (the process-wide one by default)"""
+    service = service or claims_service
+    blueprint = Blueprint(name, __name__)
+
+    @blueprint.record_once
+    def warm_up(state):
+        service.start_warmup()
+
+    @blueprint.route('/claims/status', methods=['GET'])
+    def claims_status():
+        """State of the claims classifier"""
+        return jsonify({
+            "success": True,
+            "claims_classifier": service.status(),
+            "timestamp": datetime.now().isoformat()
+        })
+
+    @blueprint.route('/claims/analyze', methods=['POST'])
+    def analyze_claims():
+        """Classify one text, a list of texts or a whole report"""
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return error_response("Request body must be a JSON object with 'text', 'texts' or 'report'", 400)
+
+        if 'report' in data:
+            report = data['report']
+            if not isinstance(report, str):
+                return error_response("'report' must be a string", 400)
+            if len(report) > MAX_REPORT_CHARS:
+                return error_response(f"'report' is longer than {MAX_REPORT_CHARS} characters", 413)
+            method, args = 'analyze_lca_report', (report, bool(data.get('include_sentences', False)))
+            size = len(report)
+        elif 'texts' in data:
+            texts = data['texts']
+            if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+                return error_response("'texts' must be a list of strings", 400)
+            if len(texts) > MAX_TEXTS:
+                return error_response(f"At most {MAX_TEXTS} texts per request", 413)
+            method, args = 'analyze_multiple_claims', (texts,)
+            size = len(texts)
+        elif isinstance(data.get('text'), str):
+            method, args = 'analyze_claim', (data['text'],)
+            size = 1
+        else:
+            return error_response("Request body must have 'text', 'texts' or 'report'", 400)
+
+        annotate_request(claims_method=method, claims_size=size)
+        try:
+            result = service.run(method, *args)
+        except ClaimsNotReady as e:
+            response, status = error_response(str(e), 503, claims_classifier=service.status())
+            if e.state == CLAIMS_WARMING:
+                response.headers['Retry-After'] = str(WARMING_RETRY_AFTER)
+            return response, status
+        except FutureTimeoutError:
+            return error_response(f"Claims analysis took longer than {service.timeout:.0f}s", 504)
+        except Exception as e:
+            logger.error(f"❌ Claims analysis failed: {str(e)}")
+            return error_response(f"Claims analysis failed: {str(e)}", 500)
+
+        key = {'analyze_claim': 'result', 'analyze_multiple_claims': 'results', 'analyze_lca_report': 'report'}[method]
+        return jsonify({
+            "success": True,
+            key: result,
+            "runtime": service.analyzer.runtime,
+            "timestamp": datetime.now().isoformat()
+        })
+
+    return blueprint
@@ -0,0 +1,150 @@
+"""
+Claims Service
+==============
+
+Serves the environmental claims classifier
+(shared/ai_models/environmental_claims_analyzer.py) to the HTTP backends
+without holding them up.
+
+The classifier loads in a background thread (``start_warmup()``), so health
+checks and assessments are answered while it warms up; its state is reported
+as ``disabled``, ``idle``, ``warming``, ``ready`` or ``unavailable`` (could
+not be loaded, e.g. transformers is not installed). Inference runs on a small
+executor (``LCA_CLAIMS_WORKERS`` threads, default 1) rather than on the
+request threads, and a request waits at most ``LCA_CLAIMS_TIMEOUT`` seconds
+(30) for its result. The analysis gets the same deadline and stops at its
+next batch once it passes, and work that has not started is cancelled, so a
+timed-out request does not hold the executor for the requests behind it.
+
+Under a preloading server call ``warm_up_after_fork()`` before the app is
+imported: each worker then loads its own classifier after the fork, as torch
+state does not survive ``fork()``. ``LCA_CLAIMS_ENABLED=0`` turns the
+classifier off.
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+logger = logging.getLogger(__name__)
+
+CLAIMS_DISABLED = 'disabled'
+CLAIMS_IDLE = 'idle'
+CLAIMS_WARMING = 'warming'
+CLAIMS_READY = 'ready'
+CLAIMS_UNAVAILABLE = 'unavailable'
+
+WARMUP_TEXT = "Our recycling process reduces carbon emissions by 95% compared to primary production"
+
+
+class ClaimsNotReady(Exception):
+    """The classifier is not loaded (yet); ``state`` says why"""
+
+    def __init__(self, state, error=None):
+        super().__init__(error or f"Claims classifier is {state}")
+        self.state = state
+
+
+class ClaimsService:
+    """Process-wide claims analyzer loaded in the background, with its own inference executor"""
+
+    def __init__(self, enabled=None, max_workers=None, timeout=None, analyzer_factory=None):
+        if enabled is None:
+            enabled = os.environ.get('LCA_CLAIMS_ENABLED', '1').lower() not in ('0', 'false', 'no')
+        self.enabled = enabled
+        self.max_workers = max_workers or int(os.environ.get('LCA_CLAIMS_WORKERS', 1))
+        self.timeout = timeout or float(os.environ.get('LCA_CLAIMS_TIMEOUT', 30))
+        self.analyzer_factory = analyzer_factory or load_claims_analyzer
+        self._defer_to_fork = False
+        self._reset()
+
+    def _reset(self):
+        self.analyzer = None
+        self.state = CLAIMS_IDLE if self.enabled else CLAIMS_DISABLED
+        self.error = None
+        self.load_seconds = None
+        self._warmup_requested = False
+        self._lock = threading.Lock()
+        # Threads start on the first submit, so a preloading server can fork before that
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='lca-claims')
+
+    def warm_up_after_fork(self):
+        """Hold warm-up back until this process forks, then load in each child"""
+        self._defer_to_fork = True
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self):
+        start = self._warmup_requested
+        self._defer_to_fork = False
+        self._reset()
+        if start:
+            self.start_warmup()
+
+    def start_warmup(self):
+        """Load the classifier in a background thread (once; no-op when disabled or already started)"""
+        with self._lock:
+            if self.state != CLAIMS_IDLE:
+                return
+            if self._defer_to_fork:
+                self._warmup_requested = True
+                return
+            self.state = CLAIMS_WARMING
+        threading.Thread(target=self._warm_up, name='lca-claims-warmup', daemon=True).start()
+
+    def _warm_up(self):
+        started = time.perf_counter()
+        try:
+            analyzer = self.analyzer_factory()
+            if analyzer.classifier is None:
+                raise RuntimeError("Claims classifier model could not be loaded")
+            # One inference so the first real request does not pay for lazy initialisation
+            analyzer.classify([WARMUP_TEXT])
+        except Exception as e:
+            self.error = str(e)
+            self.state = CLAIMS_UNAVAILABLE
+            logger.error(f"❌ Claims classifier unavailable: {str(e)}")
+            return
+
+        self.analyzer = analyzer
+        self.load_seconds = time.perf_counter() - started
+        self.state = CLAIMS_READY
+        logger.info(f"✅ Claims classifier ready ({analyzer.runtime}) in {self.load_seconds:.1f}s")
+
+    def status(self):
+        status = {"state": self.state}
+        if self.analyzer is not None:
+            status.update(runtime=self.analyzer.runtime, load_seconds=round(self.load_seconds, 3),
+                          batch_size=self.analyzer.batch_size, cache=self.analyzer.cache.stats())
+        if self.error:
+            status["error"] = self.error
+        return status
+
+    def run(self, method, *args, **kwargs):
+        """Call an analyzer method on the inference executor and wait for it (at most timeout seconds)
+
+        Raises ClaimsNotReady while the classifier is not loaded and
+        concurrent.futures.TimeoutError when the result takes too long.
+        """
+        if self.state != CLAIMS_READY:
+            raise ClaimsNotReady(self.state, self.error)
+        # The analysis stops itself at this deadline, freeing the executor for the next request
+        deadline = time.monotonic() + self.timeout
+        future = self._executor.submit(getattr(self.analyzer, method), *args, deadline=deadline, **kwargs)
+        try:
+            return future.result(timeout=self.timeout)
+        except (FutureTimeoutError, TimeoutError):
+            # Still queued behind other work: drop it rather than analyze for nobody
+            future.cancel()
+            raise FutureTimeoutError() from None
+
+
+def load_claims_analyzer():
+    # Imported here: transformers (and torch) are heavy and optional for the scoring backends
+    from shared.ai_models.environmental_claims_analyzer import EnvironmentalClaimsAnalyzer
+    return EnvironmentalClaimsAnalyzer()
+
+
+# Service shared by every app in the process
+claims_service = ClaimsService()
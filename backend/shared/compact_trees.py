@@ -0,0 +1,239 @@
+"""
+Compact Tree Ensembles
+======================
+
+Flat, array-backed export of the scikit-learn tree ensembles under
+``models/`` and a NumPy evaluator for it.
+
+Every tree of a forest is concatenated into one node table (``feature``,
+``threshold``, ``left``, ``right``, ``value``) with a ``roots`` index per tree.
+Leaves point back to themselves, so prediction is ``max_depth`` vectorized
+steps over all rows and trees at once, with no per-call input validation
+stack. The evaluator mirrors scikit-learn exactly: inputs are compared as
+float32 and tree outputs are summed in estimator order before averaging.
+
+A compact model is a directory of ``.npy`` files plus ``meta.json`` saved next
+to the pickle (``<model>.pkl`` -> ``<model>.compact/``), written by
+``scripts/export_compact_models.py``. Fitted LabelEncoders are exported too
+(just their classes, in ``meta.json``), so serving from compact exports never
+has to import scikit-learn.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+COMPACT_SUFFIX = '.compact'
+COMPACT_FORMAT_VERSION = 1
+NODE_ARRAYS = ('roots', 'feature', 'threshold', 'left', 'right', 'value')
+
+# Rows evaluated per step; bounds the (rows, trees, outputs) leaf value buffer
+PREDICT_CHUNK_ROWS = 4096
+
+
+def compact_path(artifact_path):
+    """Directory holding the compact export of a model pickle"""
+    return Path(artifact_path).with_suffix(COMPACT_SUFFIX)
+
+
+def _estimators(model):
+    if hasattr(model, 'estimators_'):
+        return list(model.estimators_)
+    if hasattr(model, 'tree_'):
+        return [model]
+    raise TypeError(f"Cannot export {type(model).__name__}: only fitted tree ensembles are supported")
+
+
+def is_label_encoder(model):
+    return hasattr(model, 'classes_') and not hasattr(model, 'tree_') and not hasattr(model, 'estimators_')
+
+
+def export_arrays(model):
+    """Flatten a fitted decision tree / random forest / extra trees model into (arrays, meta)"""
+    estimators = _estimators(model)
+    is_classifier = hasattr(model, 'classes_')
+    n_outputs = getattr(model, 'n_outputs_', 1)
+    if is_classifier and n_outputs != 1:
+        raise TypeError("Multi-output classifiers are not supported")
+
+    roots, feature, threshold, left, right, value = [], [], [], [], [], []
+    offset = 0
+    for estimator in estimators:
+        tree = estimator.tree_
+        nodes = np.arange(tree.node_count)
+        is_leaf = tree.children_left == -1
+
+        roots.append(offset)
+        # Leaves loop back to themselves so every row can take max_depth steps
+        feature.append(np.where(is_leaf, 0, tree.feature))
+        threshold.append(tree.threshold)
+        left.append(np.where(is_leaf, nodes, tree.children_left) + offset)
+        right.append(np.where(is_leaf, nodes, tree.children_right) + offset)
+
+        if is_classifier:
+            # Classifier trees store class fractions, used as-is by DecisionTreeClassifier.predict_proba
+            value.append(tree.value[:, 0, :len(model.classes_)].astype(np.float64))
+        else:
+            value.append(tree.value[:, :, 0].astype(np.float64))
+        offset += tree.node_count
+
+    arrays = {
+        'roots': np.asarray(roots, dtype=np.int32),
+        'feature': np.concatenate(feature).astype(np.int32),
+        'threshold': np.concatenate(threshold).astype(np.float64),
+        'left': np.concatenate(left).astype(np.int32),
+        'right': np.concatenate(right).astype(np.int32),
+        'value': np.ascontiguousarray(np.concatenate(value)),
+    }
+    meta = {
+        'format_version': COMPACT_FORMAT_VERSION,
+        'source_type': type(model).__name__,
+        'task': 'classification' if is_classifier else 'regression',
+        'n_features_in': int(model.n_features_in_),
+        'n_outputs': int(n_outputs),
+        'n_estimators': len(estimators),
+        'max_depth': int(max(estimator.tree_.max_depth for estimator in estimators)),
+        'node_count': int(offset),
+        'classes': model.classes_.tolist() if is_classifier else None,
+        'feature_names_in': (
+            model.feature_names_in_.tolist() if hasattr(model, 'feature_names_in_') else None
+        ),
+    }
+    return arrays, meta
+
+
+def save_compact(model, directory):
+    """Export a fitted tree ensemble to a compact model directory"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    if is_label_encoder(model):
+        arrays, meta = {}, {
+            'format_version': COMPACT_FORMAT_VERSION,
+            'source_type': type(model).__name__,
+            'task': 'label_encoder',
+            'classes': model.classes_.tolist(),
+        }
+    else:
+        arrays, meta = export_arrays(model)
+    for name, array in arrays.items():
+        np.save(directory / f"{name}.npy", array, allow_pickle=False)
+    (directory / 'meta.json').write_text(json.dumps(meta, indent=2))
+    return directory
+
+
+def load_compact(directory, mmap_mode=None):
+    """Load a compact model directory; mmap_mode='r' maps the node tables instead of reading them"""
+    directory = Path(directory)
+    meta = json.loads((directory / 'meta.json').read_text())
+    if meta.get('format_version') != COMPACT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported compact model format {meta.get('format_version')} in {directory}")
+    if meta['task'] == 'label_encoder':
+        return CompactLabelEncoder(meta['classes'])
+
+    arrays = {
+        name: np.load(directory / f"{name}.npy", mmap_mode=mmap_mode, allow_pickle=False)
+        for name in NODE_ARRAYS
+    }
+    return CompactForest(arrays, meta)
+
+
+class CompactForest:
+    """NumPy evaluator for an exported tree ensemble, a drop-in for its predict/predict_proba"""
+
+    def __init__(self, arrays, meta):
+        self.meta = meta
+        # Plain ndarray views: memory-mapped tables stay mapped but index without np.memmap overhead
+        self.roots = np.asarray(arrays['roots'])
+        self.feature = np.asarray(arrays['feature'])
+        self.threshold = np.asarray(arrays['threshold'])
+        self.left = np.asarray(arrays['left'])
+        self.right = np.asarray(arrays['right'])
+        self.value = np.asarray(arrays['value'])
+
+        self.n_features_in_ = meta['n_features_in']
+        self.n_outputs_ = meta['n_outputs']
+        self.max_depth = meta['max_depth']
+        self.is_classifier = meta['task'] == 'classification'
+        self.classes_ = np.asarray(meta['classes']) if self.is_classifier else None
+        if meta.get('feature_names_in'):
+            self.feature_names_in_ = np.asarray(meta['feature_names_in'], dtype=object)
+
+    def _check_input(self, X):
+        # Trees compare float32 inputs, as scikit-learn does
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2:
+            raise ValueError(f"Expected 2D array, got {X.ndim}D array instead")
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"X has {X.shape[1]} features, but {self.meta['source_type']} "
+                f"is expecting {self.n_features_in_} features as input."
+            )
+        if not np.isfinite(X).all():
+            raise ValueError("Input X contains NaN or infinity or a value too large for dtype('float32').")
+        return X
+
+    def apply(self, X):
+        """Leaf node index reached in every tree, shape (n_rows, n_estimators)"""
+        return self._apply(self._check_input(X))
+
+    def _apply(self, X):
+        nodes = np.repeat(self.roots[np.newaxis, :], len(X), axis=0)
+        rows = np.arange(len(X))[:, np.newaxis]
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def _mean_leaf_value(self, X):
+        X = self._check_input(X)
+        out = np.empty((len(X), self.value.shape[1]))
+        for start in range(0, len(X), PREDICT_CHUNK_ROWS):
+            leaves = self._apply(X[start:start + PREDICT_CHUNK_ROWS])
+            # cumsum adds trees strictly one by one in estimator order, like the forest's
+            # accumulation loop (sum() may reorder and differ in the last bit)
+            out[start:start + len(leaves)] = np.cumsum(self.value[leaves.T], axis=0)[-1] / len(self.roots)
+        return out
+
+    def estimator_values(self, X):
+        """Leaf value of every tree, shape (n_rows, n_estimators, n_outputs or n_classes)
+
+        Regression trees give their prediction, classification trees their class
+        fractions; averaging over axis 1 gives predict / predict_proba.
+        """
+        X = self._check_input(X)
+        return self.value[self._apply(X)]
+
+    def predict_proba(self, X):
+        if not self.is_classifier:
+            raise AttributeError("predict_proba is only available for classifiers")
+        return self._mean_leaf_value(X)
+
+    def predict(self, X):
+        mean_value = self._mean_leaf_value(X)
+        if self.is_classifier:
+            return self.classes_.take(np.argmax(mean_value, axis=1), axis=0)
+        return mean_value[:, 0] if self.n_outputs_ == 1 else mean_value
+
+
+class CompactLabelEncoder:
+    """Exported LabelEncoder: the sorted classes_ with transform/inverse_transform"""
+
+    def __init__(self, classes):
+        self.classes_ = np.asarray(classes, dtype=object if any(isinstance(c, str) for c in classes) else None)
+
+    def transform(self, y):
+        y = np.asarray(y, dtype=self.classes_.dtype)
+        codes = np.searchsorted(self.classes_, y)
+        unseen = (codes >= len(self.classes_)) | (self.classes_[np.minimum(codes, len(self.classes_) - 1)] != y)
+        if unseen.any():
+            raise ValueError(f"y contains previously unseen labels: {np.unique(y[unseen]).tolist()}")
+        return codes
+
+    def inverse_transform(self, y):
+        y = np.asarray(y)
+        unseen = np.setdiff1d(y, np.arange(len(self.classes_)))
+        if len(unseen):
+            raise ValueError(f"y contains previously unseen labels: {unseen.tolist()}")
+        return self.classes_[y]
@@ -0,0 +1,101 @@
+"""
+Precomputed Explanation Summaries
+=================================
+
+LLM-written explanation summaries generated once per model version instead
+of per request. A summary depends only on the explanation bucket of an
+assessment:
+
+    (energy source, environmental efficiency band, process class)
+
+``scripts/generate_explanations.py`` generates one summary per bucket the
+version's models can produce and writes them to
+``<model dir>/explanations_<version>.json``. The model registry loads the file
+as the ``explanations`` artifact of the version, and serving a summary is a
+dict lookup. The enhancer adds summaries to explanations only when
+``LCA_LLM_SUMMARIES=1``.
+"""
+
+import json
+from itertools import product
+from pathlib import Path
+
+EXPLANATIONS_FORMAT_VERSION = 1
+
+EXPLANATION_ENERGY_SOURCES = ('renewable', 'grid', 'coal', 'gas', 'other')
+EFFICIENCY_BANDS = ('excellent', 'good', 'needs_improvement', 'unknown')
+# Process classes served without the classifier (its fallback) or without any classification
+DEFAULT_PROCESS_CLASSES = ('Secondary Aluminum Recycling', 'Unknown')
+
+
+def efficiency_band(score):
+    """Band of an environmental efficiency score, same thresholds as the explanation texts"""
+    if score is None:
+        return 'unknown'
+    if score > 0.8:
+        return 'excellent'
+    if score > 0.6:
+        return 'good'
+    return 'needs_improvement'
+
+
+def explanation_bucket(features, predictions):
+    """(energy source, efficiency band, process class) of an assessment and its predictions"""
+    energy_source = str(features.get('energySource', 'grid')).lower()
+    if energy_source not in EXPLANATION_ENERGY_SOURCES:
+        energy_source = 'other'
+    band = efficiency_band(predictions.get('environmental_efficiency'))
+    process_class = predictions.get('process_classification', {}).get('class', 'Unknown')
+    return energy_source, band, str(process_class)
+
+
+def explanation_buckets(process_classes=()):
+    """Every bucket for the given classifier classes (plus the default classes)"""
+    classes = [str(name) for name in process_classes] + list(DEFAULT_PROCESS_CLASSES)
+    return list(product(EXPLANATION_ENERGY_SOURCES, EFFICIENCY_BANDS, classes))
+
+
+def bucket_key(bucket):
+    return '|'.join(bucket)
+
+
+def explanation_prompt(bucket):
+    """Prompt for the explanation summary of a bucket"""
+    energy_source, band, process_class = bucket
+    return f"""
+    Aluminum LCA Result Explanation Task:
+
+    Process class: {process_class}
+    Energy source: {energy_source}
+    Environmental efficiency: {band.replace('_', ' ')}
+
+    Explain in two sentences what drives results like these and the most effective improvement.
+    """
+
+
+def save_explanations(path, table):
+    """Write {'summaries': {bucket key: text}, ...} as an explanations artifact"""
+    table = {'format_version': EXPLANATIONS_FORMAT_VERSION, **table}
+    Path(path).write_text(json.dumps(table, indent=2))
+    return path
+
+
+def load_explanations(path):
+    meta = json.loads(Path(path).read_text())
+    if meta.get('format_version') != EXPLANATIONS_FORMAT_VERSION:
+        raise ValueError(f"Unsupported explanations format {meta.get('format_version')} in {path}")
+    return ExplanationTable(meta)
+
+
+class ExplanationTable:
+    """Loaded explanations artifact: summary text by bucket"""
+
+    def __init__(self, meta):
+        self.meta = meta
+        self.summaries = dict(meta['summaries'])
+
+    def __len__(self):
+        return len(self.summaries)
+
+    def summary(self, bucket):
+        return self.summaries.get(bucket_key(bucket))
@@ -0,0 +1,282 @@
+"""
+Vectorized Feature Builders
+===========================
+
+Columnar versions of the backends' ``prepare_*_features`` functions. Each
+builder takes a pandas DataFrame, a dict of arrays, or a list of
+``assessment_data`` dicts and builds the whole feature matrix with NumPy ops,
+so single requests, batches, CSV chunks and job workers all share one code path.
+
+Every builder returns ``(features, valid)``: an ``(n_rows, n_features)`` float
+matrix and a boolean mask of the rows whose inputs parsed. A row is invalid
+exactly when the single-record ``float(...)`` conversion would have raised.
+"""
+
+from collections.abc import Mapping
+
+import numpy as np
+
+# Column order of each feature matrix, matching the serving feature layout
+ALUMINUM_ENVIRONMENTAL_COLUMNS = [
+    'scrap_ratio', 'recycling_rate', 'waste_ratio', 'energy_recovery_rate',
+    'secondary_material_fraction', 'material_efficiency', 'specific_energy',
+    'is_metallurgy', 'has_circularity', 'total_inputs_log', 'total_outputs_log',
+    'energy_efficiency'
+]
+ALUMINUM_CIRCULARITY_COLUMNS = [
+    'material_efficiency', 'secondary_material_fraction', 'specific_energy',
+    'is_metallurgy', 'total_inputs_log', 'total_outputs_log'
+]
+COPPER_ENVIRONMENTAL_COLUMNS = [
+    'production_scale', 'energy_source', 'location', 'recycling_rate',
+    'material_efficiency', 'scrap_ratio', 'secondary_material_fraction',
+    'energy_recovery_rate', 'total_inputs', 'total_outputs', 'is_metallurgy',
+    'has_circularity'
+]
+COPPER_CIRCULARITY_COLUMNS = [
+    'production_scale', 'energy_source', 'material_efficiency', 'scrap_ratio',
+    'secondary_material_fraction', 'energy_recovery_rate', 'total_inputs',
+    'total_outputs', 'is_metallurgy', 'has_circularity'
+]
+
+# Facility dataset columns (data/<metal>/*_dataset.csv) mapped to assessment_data
+# keys, with the factor that converts them to the API's units (None = categorical)
+DATASET_COLUMNS = {
+    'production_scale': ('productionScale', 1.0),
+    'energy_source': ('energySource', None),
+    'location': ('location', None),
+    'recycling_rate_input': ('recyclingRate', 100.0),          # fraction -> percent
+    'material_efficiency_input': ('materialEfficiency', 100.0),  # fraction -> percent
+    'scrap_ratio': ('scrapRatio', 1.0),
+    'secondary_material_fraction': ('secondaryMaterialFraction', 1.0),
+    'energy_recovery_rate': ('energyRecoveryRate', 1.0),
+    'total_inputs': ('totalInputs', 1.0),
+    'total_outputs': ('totalOutputs', 1.0),
+    'is_metallurgy': ('isMetallurgy', None),
+    'has_circularity': ('hasCircularity', None),
+}
+
+# Aluminum specific energy (GJ/ton) by energy source; coal/gas and anything else use the default
+ALUMINUM_SPECIFIC_ENERGY = {'renewable': 3.5, 'grid': 4.8}
+ALUMINUM_SPECIFIC_ENERGY_DEFAULT = 6.2
+
+# Copper label codes used when the fitted encoders are missing or reject a label
+COPPER_ENERGY_CODES = {'renewable': 0, 'grid': 1, 'coal': 2, 'gas': 3}
+COPPER_LOCATION_CODES = {'urban': 0, 'industrial': 1, 'remote': 2}
+
+
+class AssessmentColumns:
+    """Uniform column access over a DataFrame, a dict of arrays or a list of assessment dicts"""
+
+    def __init__(self, data):
+        self.records = None
+        self.frame = None
+
+        if hasattr(data, 'columns') and hasattr(data, 'index'):
+            # pandas DataFrame (duck-typed so pandas stays an optional import)
+            self.frame = data
+            self.n_rows = len(data.index)
+        elif isinstance(data, Mapping):
+            self.frame = data
+            lengths = {len(np.atleast_1d(values)) for values in data.values()}
+            if len(lengths) > 1:
+                raise ValueError("All columns must have the same length")
+            self.n_rows = lengths.pop() if lengths else 0
+        else:
+            # Rows that are not dicts cannot be parsed and are marked invalid
+            self.records = [row if isinstance(row, Mapping) else None for row in data]
+            self.n_rows = len(self.records)
+
+        self.valid = np.ones(self.n_rows, dtype=bool)
+        if self.records is not None:
+            self.valid &= np.fromiter((row is not None for row in self.records), dtype=bool, count=self.n_rows)
+
+    def raw(self, key, default):
+        """Return the raw values of a column as a 1-D array, filling in the default when absent"""
+        if self.records is not None:
+            values = (row.get(key, default) if row is not None else default for row in self.records)
+            return np.fromiter(values, dtype=object, count=self.n_rows)
+        if key in self.frame:
+            values = self.frame[key]
+            values = values.to_numpy() if hasattr(values, 'to_numpy') else np.asarray(values)
+            return np.broadcast_to(values, (self.n_rows,))
+        return np.full(self.n_rows, default, dtype=object)
+
+    def number(self, key, default):
+        """Parse a numeric column to floats, marking rows that fail to parse as invalid"""
+        values, parsed = to_float(self.raw(key, default))
+        self.valid &= parsed
+        return values
+
+    def percent(self, key, default=0):
+        """Parse a 0-100 percentage column to a 0-1 fraction"""
+        return self.number(key, default) / 100.0
+
+    def flag(self, key, default=False):
+        """Truthiness of a column as 1.0/0.0"""
+        values = self.raw(key, default)
+        if values.dtype.kind in 'biuf':
+            return (values != 0).astype(float)
+        return np.fromiter((1.0 if value else 0.0 for value in values.tolist()), dtype=float, count=len(values))
+
+    def label(self, key, default):
+        """Categorical column as an object array suitable for elementwise comparison"""
+        return np.asarray(self.raw(key, default), dtype=object)
+
+
+def to_float(values):
+    """Vectorized float() over an array; returns (floats, parsed_mask) with NaN where parsing failed"""
+    values = np.asarray(values)
+    if values.dtype.kind in 'biuf':
+        return values.astype(float), np.ones(len(values), dtype=bool)
+
+    try:
+        parsed = values.astype(float)
+        # astype() turns None into NaN where float(None) raises, so None stays invalid
+        missing = np.equal(values, None) if values.dtype == object else np.zeros(len(values), dtype=bool)
+        parsed[missing] = np.nan
+        return parsed, ~missing
+    except (TypeError, ValueError):
+        pass
+
+    parsed = np.empty(len(values), dtype=float)
+    ok = np.ones(len(values), dtype=bool)
+    for i, value in enumerate(values.tolist()):
+        try:
+            parsed[i] = float(value)
+        except (TypeError, ValueError):
+            parsed[i] = np.nan
+            ok[i] = False
+    return parsed, ok
+
+
+def dataset_columns(frame):
+    """Assessment columns of a facility dataset chunk: dataset columns renamed and rescaled
+    per DATASET_COLUMNS; columns already named like assessment_data keys are used as they are"""
+    columns = {}
+    for column, (key, scale) in DATASET_COLUMNS.items():
+        if column not in frame or key in frame:
+            continue
+        values = frame[column]
+        values = values.to_numpy() if hasattr(values, 'to_numpy') else np.asarray(values)
+        if scale is not None and scale != 1.0:
+            parsed, ok = to_float(values)
+            if ok.all():
+                values = parsed * scale
+            else:
+                # Unparseable cells stay as they are and make their rows invalid downstream
+                values = np.asarray(values, dtype=object).copy()
+                values[ok] = parsed[ok] * scale
+        columns[key] = values
+
+    for key in frame:
+        if key not in columns and key not in DATASET_COLUMNS:
+            values = frame[key]
+            columns[key] = values.to_numpy() if hasattr(values, 'to_numpy') else np.asarray(values)
+    return columns
+
+
+def encode_labels(labels, encoder, fallback_codes, fallback_default):
+    """Vectorized LabelEncoder.transform that falls back to a fixed code table for unseen labels"""
+    codes = np.select(
+        [labels == label for label in fallback_codes],
+        list(fallback_codes.values()),
+        default=fallback_default
+    ).astype(float)
+
+    classes = getattr(encoder, 'classes_', None)
+    if classes is not None:
+        # LabelEncoder codes are the positions in its sorted classes_
+        for code, label in enumerate(classes):
+            codes[labels == label] = code
+    return codes
+
+
+def aluminum_specific_energy(energy_source):
+    """Map energy source labels to aluminum specific energy (GJ/ton)"""
+    return np.select(
+        [energy_source == source for source in ALUMINUM_SPECIFIC_ENERGY],
+        list(ALUMINUM_SPECIFIC_ENERGY.values()),
+        default=ALUMINUM_SPECIFIC_ENERGY_DEFAULT
+    )
+
+
+def build_aluminum_environmental_features(data):
+    """Build the aluminum environmental efficiency feature matrix"""
+    columns = AssessmentColumns(data)
+
+    specific_energy = aluminum_specific_energy(columns.label('energySource', 'grid'))
+    features = np.column_stack([
+        columns.percent('scrapRatio'),
+        columns.percent('recyclingRate'),
+        columns.percent('wasteRatio'),
+        columns.percent('energyRecoveryRate'),
+        columns.percent('secondaryMaterialFraction'),
+        columns.percent('materialEfficiency'),
+        specific_energy,
+        columns.flag('isMetallurgy'),
+        columns.flag('hasCircularity'),
+        np.log1p(columns.number('totalInputs', 100)),   # total_inputs_log
+        np.log1p(columns.number('totalOutputs', 80)),   # total_outputs_log
+        1.0 / (specific_energy + 0.1)                   # energy_efficiency
+    ])
+
+    return features, columns.valid
+
+
+def build_aluminum_circularity_features(data):
+    """Build the aluminum circularity feature matrix"""
+    columns = AssessmentColumns(data)
+
+    features = np.column_stack([
+        columns.percent('materialEfficiency'),
+        columns.percent('secondaryMaterialFraction'),
+        aluminum_specific_energy(columns.label('energySource', 'grid')),
+        columns.flag('isMetallurgy'),
+        np.log1p(columns.number('totalInputs', 100)),
+        np.log1p(columns.number('totalOutputs', 80))
+    ])
+
+    return features, columns.valid
+
+
+def build_copper_environmental_features(data, energy_encoder=None, location_encoder=None):
+    """Build the copper environmental efficiency (and process classification) feature matrix"""
+    columns = AssessmentColumns(data)
+
+    features = np.column_stack([
+        columns.number('productionScale', 500),
+        encode_labels(columns.label('energySource', 'grid'), energy_encoder, COPPER_ENERGY_CODES, 1),
+        encode_labels(columns.label('location', 'industrial'), location_encoder, COPPER_LOCATION_CODES, 1),
+        columns.percent('recyclingRate'),
+        columns.percent('materialEfficiency'),
+        columns.percent('scrapRatio'),
+        columns.percent('secondaryMaterialFraction'),
+        columns.percent('energyRecoveryRate'),
+        columns.number('totalInputs', 100),
+        columns.number('totalOutputs', 80),
+        columns.flag('isMetallurgy'),
+        columns.flag('hasCircularity')
+    ])
+
+    return features, columns.valid
+
+
+def build_copper_circularity_features(data, energy_encoder=None):
+    """Build the copper circularity feature matrix"""
+    columns = AssessmentColumns(data)
+
+    features = np.column_stack([
+        columns.number('productionScale', 500),
+        encode_labels(columns.label('energySource', 'grid'), energy_encoder, COPPER_ENERGY_CODES, 1),
+        columns.percent('materialEfficiency'),
+        columns.percent('scrapRatio'),
+        columns.percent('secondaryMaterialFraction'),
+        columns.percent('energyRecoveryRate'),
+        columns.number('totalInputs', 100),
+        columns.number('totalOutputs', 80),
+        columns.flag('isMetallurgy'),
+        columns.flag('hasCircularity')
+    ])
+
+    return features, columns.valid
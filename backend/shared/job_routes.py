@@ -0,0 +1,105 @@
+"""
+Assessment Job API Routes
+=========================
+
+Blueprint with the asynchronous job endpoints:
+
+    POST /jobs             queue a list of assessments, returns 202 with the job id
+    GET  /jobs/<job_id>    job status, progress and a page of results
+                           (?offset=0&limit=500)
+
+A per-metal backend mounts it with its pipeline; the unified service mounts
+it without one and takes the metal from the request body (``"metal"``). Every
+backend on a host shares the job store, so a per-metal backend only answers
+for its own metal's jobs (404 for the others).
+"""
+
+import logging
+from datetime import datetime
+
+from flask import Blueprint, jsonify, request, url_for
+
+from shared.jobs import get_job_runner
+from shared.pipelines import PIPELINES, get_pipeline
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 5000
+
+
+def create_jobs_blueprint(name, pipeline=None, default_metal='aluminum'):
+    """Job routes bound to one pipeline, or choosing it from the request's "metal" when pipeline is None"""
+    blueprint = Blueprint(name, __name__)
+
+    @blueprint.route('/jobs', methods=['POST'])
+    def create_job():
+        """Queue a portfolio of assessments for background scoring"""
+        data = request.get_json(silent=True)
+        if data is None:
+            return jsonify({
+                "success": False,
+                "error": "Request body must be JSON",
+                "timestamp": datetime.now().isoformat()
+            }), 400
+
+        assessments = data if isinstance(data, list) else data.get('assessments')
+        if not isinstance(assessments, list) or not assessments:
+            return jsonify({
+                "success": False,
+                "error": "'assessments' must be a non-empty list of assessment_data objects",
+                "timestamp": datetime.now().isoformat()
+            }), 400
+
+        metal = data.get('metal', default_metal) if isinstance(data, dict) else default_metal
+        job_pipeline = pipeline or get_pipeline(metal)
+        if job_pipeline is None:
+            return jsonify({
+                "success": False,
+                "error": f"Unsupported metal: {metal}",
+                "supported_metals": list(PIPELINES),
+                "timestamp": datetime.now().isoformat()
+            }), 404
+
+        job = get_job_runner().submit(job_pipeline, assessments)
+        return jsonify({
+            "success": True,
+            "job": job,
+            "status_url": url_for(f'{blueprint.name}.get_job', job_id=job['id']),
+            "timestamp": datetime.now().isoformat()
+        }), 202
+
+    @blueprint.route('/jobs/<job_id>', methods=['GET'])
+    def get_job(job_id):
+        """Job progress and one page of results"""
+        runner = get_job_runner()
+        store = runner.store
+        job = store.get(job_id)
+        if job is not None and runner.lease_expired(job):
+            # Its process died or was recycled: resume it now rather than on the next lease check
+            runner.recover()
+            job = store.get(job_id)
+        if job is None or (pipeline is not None and job['metal'] != pipeline.metal):
+            return jsonify({
+                "success": False,
+                "error": f"Job {job_id} not found",
+                "timestamp": datetime.now().isoformat()
+            }), 404
+
+        offset = max(request.args.get('offset', 0, type=int), 0)
+        limit = min(max(request.args.get('limit', DEFAULT_PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+        results = store.results(job_id, offset, limit)
+        next_offset = offset + len(results)
+
+        return jsonify({
+            "success": True,
+            "job": job,
+            "progress": round(job['processed'] / job['total'], 4) if job['total'] else 1.0,
+            "offset": offset,
+            "results": results,
+            # More results are (or will be) available past this page
+            "next_offset": next_offset if next_offset < job['total'] else None,
+            "timestamp": datetime.now().isoformat()
+        })
+
+    return blueprint
@@ -0,0 +1,434 @@
+"""
+Assessment Jobs
+===============
+
+Asynchronous scoring for portfolio runs too large for one HTTP request.
+``POST /api/jobs`` stores the assessments and returns a job id at once; an
+in-process worker pool scores them in vectorized chunks through the metal's
+AssessmentPipeline (one predict call per model per chunk) and writes each
+chunk's results to the job store, where ``GET /api/jobs/<id>`` reads
+progress and pages of results.
+
+The store is swappable: SQLiteJobStore (the default, shared by every worker
+process on the host) or MemoryJobStore, or any JobStore subclass passed to
+JobRunner. Configured with ``LCA_JOB_DB``, ``LCA_JOB_WORKERS``,
+``LCA_JOB_CHUNK_SIZE``, ``LCA_JOB_RETENTION_HOURS`` and
+``LCA_JOB_LEASE_SECONDS``.
+
+A queued or running job is leased by the process that holds it: its
+``updated_at`` is renewed every third of the lease while that process lives.
+When a worker dies or is recycled its jobs stop being renewed. Every runner
+checks for expired leases on the same timer (and when a status request finds
+one), claims those jobs and resumes them from the last stored chunk, with the
+model version they started on.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from shared.json_provider import dumps, loads
+from shared.pipelines import get_pipeline
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOB_DB = Path(tempfile.gettempdir()) / "lca_jobs.sqlite3"
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_COMPLETED = 'completed'
+JOB_FAILED = 'failed'
+ACTIVE_JOB_STATUSES = (JOB_QUEUED, JOB_RUNNING)
+
+
+class JobStore:
+    """Interface of a job state store; jobs are dicts with the fields created in create()"""
+
+    def create(self, job_id, metal, assessments):
+        raise NotImplementedError
+
+    def get(self, job_id):
+        """Job dict (without inputs or results), or None"""
+        raise NotImplementedError
+
+    def update(self, job_id, **fields):
+        raise NotImplementedError
+
+    def assessments(self, job_id, offset, limit):
+        """Input assessments [offset, offset + limit)"""
+        raise NotImplementedError
+
+    def add_results(self, job_id, offset, results, failed):
+        """Store a chunk of results starting at row offset and advance the job's progress"""
+        raise NotImplementedError
+
+    def results(self, job_id, offset, limit):
+        """Stored results [offset, offset + limit) in row order"""
+        raise NotImplementedError
+
+    def purge(self, older_than):
+        """Delete jobs created before a datetime"""
+        raise NotImplementedError
+
+    def stale(self, older_than):
+        """Queued or running jobs whose lease (updated_at) was last renewed before a datetime"""
+        raise NotImplementedError
+
+    def claim(self, job_id, updated_at):
+        """Take over a stale job (requeue it and renew its lease) unless another process renewed or
+        claimed it since updated_at was read; True when claimed"""
+        raise NotImplementedError
+
+    def touch(self, job_ids):
+        """Renew the lease of queued or running jobs"""
+        raise NotImplementedError
+
+    @staticmethod
+    def new_job(job_id, metal, total):
+        now = datetime.now().isoformat()
+        return {
+            'id': job_id,
+            'metal': metal,
+            'status': JOB_QUEUED,
+            'total': total,
+            'processed': 0,
+            'failed': 0,
+            'model_version': None,
+            'error': None,
+            'created_at': now,
+            'updated_at': now,
+            'finished_at': None
+        }
+
+
+class MemoryJobStore(JobStore):
+    """Job store in a dict, for a single process (tests, development)"""
+
+    def __init__(self):
+        self._jobs = {}
+        self._inputs = {}
+        self._results = {}
+        self._lock = threading.Lock()
+
+    def create(self, job_id, metal, assessments):
+        with self._lock:
+            self._jobs[job_id] = self.new_job(job_id, metal, len(assessments))
+            self._inputs[job_id] = list(assessments)
+            self._results[job_id] = {}
+            return dict(self._jobs[job_id])
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def update(self, job_id, **fields):
+        with self._lock:
+            self._jobs[job_id].update(fields, updated_at=datetime.now().isoformat())
+
+    def assessments(self, job_id, offset, limit):
+        with self._lock:
+            return self._inputs[job_id][offset:offset + limit]
+
+    def add_results(self, job_id, offset, results, failed):
+        with self._lock:
+            stored = self._results[job_id]
+            for i, result in enumerate(results, start=offset):
+                stored[i] = result
+            job = self._jobs[job_id]
+            job['processed'] += len(results)
+            job['failed'] += failed
+            job['updated_at'] = datetime.now().isoformat()
+
+    def results(self, job_id, offset, limit):
+        with self._lock:
+            stored = self._results.get(job_id, {})
+            return [stored[i] for i in range(offset, offset + limit) if i in stored]
+
+    def purge(self, older_than):
+        cutoff = older_than.isoformat()
+        with self._lock:
+            for job_id in [job_id for job_id, job in self._jobs.items() if job['created_at'] < cutoff]:
+                del self._jobs[job_id], self._inputs[job_id], self._results[job_id]
+
+    def stale(self, older_than):
+        cutoff = older_than.isoformat()
+        with self._lock:
+            return [dict(job) for job in self._jobs.values()
+                    if job['status'] in ACTIVE_JOB_STATUSES and job['updated_at'] < cutoff]
+
+    def claim(self, job_id, updated_at):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job['status'] not in ACTIVE_JOB_STATUSES or job['updated_at'] != updated_at:
+                return False
+            job.update(status=JOB_QUEUED, updated_at=datetime.now().isoformat())
+            return True
+
+    def touch(self, job_ids):
+        now = datetime.now().isoformat()
+        with self._lock:
+            for job_id in job_ids:
+                job = self._jobs.get(job_id)
+                if job is not None and job['status'] in ACTIVE_JOB_STATUSES:
+                    job['updated_at'] = now
+
+
+class SQLiteJobStore(JobStore):
+    """Job store in a SQLite file, shared by every process on the host"""
+
+    JOB_FIELDS = ('id', 'metal', 'status', 'total', 'processed', 'failed', 'model_version',
+                  'error', 'created_at', 'updated_at', 'finished_at')
+
+    def __init__(self, path=None):
+        self.path = Path(path or os.environ.get('LCA_JOB_DB', DEFAULT_JOB_DB))
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.executescript("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY, metal TEXT, status TEXT, total INTEGER,
+                    processed INTEGER, failed INTEGER, model_version TEXT, error TEXT,
+                    created_at TEXT, updated_at TEXT, finished_at TEXT
+                );
+                CREATE TABLE IF NOT EXISTS job_rows (
+                    job_id TEXT, row_index INTEGER, assessment TEXT, result TEXT,
+                    PRIMARY KEY (job_id, row_index)
+                );
+            """)
+
+    def _connection(self):
+        """One connection per thread (sqlite3 connections must not be shared across threads)"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def create(self, job_id, metal, assessments):
+        job = self.new_job(job_id, metal, len(assessments))
+        with self._connection() as connection:
+            connection.execute(
+                f"INSERT INTO jobs ({', '.join(self.JOB_FIELDS)}) VALUES ({', '.join('?' * len(self.JOB_FIELDS))})",
+                [job[field] for field in self.JOB_FIELDS]
+            )
+            connection.executemany(
+                "INSERT INTO job_rows (job_id, row_index, assessment) VALUES (?, ?, ?)",
+                ((job_id, i, json.dumps(assessment)) for i, assessment in enumerate(assessments))
+            )
+        return job
+
+    def get(self, job_id):
+        row = self._connection().execute(
+            f"SELECT {', '.join(self.JOB_FIELDS)} FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return dict(zip(self.JOB_FIELDS, row)) if row else None
+
+    def update(self, job_id, **fields):
+        fields['updated_at'] = datetime.now().isoformat()
+        with self._connection() as connection:
+            connection.execute(
+                f"UPDATE jobs SET {', '.join(f'{field} = ?' for field in fields)} WHERE id = ?",
+                [*fields.values(), job_id]
+            )
+
+    def assessments(self, job_id, offset, limit):
+        rows = self._connection().execute(
+            "SELECT assessment FROM job_rows WHERE job_id = ? AND row_index >= ? ORDER BY row_index LIMIT ?",
+            (job_id, offset, limit)
+        ).fetchall()
+        return [json.loads(assessment) for (assessment,) in rows]
+
+    def add_results(self, job_id, offset, results, failed):
+        with self._connection() as connection:
+            connection.executemany(
+                "UPDATE job_rows SET result = ? WHERE job_id = ? AND row_index = ?",
+                ((dumps(result), job_id, i) for i, result in enumerate(results, start=offset))
+            )
+            connection.execute(
+                "UPDATE jobs SET processed = processed + ?, failed = failed + ?, updated_at = ? WHERE id = ?",
+                (len(results), failed, datetime.now().isoformat(), job_id)
+            )
+
+    def results(self, job_id, offset, limit):
+        rows = self._connection().execute(
+            "SELECT result FROM job_rows WHERE job_id = ? AND row_index >= ? AND result IS NOT NULL "
+            "ORDER BY row_index LIMIT ?",
+            (job_id, offset, limit)
+        ).fetchall()
+        return [loads(result) for (result,) in rows]
+
+    def purge(self, older_than):
+        with self._connection() as connection:
+            connection.execute(
+                "DELETE FROM job_rows WHERE job_id IN (SELECT id FROM jobs WHERE created_at < ?)",
+                (older_than.isoformat(),)
+            )
+            connection.execute("DELETE FROM jobs WHERE created_at < ?", (older_than.isoformat(),))
+
+    def stale(self, older_than):
+        rows = self._connection().execute(
+            f"SELECT {', '.join(self.JOB_FIELDS)} FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+            (*ACTIVE_JOB_STATUSES, older_than.isoformat())
+        ).fetchall()
+        return [dict(zip(self.JOB_FIELDS, row)) for row in rows]
+
+    def claim(self, job_id, updated_at):
+        # Conditional on the lease read by stale(): of several processes claiming at once, one wins
+        with self._connection() as connection:
+            claimed = connection.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ? AND updated_at = ? AND status IN (?, ?)",
+                (JOB_QUEUED, datetime.now().isoformat(), job_id, updated_at, *ACTIVE_JOB_STATUSES)
+            ).rowcount
+        return claimed == 1
+
+    def touch(self, job_ids):
+        now = datetime.now().isoformat()
+        with self._connection() as connection:
+            connection.executemany(
+                "UPDATE jobs SET updated_at = ? WHERE id = ? AND status IN (?, ?)",
+                ((now, job_id, *ACTIVE_JOB_STATUSES) for job_id in job_ids)
+            )
+
+
+class JobRunner:
+    """In-process worker pool that scores stored jobs chunk by chunk"""
+
+    def __init__(self, store=None, max_workers=None, chunk_size=None, retention_hours=None, lease_seconds=None):
+        self.store = store or SQLiteJobStore()
+        self.max_workers = max_workers or int(os.environ.get('LCA_JOB_WORKERS', 2))
+        self.chunk_size = chunk_size or int(os.environ.get('LCA_JOB_CHUNK_SIZE', 1000))
+        self.retention = timedelta(hours=retention_hours or float(os.environ.get('LCA_JOB_RETENTION_HOURS', 24)))
+        self.lease = timedelta(seconds=lease_seconds or float(os.environ.get('LCA_JOB_LEASE_SECONDS', 300)))
+        # Threads start on the first submit, so a preloading server can fork before that
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='lca-job')
+        self._held = set()
+        self._held_lock = threading.Lock()
+        self._lease_thread = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        """Start the lease timer: renew this process's leases and recover expired jobs (idempotent)"""
+        with self._held_lock:
+            if self._lease_thread is None:
+                self._lease_thread = threading.Thread(target=self._maintain_leases, name='lca-job-lease', daemon=True)
+                self._lease_thread.start()
+        return self
+
+    def submit(self, pipeline, assessments):
+        """Store a job and queue it; returns the job dict"""
+        self.store.purge(datetime.now() - self.retention)
+        self.recover()
+
+        job_id = uuid.uuid4().hex
+        job = self.store.create(job_id, pipeline.metal, assessments)
+        self._queue(job_id, pipeline)
+        logger.info(f"📥 {pipeline.metal.title()} job {job_id} queued with {len(assessments)} assessments")
+        return job
+
+    def lease_expired(self, job):
+        """True for a queued or running job whose lease was not renewed in time"""
+        return (job['status'] in ACTIVE_JOB_STATUSES
+                and job['updated_at'] < (datetime.now() - self.lease).isoformat())
+
+    def recover(self):
+        """Claim and re-queue jobs whose lease expired (their process died or was recycled); returns their ids"""
+        recovered = []
+        for job in self.store.stale(datetime.now() - self.lease):
+            if not self.store.claim(job['id'], job['updated_at']):
+                continue
+            pipeline = get_pipeline(job['metal'])
+            if pipeline is None:
+                self.store.update(job['id'], status=JOB_FAILED, error=f"Unsupported metal: {job['metal']}",
+                                  finished_at=datetime.now().isoformat())
+                continue
+            logger.warning(f"♻️ {job['metal'].title()} job {job['id']} was abandoned at "
+                           f"{job['processed']}/{job['total']} assessments; resuming it")
+            self._queue(job['id'], pipeline)
+            recovered.append(job['id'])
+        return recovered
+
+    def _queue(self, job_id, pipeline):
+        with self._held_lock:
+            self._held.add(job_id)
+        self.start()
+        self._executor.submit(self._run, job_id, pipeline)
+
+    def _maintain_leases(self):
+        """Renew the lease of every job this process holds, so no other process takes them over,
+        then take over the jobs of processes that stopped renewing theirs"""
+        while not self._stopped.wait(self.lease.total_seconds() / 3):
+            with self._held_lock:
+                job_ids = list(self._held)
+            try:
+                if job_ids:
+                    self.store.touch(job_ids)
+                self.recover()
+            except Exception as e:
+                logger.error(f"❌ Job lease maintenance failed: {str(e)}")
+
+    def _job_models(self, pipeline, version):
+        """The version a resumed job started on (if still available), else the active one"""
+        if version is not None:
+            try:
+                return pipeline.registry.version(pipeline.metal, version)
+            except KeyError:
+                logger.warning(f"⚠️ {pipeline.metal.title()} model version {version} is gone; "
+                               f"resuming on the active version")
+        return pipeline.active_models()
+
+    def _run(self, job_id, pipeline):
+        try:
+            self._score_job(job_id, pipeline)
+        finally:
+            with self._held_lock:
+                self._held.discard(job_id)
+
+    def _score_job(self, job_id, pipeline):
+        job = self.store.get(job_id)
+        # One model version for the whole job, even if models are swapped mid-run
+        models = self._job_models(pipeline, job['model_version'])
+        self.store.update(job_id, status=JOB_RUNNING, model_version=models.version)
+
+        try:
+            total = job['total']
+            # A resumed job continues after its last stored chunk
+            for offset in range(job['processed'], total, self.chunk_size):
+                chunk = self.store.assessments(job_id, offset, self.chunk_size)
+                results = pipeline.score(chunk, models)
+                failed = sum(1 for result in results if not result['success'])
+                self.store.add_results(job_id, offset, results, failed)
+
+            self.store.update(job_id, status=JOB_COMPLETED, finished_at=datetime.now().isoformat())
+            logger.info(f"✅ {pipeline.metal.title()} job {job_id} completed ({total} assessments)")
+        except Exception as e:
+            logger.error(f"❌ {pipeline.metal.title()} job {job_id} failed: {str(e)}")
+            self.store.update(job_id, status=JOB_FAILED, error=str(e), finished_at=datetime.now().isoformat())
+
+    def shutdown(self, wait=True):
+        self._stopped.set()
+        self._executor.shutdown(wait=wait)
+
+
+_job_runner = None
+_job_runner_lock = threading.Lock()
+
+
+def get_job_runner():
+    """Process-wide JobRunner, created on first use (resuming jobs abandoned by dead processes)"""
+    global _job_runner
+    with _job_runner_lock:
+        if _job_runner is None:
+            _job_runner = JobRunner()
+            _job_runner.recover()
+            _job_runner.start()
+        return _job_runner
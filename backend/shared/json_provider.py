@@ -0,0 +1,95 @@
+"""
+JSON Provider
+=============
+
+Fast JSON for the Flask apps and the job store. With ``orjson`` installed,
+responses and request bodies go through it (several times faster than the
+stdlib on large batch and job pages); without it the stdlib is used. Either
+way NumPy scalars and arrays serialize natively, so pipelines can hand arrays
+straight to ``jsonify`` (see the columnar batch format in
+shared/assessment_routes.py).
+
+Install with ``init_json(app)``. ``LCA_JSON_PROVIDER=std`` forces the stdlib.
+
+Differences from Flask's default provider: keys keep their insertion order
+instead of being sorted, and NaN/Infinity are written as ``null`` (valid JSON
+for browsers) when orjson is used. Debug apps still use orjson, indented by
+two spaces instead of Flask's stdlib pretty-printing.
+"""
+
+import json
+import os
+
+import numpy as np
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:   # optional dependency: fall back to the stdlib
+    orjson = None
+
+USE_ORJSON = orjson is not None and os.environ.get('LCA_JSON_PROVIDER', 'orjson').lower() != 'std'
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def default(value):
+    """Values neither serializer handles natively: NumPy types, then Flask's defaults (dates, Decimal...)"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        # orjson hands over arrays it cannot serialize itself (object dtype, non-contiguous)
+        return value.tolist()
+    return DefaultJSONProvider.default(value)
+
+
+def dumps(value):
+    """Compact JSON text of a value"""
+    if USE_ORJSON:
+        return orjson.dumps(value, default=default, option=ORJSON_OPTIONS).decode('utf-8')
+    return json.dumps(value, default=default, separators=(',', ':'))
+
+
+def loads(text):
+    if USE_ORJSON:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            # orjson rejects NaN/Infinity literals the stdlib (and Flask's default) accepts
+            pass
+    return json.loads(text)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (stdlib fallback), with NumPy support"""
+
+    sort_keys = False
+
+    default = staticmethod(default)
+
+    def dumps(self, obj, **kwargs):
+        if USE_ORJSON and not kwargs.get('indent'):
+            return dumps(obj)
+        kwargs.setdefault('default', self.default)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        return loads(s)
+
+    def response(self, *args, **kwargs):
+        if not USE_ORJSON:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        option = ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE
+        if self.compact is False or (self.compact is None and self._app.debug):
+            option |= orjson.OPT_INDENT_2
+        body = orjson.dumps(obj, default=default, option=option)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def init_json(app):
+    """Serve an app's JSON through FastJSONProvider"""
+    app.json = FastJSONProvider(app)
+    return app
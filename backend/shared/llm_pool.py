@@ -0,0 +1,150 @@
+"""
+LLM Pipeline Pool
+=================
+
+One text-generation pipeline per process, shared by every
+LLMEnhancedAluminumModels instance (and any metal that wants generated
+explanations), instead of one pipeline per instance.
+
+The pipeline loads in a background thread (``start_warmup()``), so creating
+an enhancer never blocks; until the pool is ``ready`` callers use their
+rule-based fallbacks. Its state is ``disabled``, ``idle``, ``warming``,
+``ready`` or ``unavailable`` (could not be loaded, e.g. transformers is not
+installed).
+
+Requests do not generate text: generated explanation summaries are
+precomputed offline per model version (scripts/generate_explanations.py), with
+the same ``load_text_generation_pipeline()`` and ``GENERATION_KWARGS``.
+
+The model is ``LCA_LLM_MODEL`` (default ``microsoft/DialoGPT-small``);
+``LCA_LLM_ENABLED=0`` turns the pool off. Under a preloading server call
+``warm_up_after_fork()`` before the app is imported, as torch state does not
+survive ``fork()``.
+"""
+
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+LLM_DISABLED = 'disabled'
+LLM_IDLE = 'idle'
+LLM_WARMING = 'warming'
+LLM_READY = 'ready'
+LLM_UNAVAILABLE = 'unavailable'
+
+LLM_MODEL = os.environ.get('LCA_LLM_MODEL', 'microsoft/DialoGPT-small')
+
+GENERATION_KWARGS = {
+    'max_new_tokens': int(os.environ.get('LCA_LLM_MAX_NEW_TOKENS', 64)),
+    'do_sample': True,
+    'temperature': 0.7,
+    'return_full_text': False,
+}
+
+WARMUP_PROMPT = "Aluminum recycling saves energy because"
+
+
+class LLMPool:
+    """Process-wide text-generation pipeline, loaded in the background"""
+
+    def __init__(self, enabled=None, pipeline_factory=None):
+        if enabled is None:
+            enabled = os.environ.get('LCA_LLM_ENABLED', '1').lower() not in ('0', 'false', 'no')
+        self.enabled = enabled
+        self.pipeline_factory = pipeline_factory or load_text_generation_pipeline
+        self._defer_to_fork = False
+        self._reset()
+
+    def _reset(self):
+        self.pipeline = None
+        self.state = LLM_IDLE if self.enabled else LLM_DISABLED
+        self.error = None
+        self.load_seconds = None
+        self._warmup_requested = False
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+
+    @property
+    def ready(self):
+        return self.state == LLM_READY
+
+    def warm_up_after_fork(self):
+        """Hold warm-up back until this process forks, then load in each child"""
+        self._defer_to_fork = True
+        os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self):
+        start = self._warmup_requested
+        self._defer_to_fork = False
+        self._reset()
+        if start:
+            self.start_warmup()
+
+    def start_warmup(self):
+        """Load the pipeline in a background thread (once; no-op when disabled or already started)"""
+        with self._lock:
+            if self.state != LLM_IDLE:
+                return
+            if self._defer_to_fork:
+                self._warmup_requested = True
+                return
+            self.state = LLM_WARMING
+        threading.Thread(target=self._warm_up, name='lca-llm-warmup', daemon=True).start()
+
+    def wait_until_ready(self, timeout=None):
+        """Block until the pipeline is ready or failed to load; True when it is ready"""
+        self._ready.wait(timeout)
+        return self.ready
+
+    def _warm_up(self):
+        started = time.perf_counter()
+        try:
+            pipeline = self.pipeline_factory()
+            # One generation so the first real request does not pay for lazy initialisation
+            pipeline([WARMUP_PROMPT], batch_size=1, **GENERATION_KWARGS)
+        except Exception as e:
+            self.error = str(e)
+            self.state = LLM_UNAVAILABLE
+            self._ready.set()
+            logger.error(f"❌ LLM pipeline unavailable: {str(e)}")
+            logger.info("🔄 Falling back to rule-based explanations")
+            return
+
+        self.pipeline = pipeline
+        self.load_seconds = time.perf_counter() - started
+        self.state = LLM_READY
+        self._ready.set()
+        logger.info(f"✅ LLM pipeline ready ({LLM_MODEL}) in {self.load_seconds:.1f}s")
+
+    def status(self):
+        status = {"state": self.state, "model": LLM_MODEL}
+        if self.ready:
+            status["load_seconds"] = round(self.load_seconds, 3)
+        if self.error:
+            status["error"] = self.error
+        return status
+
+
+def load_text_generation_pipeline():
+    # Imported here: transformers (and torch) are heavy and optional for the scoring backends
+    from transformers import pipeline
+
+    llm = pipeline(
+        "text-generation",
+        model=LLM_MODEL,
+        tokenizer=LLM_MODEL,
+        max_length=512,
+        pad_token_id=50256
+    )
+    # Batched generation pads prompts; decoder-only models need the padding on the left
+    if llm.tokenizer.pad_token is None:
+        llm.tokenizer.pad_token = llm.tokenizer.eos_token
+    llm.tokenizer.padding_side = 'left'
+    return llm
+
+
+# Pool shared by every enhancer in the process
+llm_pool = LLMPool()
@@ -0,0 +1,68 @@
+"""
+Metrics Routes
+==============
+
+Blueprint serving ``GET /metrics`` in the Prometheus text format
+(shared/service_metrics.py) and timing every request of the app it is
+registered on. Besides the stage histograms, fallback counters and model load
+durations recorded while scoring, each scrape reports the response cache
+counters and the active model version of every metal.
+"""
+
+import time
+
+from flask import Blueprint, Response, g, request
+
+from shared.model_registry import registry
+from shared.response_cache import response_cache
+from shared.service_metrics import REQUEST_SECONDS, Counter, Gauge, metrics
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def cache_and_model_metrics():
+    """Response cache counters and active model versions, read at scrape time"""
+    stats = response_cache.stats()
+    hits = Counter('lca_response_cache_hits_total', 'Assessments served from the response cache')
+    hits.labels().inc(stats['hits'])
+    misses = Counter('lca_response_cache_misses_total', 'Assessments scored on a response cache miss')
+    misses.labels().inc(stats['misses'])
+    entries = Gauge('lca_response_cache_entries', 'Responses held in the response cache')
+    entries.labels().set(stats['size'])
+    maxsize = Gauge('lca_response_cache_maxsize', 'Response cache capacity (0 = disabled)')
+    maxsize.labels().set(stats['maxsize'])
+
+    active = Gauge('lca_model_info', 'Active model version of each metal (1 when ML models are served)',
+                   ('metal', 'version'))
+    for metal in registry.metal_artifacts:
+        version = registry.active(metal).version
+        active.labels(metal, version or 'none').set(1 if version else 0)
+    return [hits, misses, entries, maxsize, active]
+
+
+metrics.register_collector(cache_and_model_metrics)
+
+
+def create_metrics_blueprint(name):
+    """/metrics plus per-request latency of every route of the app"""
+    blueprint = Blueprint(name, __name__)
+
+    @blueprint.before_app_request
+    def start_timer():
+        g.request_started = time.perf_counter()
+
+    @blueprint.after_app_request
+    def observe_request(response):
+        started = g.pop('request_started', None)
+        if started is not None:
+            REQUEST_SECONDS.labels(
+                request.endpoint or 'unmatched', request.method, response.status_code
+            ).observe(time.perf_counter() - started)
+        return response
+
+    @blueprint.route('/metrics', methods=['GET'])
+    def scrape():
+        """Prometheus scrape endpoint"""
+        return Response(metrics.render(), content_type=CONTENT_TYPE)
+
+    return blueprint
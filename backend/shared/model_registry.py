@@ -0,0 +1,377 @@
+"""
+Multi-Metal Model Registry
+==========================
+
+One process-wide home for the timestamped model artifacts under ``models/``.
+
+Versions are discovered from the training summary files written next to the
+pickles (``training_metrics_*.json`` / ``copper_training_summary_*.json``).
+Each model is loaded lazily on first use and shared by every caller in the
+process, keyed by (metal, model kind, version). A newer version can be
+activated at runtime: it is loaded completely first and then swapped in
+atomically, so in-flight requests finish on the version they started with.
+
+Activation is persisted to ``<model dir>/active_version.json``. Every process
+serving the registry (e.g. each gunicorn worker) checks that file at most
+every ``LCA_ACTIVE_VERSION_CHECK_SECONDS`` (1) and swaps to the version it
+names, so one activation reaches all workers; without the file the newest
+version is active.
+
+Tree models exported by ``scripts/export_compact_models.py`` are loaded from
+their compact array format instead of the pickle (``LCA_COMPACT_MODELS=0``
+turns this off); an export older than its pickle is ignored. Compact node
+tables are memory-mapped read-only (``LCA_MMAP_MODELS=0`` reads them into the
+heap instead), so every process serving the same files shares one copy in the
+page cache and a cold start only faults in the pages it touches.
+
+A version may also carry JSON artifacts precomputed by the scripts: conformal
+calibration tables (``*calibration_<version>.json``, see shared/calibration.py)
+as the ``calibration`` kind, and LLM explanation summaries
+(``explanations_<version>.json``, see shared/explanations.py) as the
+``explanations`` kind.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from shared.calibration import load_calibration
+from shared.compact_trees import compact_path, load_compact
+from shared.explanations import load_explanations
+from shared.service_metrics import MODEL_LOAD_ERRORS, MODEL_LOAD_SECONDS
+
+logger = logging.getLogger(__name__)
+
+USE_COMPACT_MODELS = os.environ.get('LCA_COMPACT_MODELS', '1') != '0'
+MMAP_MODELS = os.environ.get('LCA_MMAP_MODELS', '1') != '0'
+
+MODELS_ROOT = Path(__file__).resolve().parent.parent.parent / "models"
+
+ACTIVE_VERSION_FILE = 'active_version.json'
+ACTIVE_VERSION_CHECK_SECONDS = float(os.environ.get('LCA_ACTIVE_VERSION_CHECK_SECONDS', 1))
+
+VERSION_PATTERN = re.compile(r"(\d{8}_\d{6})")
+
+# Per-metal artifact layout: which summary files define a version and the
+# default file name of each model kind (overridden by files listed in the summary)
+METAL_ARTIFACTS = {
+    'aluminum': {
+        'summary_glob': 'training_metrics_*.json',
+        'artifacts': {
+            'environmental': 'environmental_model_{version}.pkl',
+            'circularity': 'circularity_model_{version}.pkl',
+            'classification': 'classification_model_{version}.pkl',
+            'classification_encoder': 'classification_encoder_{version}.pkl',
+            'calibration': 'calibration_{version}.json',
+            'explanations': 'explanations_{version}.json',
+        },
+    },
+    'copper': {
+        'summary_glob': 'copper_training_summary_*.json',
+        'artifacts': {
+            'environmental': 'copper_environmental_model_{version}.pkl',
+            'circularity': 'copper_circularity_model_{version}.pkl',
+            'classification': 'copper_classification_model_{version}.pkl',
+            'classification_encoder': 'copper_classification_encoder_{version}.pkl',
+            'energy_encoder': 'copper_energy_encoder_{version}.pkl',
+            'location_encoder': 'copper_location_encoder_{version}.pkl',
+            'calibration': 'copper_calibration_{version}.json',
+        },
+    },
+}
+
+# Artifacts a version may lack without anything being wrong (written by scripts/calibrate_models.py
+# and scripts/generate_explanations.py)
+OPTIONAL_ARTIFACTS = ('calibration', 'explanations')
+
+# Loaders of the JSON artifacts, by kind
+JSON_ARTIFACT_LOADERS = {
+    'calibration': load_calibration,
+    'explanations': load_explanations,
+}
+
+# Training summary entries that name an artifact, mapped to registry model kinds
+SUMMARY_KIND_ALIASES = {
+    'environmental_efficiency': 'environmental',
+    'circularity_predictor': 'circularity',
+    'process_classification': 'classification',
+}
+
+
+class ModelVersion:
+    """One timestamped set of model artifacts for a metal, loaded lazily per model kind"""
+
+    def __init__(self, metal, version, artifact_paths, summary=None):
+        self.metal = metal
+        self.version = version
+        self.artifact_paths = artifact_paths
+        self.summary = summary or {}
+        self.load_durations = {}
+        self.formats = {}
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def is_available(self, kind):
+        """Whether the artifact for a model kind exists on disk"""
+        path = self.artifact_paths.get(kind)
+        return path is not None and path.exists()
+
+    def get(self, kind):
+        """Return the loaded model of a kind, loading it on first use (None when unavailable)"""
+        if kind in self._models:
+            return self._models[kind]
+
+        with self._lock:
+            if kind not in self._models:
+                self._models[kind] = self._load(kind)
+        return self._models[kind]
+
+    def _load(self, kind):
+        if not self.is_available(kind):
+            if kind not in OPTIONAL_ARTIFACTS:
+                logger.warning(f"⚠️ {self.metal} {kind} model file not found for version {self.version}")
+            return None
+
+        try:
+            started = time.perf_counter()
+            compact = self._compact_artifact(kind)
+            if self.artifact_paths[kind].suffix == '.json':
+                model = JSON_ARTIFACT_LOADERS[kind](self.artifact_paths[kind])
+                self.formats[kind] = 'json'
+            elif compact is not None:
+                model = load_compact(compact, mmap_mode='r' if MMAP_MODELS else None)
+                self.formats[kind] = 'compact-mmap' if MMAP_MODELS else 'compact'
+            else:
+                # Only pickles need joblib (and the scikit-learn classes they hold); compact exports do not
+                import joblib
+                model = joblib.load(self.artifact_paths[kind])
+                self.formats[kind] = 'joblib'
+            self.load_durations[kind] = time.perf_counter() - started
+            MODEL_LOAD_SECONDS.labels(self.metal, kind, self.version, self.formats[kind]).set(self.load_durations[kind])
+            logger.info(f"✅ {self.metal.title()} {kind} model loaded ({self.version}, {self.formats[kind]}) in {self.load_durations[kind]:.2f}s")
+            return model
+        except Exception as e:
+            logger.error(f"❌ Error loading {self.metal} {kind} model ({self.version}): {str(e)}")
+            MODEL_LOAD_ERRORS.labels(self.metal, kind).inc()
+            return None
+
+    def _compact_artifact(self, kind):
+        """Compact export of a model kind when enabled and at least as new as its pickle"""
+        if not USE_COMPACT_MODELS:
+            return None
+        path = self.artifact_paths[kind]
+        if path.suffix != '.pkl':
+            return None
+        meta = compact_path(path) / 'meta.json'
+        if not meta.exists():
+            return None
+        if meta.stat().st_mtime < path.stat().st_mtime:
+            logger.warning(f"⚠️ Ignoring stale compact export of {path.name}; re-run export_compact_models.py")
+            return None
+        return meta.parent
+
+    def preload(self):
+        """Load every available artifact now instead of on first use"""
+        for kind in self.artifact_paths:
+            self.get(kind)
+        return self
+
+    def loaded_kinds(self):
+        return [kind for kind, model in self._models.items() if model is not None]
+
+    def status(self):
+        """Availability of each model kind, keyed the way the health endpoints report it"""
+        return {
+            (kind if kind.endswith('encoder') else f"{kind}_model"): self.is_available(kind)
+            for kind in self.artifact_paths if kind not in OPTIONAL_ARTIFACTS
+        }
+
+
+class ModelRegistry:
+    """Process-wide registry of model versions keyed by (metal, model kind, version)"""
+
+    def __init__(self, models_root=MODELS_ROOT, metal_artifacts=None, model_dirs=None):
+        self.models_root = Path(models_root)
+        self.metal_artifacts = metal_artifacts or METAL_ARTIFACTS
+        self.model_dirs = {metal: Path(path) for metal, path in (model_dirs or {}).items()}
+        self._versions = {}
+        self._active = {}
+        self._lock = threading.RLock()
+        # Per metal: mtime of the active version file last applied, and when to look at it next
+        self._active_file_mtimes = {}
+        self._next_active_check = {}
+
+    def model_dir(self, metal):
+        return self.model_dirs.get(metal, self.models_root / metal)
+
+    def active_version_path(self, metal):
+        return self.model_dir(metal) / ACTIVE_VERSION_FILE
+
+    def _read_active_version(self, metal):
+        """(mtime, version) of the persisted activation, or (None, None) without one"""
+        path = self.active_version_path(metal)
+        try:
+            mtime = path.stat().st_mtime_ns
+            return mtime, json.loads(path.read_text())['version']
+        except FileNotFoundError:
+            return None, None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"⚠️ Ignoring unreadable {path.name} for {metal}: {str(e)}")
+            return None, None
+
+    def _write_active_version(self, metal, version):
+        path = self.active_version_path(metal)
+        # Written to a temporary file and renamed, so readers never see a partial file
+        temporary = path.with_name(f".{path.name}.{os.getpid()}")
+        temporary.write_text(json.dumps({'version': version, 'activated_at': datetime.now().isoformat()}))
+        os.replace(temporary, path)
+        return path.stat().st_mtime_ns
+
+    def _sync_active(self, metal):
+        """Swap to the version another process activated (the file is checked at most once per interval)"""
+        now = time.monotonic()
+        if now < self._next_active_check.get(metal, 0):
+            return
+        self._next_active_check[metal] = now + ACTIVE_VERSION_CHECK_SECONDS
+
+        mtime, version = self._read_active_version(metal)
+        if mtime is None or mtime == self._active_file_mtimes.get(metal):
+            return
+        with self._lock:
+            if mtime == self._active_file_mtimes.get(metal):
+                return
+            # Recorded first: a version that cannot be loaded is not retried on every request
+            self._active_file_mtimes[metal] = mtime
+            current = self._active.get(metal)
+            if current is not None and current.version == version:
+                return
+            try:
+                self._swap(metal, self.version(metal, version).preload())
+                logger.info(f"🔄 {metal.title()} models version {version} activated by another process")
+            except KeyError as e:
+                logger.error(f"❌ Cannot switch to the activated {metal} version: {str(e)}")
+
+    def discover(self, metal):
+        """Scan the metal's model directory and return {version: artifact paths} for every training summary"""
+        spec = self.metal_artifacts[metal]
+        model_dir = self.model_dir(metal)
+        discovered = {}
+
+        for summary_path in sorted(model_dir.glob(spec['summary_glob'])):
+            match = VERSION_PATTERN.search(summary_path.name)
+            if not match:
+                continue
+            version = match.group(1)
+
+            try:
+                summary = json.loads(summary_path.read_text())
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ Skipping unreadable training summary {summary_path.name}: {str(e)}")
+                continue
+
+            artifact_paths = {
+                kind: model_dir / pattern.format(version=version)
+                for kind, pattern in spec['artifacts'].items()
+            }
+            artifact_paths.update(self._summary_artifacts(summary, model_dir))
+            discovered[version] = (artifact_paths, summary)
+
+        return discovered
+
+    @staticmethod
+    def _summary_artifacts(summary, model_dir):
+        """Artifact files named in a training summary, resolved inside the metal's model directory"""
+        artifacts = {}
+        for name, entry in summary.get('models', {}).items():
+            if isinstance(entry, dict) and entry.get('file'):
+                artifacts[SUMMARY_KIND_ALIASES.get(name, name)] = model_dir / Path(entry['file']).name
+        for name, file_name in summary.get('encoders', {}).items():
+            artifacts[name] = model_dir / Path(file_name).name
+        return artifacts
+
+    def versions(self, metal):
+        """All discovered versions of a metal, oldest first"""
+        return sorted(self.discover(metal))
+
+    def version(self, metal, version):
+        """Return the shared ModelVersion for (metal, version), creating it on first use"""
+        with self._lock:
+            key = (metal, version)
+            if key not in self._versions:
+                discovered = self.discover(metal)
+                if version not in discovered:
+                    raise KeyError(f"No {metal} model version {version} in {self.model_dir(metal)}")
+                artifact_paths, summary = discovered[version]
+                self._versions[key] = ModelVersion(metal, version, artifact_paths, summary)
+            return self._versions[key]
+
+    def active(self, metal):
+        """The active ModelVersion of a metal (the newest discovered version until one is activated)
+
+        When no version exists an empty ModelVersion (version None) is returned, whose get() is always None.
+        """
+        if metal in self._active:
+            self._sync_active(metal)
+            return self._active[metal]
+
+        with self._lock:
+            if metal not in self._active:
+                versions = self.versions(metal)
+                if not versions:
+                    # Not cached, so models dropped in later are picked up on the next call
+                    logger.warning(f"⚠️ No {metal} training summaries found in {self.model_dir(metal)}")
+                    return ModelVersion(metal, None, {})
+                mtime, version = self._read_active_version(metal)
+                if version not in versions:
+                    if version is not None:
+                        logger.warning(f"⚠️ Activated {metal} version {version} not found; using the newest")
+                    version = versions[-1]
+                self._active_file_mtimes[metal] = mtime
+                self._next_active_check[metal] = time.monotonic() + ACTIVE_VERSION_CHECK_SECONDS
+                self._active[metal] = self.version(metal, version)
+            return self._active[metal]
+
+    def get(self, metal, kind, version=None):
+        """Return one model, loading it lazily; version defaults to the active one"""
+        models = self.version(metal, version) if version else self.active(metal)
+        return models.get(kind)
+
+    def activate(self, metal, version=None):
+        """Load a version completely and then swap it in atomically (newest version by default);
+        persisted, so every other process serving the registry follows"""
+        if version is None:
+            versions = self.versions(metal)
+            if not versions:
+                raise KeyError(f"No {metal} model versions found in {self.model_dir(metal)}")
+            version = versions[-1]
+
+        models = self.version(metal, version).preload()
+
+        with self._lock:
+            self._swap(metal, models)
+            self._active_file_mtimes[metal] = self._write_active_version(metal, version)
+
+        logger.info(f"🔄 Activated {metal} models version {version}")
+        return models
+
+    def _swap(self, metal, models):
+        with self._lock:
+            previous = self._active.get(metal)
+            self._active[metal] = models
+            if previous is not None and previous is not models:
+                # Requests still holding the old version keep their reference until they finish
+                self._versions.pop((metal, previous.version), None)
+
+    def preload(self, metals=None):
+        """Eagerly load the active version of each metal (for servers that fork workers)"""
+        for metal in metals or self.metal_artifacts:
+            self.active(metal).preload()
+
+
+# Default registry shared by every backend module in the process
+registry = ModelRegistry()
@@ -0,0 +1,29 @@
+"""
+Per-Metal Assessment Pipelines
+==============================
+
+Each metal registers one AssessmentPipeline here. Backends look pipelines up
+by metal name, so adding a metal (steel, zinc, ...) means adding its pipeline
+module and model layout, not starting another server.
+"""
+
+from shared.pipelines.aluminum import AluminumPipeline
+from shared.pipelines.base import AssessmentPipeline
+from shared.pipelines.copper import CopperPipeline
+
+PIPELINES = {}
+
+
+def register_pipeline(pipeline):
+    """Make a pipeline available to the backends under its metal name"""
+    PIPELINES[pipeline.metal] = pipeline
+    return pipeline
+
+
+def get_pipeline(metal):
+    """Pipeline for a metal name (case-insensitive), or None when the metal is not supported"""
+    return PIPELINES.get(str(metal).lower())
+
+
+register_pipeline(AluminumPipeline())
+register_pipeline(CopperPipeline())
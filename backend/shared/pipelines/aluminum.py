@@ -0,0 +1,141 @@
+"""
+Aluminum Assessment Pipeline
+============================
+
+Aluminum feature matrices, model predictions with their industry defaults,
+LCA metrics and recommendations, shared by the aluminum backend and the
+unified LCA service.
+"""
+
+import logging
+
+import numpy as np
+
+from shared.feature_builders import (
+    AssessmentColumns,
+    build_aluminum_environmental_features,
+    build_aluminum_circularity_features
+)
+from shared.lca_metrics import calculate_lca_metrics
+from shared.pipelines.base import AssessmentPipeline, predict_column
+from shared.request_logging import log_model_error
+from shared.service_metrics import count_fallbacks, timed_stage
+
+logger = logging.getLogger(__name__)
+
+# Defaults served when a model is missing, fails, or a row's features cannot be built
+DEFAULT_ENVIRONMENTAL_EFFICIENCY = 0.75
+DEFAULT_CIRCULARITY_METRICS = {
+    "circularity_index": 0.85,
+    "recycling_rate": 0.85,
+    "waste_ratio": 0.08,
+    "material_efficiency": 0.83
+}
+
+def finalize_aluminum_results(results, assessment_data, lca_metrics=None):
+    """Fill LCA metrics, evaluation and recommendations from the model predictions in results
+    (lca_metrics, when the batch's metrics were already calculated column-wise)"""
+    env_efficiency = results["model_predictions"]["environmental_efficiency"]
+    circ_metrics = results["model_predictions"]["circularity_metrics"]
+    
+    if lca_metrics is None:
+        lca_metrics = calculate_lca_metrics("aluminum", assessment_data, env_efficiency)
+    results["lca_metrics"] = lca_metrics
+    
+    # Enhanced evaluation
+    overall_score = (env_efficiency + circ_metrics["circularity_index"]) / 2
+    results["evaluation"] = {
+        "overall_score": overall_score,
+        "environmental_score": env_efficiency,
+        "circularity_score": circ_metrics["circularity_index"],
+        "evaluation_method": "aluminum_ml_models",
+        "feedback": f"Aluminum recycling assessment shows {'excellent' if overall_score > 0.8 else 'good' if overall_score > 0.6 else 'moderate'} sustainability performance with industry-validated predictions."
+    }
+    
+    # Generate aluminum-specific recommendations
+    recommendations = []
+    if env_efficiency < 0.7:
+        recommendations.append("🔋 Consider transitioning to renewable energy sources to improve aluminum recycling efficiency")
+    if circ_metrics["recycling_rate"] < 0.8:
+        recommendations.append("♻️ Increase recycled aluminum content to achieve higher circularity performance")
+    if lca_metrics["carbon_footprint"] / float(assessment_data.get('productionScale', 500)) > 1.0:
+        recommendations.append("🌱 Optimize aluminum melting process efficiency to reduce carbon intensity")
+    if lca_metrics["water_usage"] / float(assessment_data.get('productionScale', 500)) > 5.0:
+        recommendations.append("💧 Implement closed-loop water recycling to minimize aluminum processing water consumption")
+    
+    if not recommendations:
+        recommendations.append("✅ Excellent aluminum recycling performance! Your process meets industry best practices")
+    
+    results["recommendations"] = recommendations
+    return results
+
+class AluminumPipeline(AssessmentPipeline):
+    """Aluminum recycling assessments"""
+    
+    metal = "aluminum"
+    data_quality = "aluminum_industry_validated"
+    input_fields = (
+        'productionScale', 'energySource', 'scrapRatio', 'recyclingRate', 'wasteRatio',
+        'energyRecoveryRate', 'secondaryMaterialFraction', 'materialEfficiency',
+        'isMetallurgy', 'hasCircularity', 'totalInputs', 'totalOutputs'
+    )
+    
+    def predict_columns(self, data, models):
+        """Environmental and circularity predictions for every row, one predict call per model"""
+        n_rows = AssessmentColumns(data).n_rows
+        env_predictions, env_predicted = np.full(n_rows, np.nan), np.zeros(n_rows, dtype=bool)
+        environmental_model = models.get('environmental')
+        if environmental_model is not None:
+            try:
+                with timed_stage("feature_prep"):
+                    env_features, env_valid = build_aluminum_environmental_features(data)
+                with timed_stage("environmental_predict"):
+                    env_predictions, env_predicted = predict_column(environmental_model, env_features, env_valid)
+            except Exception as e:
+                log_model_error(logger, self.metal, "environmental", e)
+        
+        circ_predictions, circ_predicted = np.full((n_rows, 3), np.nan), np.zeros(n_rows, dtype=bool)
+        circularity_model = models.get('circularity')
+        if circularity_model is not None:
+            try:
+                with timed_stage("feature_prep"):
+                    circ_features, circ_valid = build_aluminum_circularity_features(data)
+                with timed_stage("circularity_predict"):
+                    circ_predictions, circ_predicted = predict_column(circularity_model, circ_features, circ_valid)
+            except Exception as e:
+                log_model_error(logger, self.metal, "circularity", e)
+        
+        env_efficiency = np.where(env_predicted, env_predictions, DEFAULT_ENVIRONMENTAL_EFFICIENCY)
+        count_fallbacks(self.metal, "environmental_efficiency", n_rows - env_predicted.sum())
+        count_fallbacks(self.metal, "circularity_metrics", n_rows - circ_predicted.sum())
+        if circ_predictions.ndim == 1:
+            circ_predictions = circ_predictions[:, np.newaxis]
+        recycling_rate = circ_predictions[:, min(1, circ_predictions.shape[1] - 1)]
+        waste_ratio = circ_predictions[:, min(2, circ_predictions.shape[1] - 1)]
+        
+        return {
+            "environmental_efficiency": env_efficiency,
+            # Use recycling rate as circularity index
+            "circularity_index": np.where(circ_predicted, recycling_rate, DEFAULT_CIRCULARITY_METRICS["circularity_index"]),
+            "recycling_rate": np.where(circ_predicted, recycling_rate, DEFAULT_CIRCULARITY_METRICS["recycling_rate"]),
+            "waste_ratio": np.where(circ_predicted, waste_ratio, DEFAULT_CIRCULARITY_METRICS["waste_ratio"]),
+            "material_efficiency": np.where(circ_predicted, env_efficiency, DEFAULT_CIRCULARITY_METRICS["material_efficiency"])
+        }
+    
+    def predict(self, assessments, models):
+        """Environmental and circularity predictions for every assessment, one predict call per model"""
+        columns = {name: values.tolist() for name, values in self.predict_columns(assessments, models).items()}
+        
+        predictions = []
+        for i in range(len(assessments)):
+            predictions.append({
+                "environmental_efficiency": columns["environmental_efficiency"][i],
+                "circularity_metrics": {
+                    name: columns[name][i] for name in DEFAULT_CIRCULARITY_METRICS
+                }
+            })
+        
+        return predictions
+    
+    def finalize(self, results, assessment_data, lca_metrics=None):
+        return finalize_aluminum_results(results, assessment_data, lca_metrics)
@@ -0,0 +1,153 @@
+"""
+Assessment Pipeline Base
+========================
+
+Shared scoring flow for every metal: build feature matrices for the whole
+batch, make one predict call per model, calculate the batch's LCA metrics
+column-wise (shared.lca_metrics), then fill evaluation and recommendations row
+by row. Metal modules subclass AssessmentPipeline and provide
+``predict_columns`` (model outputs as arrays), ``predict`` (the same as per-row
+dicts) and ``finalize``.
+
+``score_columns`` is the columnar path used for bulk files: model outputs and
+LCA metrics as 1-D arrays, with no per-row dicts at all.
+"""
+
+import logging
+from datetime import datetime
+
+import numpy as np
+
+from shared.lca_metrics import calculate_lca_metric_columns, lca_metric_rows
+from shared.model_registry import registry as shared_registry
+from shared.response_cache import assessment_key
+from shared.service_metrics import annotate_request, stage_timings, timed_stage
+
+logger = logging.getLogger(__name__)
+
+
+def predict_column(model, features, valid):
+    """Run a single predict call over the valid rows of a feature matrix
+
+    Returns (predictions, predicted): predictions has one row per feature row
+    (NaN where nothing was predicted) and predicted marks the rows that were.
+    """
+    predicted = np.zeros(len(features), dtype=bool)
+    valid_rows = np.flatnonzero(valid)
+    if model is None or len(valid_rows) == 0:
+        return np.full(len(features), np.nan), predicted
+
+    output = np.asarray(model.predict(features[valid_rows]))
+    if output.dtype.kind in 'biuf':
+        predictions = np.full((len(features),) + output.shape[1:], np.nan)
+    else:
+        predictions = np.full((len(features),) + output.shape[1:], None, dtype=object)
+    predictions[valid_rows] = output
+    predicted[valid_rows] = True
+    return predictions, predicted
+
+
+class AssessmentPipeline:
+    """Scores assessments for one metal with models taken from the model registry"""
+
+    metal = None
+    data_quality = None
+    result_fields = {}
+    input_fields = None   # assessment_data keys the pipeline reads; all keys when None
+
+    def __init__(self, model_registry=None):
+        self.registry = model_registry or shared_registry
+
+    def active_models(self):
+        """Active model version of this metal; take it once per request so a hot swap cannot mix versions"""
+        return self.registry.active(self.metal)
+
+    def score(self, assessments, models=None, cache=None):
+        """Score a list of assessment_data dicts, returning one result dict per row in the same order
+
+        With a ResponseCache, rows seen before are served from it and only the misses are scored.
+        """
+        models = models or self.active_models()
+        if cache is None or not cache.enabled:
+            return self._score(assessments, models)
+
+        keys = [assessment_key(self.metal, models.version, row, self.input_fields) for row in assessments]
+        results = [cache.get(key) for key in keys]
+        misses = [i for i, result in enumerate(results) if result is None]
+        annotate_request(cache_hits=len(results) - len(misses))
+        if misses:
+            for i, result in zip(misses, self._score([assessments[i] for i in misses], models)):
+                results[i] = result
+                if result["success"]:
+                    cache.set(keys[i], self.metal, result)
+        return results
+
+    def _score(self, assessments, models):
+        with stage_timings(self.metal, len(assessments)):
+            predictions = self.predict(assessments, models)
+            env_efficiency = [model_predictions["environmental_efficiency"] for model_predictions in predictions]
+            with timed_stage("lca_metrics"):
+                lca_metrics = lca_metric_rows(self.metal, assessments, env_efficiency)
+
+            results = []
+            with timed_stage("recommendations"):
+                for assessment_data, model_predictions, row_metrics in zip(assessments, predictions, lca_metrics):
+                    try:
+                        results.append(self.finalize(self.new_results(models, model_predictions), assessment_data, row_metrics))
+                    except Exception as e:
+                        logger.error(f"❌ Error processing {self.metal} assessment: {str(e)}")
+                        results.append(self.error_result(e))
+        return results
+
+    def score_one(self, assessment_data, models=None, cache=None):
+        return self.score([assessment_data], models, cache)[0]
+
+    def score_columns(self, data, models=None):
+        """Columnar scoring of a DataFrame, dict of arrays or list of dicts: {output name: 1-D array}"""
+        models = models or self.active_models()
+        with stage_timings(self.metal):
+            columns = self.predict_columns(data, models)
+            with timed_stage("lca_metrics"):
+                columns.update(self.lca_metric_columns(data, columns['environmental_efficiency']))
+        columns['overall_score'] = (columns['environmental_efficiency'] + columns['circularity_index']) / 2
+        return columns
+
+    def new_results(self, models, model_predictions):
+        """Response skeleton shared by the single and batch routes"""
+        return {
+            "success": True,
+            "using_ml_models": models.version is not None,
+            "model_version": models.version,
+            **self.result_fields,
+            "data_quality": self.data_quality,
+            "model_predictions": model_predictions,
+            "lca_metrics": {},
+            "evaluation": {},
+            "timestamp": datetime.now().isoformat()
+        }
+
+    def error_result(self, error):
+        return {
+            "success": False,
+            "error": f"{self.metal.title()} assessment processing failed: {str(error)}",
+            "using_ml_models": False,
+            "timestamp": datetime.now().isoformat()
+        }
+
+    def predict_columns(self, data, models):
+        """Model outputs (with defaults filled in) as {name: 1-D array}; must include
+        environmental_efficiency and circularity_index"""
+        raise NotImplementedError
+
+    def predict(self, assessments, models):
+        """Return the model_predictions dict of every assessment"""
+        raise NotImplementedError
+
+    def lca_metric_columns(self, data, env_efficiency):
+        """carbon_footprint, energy_consumption and water_usage as arrays"""
+        return calculate_lca_metric_columns(self.metal, data, env_efficiency)
+
+    def finalize(self, results, assessment_data, lca_metrics=None):
+        """Fill LCA metrics, evaluation and recommendations from the model predictions in results;
+        lca_metrics are the row's precalculated metrics (calculated here when None)"""
+        raise NotImplementedError
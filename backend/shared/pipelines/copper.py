@@ -0,0 +1,236 @@
+"""
+Copper Assessment Pipeline
+==========================
+
+Copper feature matrices, model predictions with their industry defaults,
+LCA metrics and recommendations, shared by the copper backend and the
+unified LCA service.
+"""
+
+import logging
+
+import numpy as np
+
+from shared.feature_builders import (
+    AssessmentColumns,
+    build_copper_environmental_features,
+    build_copper_circularity_features,
+    to_float
+)
+from shared.calibration import interval_columns
+from shared.lca_metrics import calculate_lca_metrics
+from shared.pipelines.base import AssessmentPipeline, predict_column
+from shared.request_logging import log_model_error
+from shared.service_metrics import count_fallbacks, timed_stage
+from shared.uncertainty import INTERVAL_COVERAGE
+
+logger = logging.getLogger(__name__)
+
+# Defaults served when a model is missing, fails, or a row's features cannot be built
+DEFAULT_ENVIRONMENTAL_EFFICIENCY = 0.70
+DEFAULT_CIRCULARITY_METRICS = {
+    "circularity_index": 0.75,
+    "recycling_rate": 0.80,
+    "waste_ratio": 0.12,
+    "material_efficiency": 0.78
+}
+DEFAULT_PROCESS_CLASSIFICATION = {
+    "class": "secondary_copper_recycling",
+    "class_id": 1,
+    "confidence": 0.7
+}
+
+# Outputs served with a conformal interval when the model version has a calibration table
+INTERVAL_OUTPUTS = ("environmental_efficiency", "circularity_index")
+
+def copper_circularity_columns(circ_predictions, circ_predicted, data, env_efficiency):
+    """Circularity metrics from the circularity model output, and the mask of rows they were
+    scored on; rows without a prediction or with an unparseable recyclingRate get the defaults"""
+    recycling_rate, rate_ok = to_float(AssessmentColumns(data).raw('recyclingRate', 0))
+    recycling_rate = recycling_rate / 100.0
+    scored = circ_predicted & rate_ok
+    count_fallbacks("copper", "circularity_metrics", len(scored) - scored.sum())
+    
+    # Multi-output models put the circularity index in the first output
+    circ_index = circ_predictions[:, 0] if circ_predictions.ndim == 2 else circ_predictions
+    with np.errstate(invalid='ignore'):
+        waste_ratio = np.where(recycling_rate > 0, 1.0 - recycling_rate, 0.15)
+    
+    return {
+        "circularity_index": np.where(scored, circ_index, DEFAULT_CIRCULARITY_METRICS["circularity_index"]),
+        "recycling_rate": np.where(scored, recycling_rate, DEFAULT_CIRCULARITY_METRICS["recycling_rate"]),
+        "waste_ratio": np.where(scored, waste_ratio, DEFAULT_CIRCULARITY_METRICS["waste_ratio"]),
+        "material_efficiency": np.where(scored, env_efficiency, DEFAULT_CIRCULARITY_METRICS["material_efficiency"])
+    }, scored
+
+def finalize_copper_results(results, assessment_data, lca_metrics=None):
+    """Fill LCA metrics, evaluation and recommendations from the model predictions in results
+    (lca_metrics, when the batch's metrics were already calculated column-wise)"""
+    env_efficiency = results["model_predictions"]["environmental_efficiency"]
+    circ_metrics = results["model_predictions"]["circularity_metrics"]
+    
+    if lca_metrics is None:
+        lca_metrics = calculate_lca_metrics("copper", assessment_data, env_efficiency)
+    results["lca_metrics"] = lca_metrics
+    
+    # Enhanced evaluation
+    overall_score = (env_efficiency + circ_metrics["circularity_index"]) / 2
+    results["evaluation"] = {
+        "overall_score": overall_score,
+        "environmental_score": env_efficiency,
+        "circularity_score": circ_metrics["circularity_index"],
+        "evaluation_method": "copper_ml_models",
+        "feedback": f"Copper recycling assessment shows {'excellent' if overall_score > 0.8 else 'good' if overall_score > 0.6 else 'moderate'} sustainability performance with industry-validated predictions."
+    }
+    
+    # Generate copper-specific recommendations
+    recommendations = []
+    if env_efficiency < 0.7:
+        recommendations.append("🔋 Consider transitioning to renewable energy sources to improve copper recycling efficiency")
+    if circ_metrics["recycling_rate"] < 0.75:
+        recommendations.append("♻️ Increase recycled copper content to achieve higher circularity performance")
+    if lca_metrics["carbon_footprint"] / float(assessment_data.get('productionScale', 500)) > 2.0:
+        recommendations.append("🌱 Optimize copper smelting and refining processes to reduce carbon intensity")
+    if lca_metrics["water_usage"] / float(assessment_data.get('productionScale', 500)) > 60.0:
+        recommendations.append("💧 Implement advanced water recycling systems for copper processing")
+    
+    if not recommendations:
+        recommendations.append("✅ Excellent copper recycling performance! Your process meets industry best practices")
+    
+    results["recommendations"] = recommendations
+    return results
+
+def decode_process_classes(class_predictions, classification_encoder):
+    """Class names for the predicted class ids (None where there is no prediction)"""
+    class_names = [None] * len(class_predictions)
+    predicted = [i for i, class_pred in enumerate(class_predictions) if class_pred is not None]
+    if not predicted:
+        return class_names
+    
+    try:
+        decoded = classification_encoder.inverse_transform([class_predictions[i] for i in predicted])
+        for i, class_name in zip(predicted, decoded):
+            class_names[i] = class_name
+    except Exception:
+        for i in predicted:
+            class_names[i] = f"Process_Type_{class_predictions[i]}"
+    return class_names
+
+class CopperPipeline(AssessmentPipeline):
+    """Copper recycling assessments"""
+    
+    metal = "copper"
+    data_quality = "ICA_EPA_copper_standards"
+    result_fields = {"material_type": "copper"}
+    input_fields = (
+        'productionScale', 'energySource', 'location', 'recyclingRate', 'materialEfficiency',
+        'scrapRatio', 'secondaryMaterialFraction', 'energyRecoveryRate',
+        'isMetallurgy', 'hasCircularity', 'totalInputs', 'totalOutputs'
+    )
+    
+    def predict_columns(self, data, models):
+        """Environmental, circularity and process class predictions for every row, one predict call per model"""
+        environmental_model = models.get('environmental')
+        circularity_model = models.get('circularity')
+        classification_model = models.get('classification')
+        energy_encoder = models.get('energy_encoder')
+        
+        # Environmental features feed both the efficiency model and the process classifier
+        with timed_stage("feature_prep"):
+            env_features, env_valid = build_copper_environmental_features(
+                data, energy_encoder, models.get('location_encoder')
+            )
+        n_rows = len(env_features)
+        not_predicted = np.zeros(n_rows, dtype=bool)
+        
+        env_predictions, env_predicted = np.full(n_rows, np.nan), not_predicted
+        if environmental_model is not None:
+            try:
+                with timed_stage("environmental_predict"):
+                    env_predictions, env_predicted = predict_column(environmental_model, env_features, env_valid)
+            except Exception as e:
+                log_model_error(logger, self.metal, "environmental", e)
+        
+        circ_predictions, circ_predicted = np.full(n_rows, np.nan), not_predicted
+        if circularity_model is not None:
+            try:
+                with timed_stage("feature_prep"):
+                    circ_features, circ_valid = build_copper_circularity_features(data, energy_encoder)
+                with timed_stage("circularity_predict"):
+                    circ_predictions, circ_predicted = predict_column(circularity_model, circ_features, circ_valid)
+            except Exception as e:
+                log_model_error(logger, self.metal, "circularity", e)
+        
+        class_predictions, class_predicted = np.full(n_rows, np.nan), not_predicted
+        classification_failed = False
+        if classification_model is not None:
+            try:
+                with timed_stage("classification_predict"):
+                    class_predictions, class_predicted = predict_column(classification_model, env_features, env_valid)
+            except Exception as e:
+                log_model_error(logger, self.metal, "classification", e)
+                classification_failed = True
+        
+        env_efficiency = np.where(env_predicted, env_predictions, DEFAULT_ENVIRONMENTAL_EFFICIENCY)
+        count_fallbacks(self.metal, "environmental_efficiency", n_rows - env_predicted.sum())
+        columns = {"environmental_efficiency": env_efficiency}
+        circ_columns, circ_scored = copper_circularity_columns(circ_predictions, circ_predicted, data, env_efficiency)
+        columns.update(circ_columns)
+        
+        # Rows the classifier scored, else the default class when the classifier itself failed
+        default_class = classification_failed & env_valid
+        class_ids = np.where(class_predicted, class_predictions, np.nan)
+        class_ids[default_class] = DEFAULT_PROCESS_CLASSIFICATION["class_id"]
+        class_names = np.empty(n_rows, dtype=object)
+        class_names[class_predicted] = decode_process_classes(
+            class_predictions[class_predicted].astype(int).tolist(), models.get('classification_encoder')
+        )
+        class_names[default_class] = DEFAULT_PROCESS_CLASSIFICATION["class"]
+        count_fallbacks(self.metal, "process_classification", default_class.sum())
+        columns["process_class"] = class_names
+        columns["process_class_id"] = class_ids
+        columns["process_class_confidence"] = np.select(
+            [class_predicted, default_class], [0.9, DEFAULT_PROCESS_CLASSIFICATION["confidence"]], default=np.nan
+        )
+        
+        # Precomputed conformal intervals (scripts/calibrate_models.py): a lookup by class and coverage
+        calibration = models.get('calibration')
+        if calibration is not None:
+            columns.update(interval_columns(calibration, {
+                "environmental": ("environmental_efficiency", env_efficiency, env_predicted),
+                "circularity": ("circularity_index", columns["circularity_index"], circ_scored)
+            }, np.where(class_predicted, class_predictions, np.nan), INTERVAL_COVERAGE))
+        
+        return columns
+    
+    def predict(self, assessments, models):
+        """Environmental, circularity and process class predictions, one predict call per model"""
+        columns = {name: values.tolist() for name, values in self.predict_columns(assessments, models).items()}
+        interval_outputs = [name for name in INTERVAL_OUTPUTS if f"{name}_lower" in columns]
+        
+        predictions = []
+        for i in range(len(assessments)):
+            model_predictions = {
+                "environmental_efficiency": columns["environmental_efficiency"][i],
+                "circularity_metrics": {
+                    name: columns[name][i] for name in DEFAULT_CIRCULARITY_METRICS
+                }
+            }
+            if columns["process_class"][i] is not None:
+                model_predictions["process_classification"] = {
+                    "class": columns["process_class"][i],
+                    "class_id": int(columns["process_class_id"][i]),
+                    "confidence": columns["process_class_confidence"][i]
+                }
+            intervals = {
+                name: [columns[f"{name}_lower"][i], columns[f"{name}_upper"][i]]
+                for name in interval_outputs if not np.isnan(columns[f"{name}_lower"][i])
+            }
+            if intervals:
+                model_predictions["prediction_intervals"] = {**intervals, "coverage": columns["interval_coverage"][i]}
+            predictions.append(model_predictions)
+        
+        return predictions
+    
+    def finalize(self, results, assessment_data, lca_metrics=None):
+        return finalize_copper_results(results, assessment_data, lca_metrics)
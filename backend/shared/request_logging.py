@@ -0,0 +1,194 @@
+"""
+Request Logging
+===============
+
+Logging setup for the backends that keeps log I/O off the request path.
+
+``configure_logging()`` replaces ``logging.basicConfig``: every record goes
+through a QueueHandler onto an in-memory queue, and a background
+QueueListener thread formats it and writes it to stderr. Request threads only
+enqueue, so formatting and stream writes never block them.
+
+``init_request_logging(app)`` emits ONE structured (JSON) record per request
+on the ``lca.requests`` logger, holding everything the scoring pipeline
+gathered: metal, rows, model version, per-stage durations, fallbacks served,
+model errors and cache hits. Records are sampled: a fraction
+(``LCA_REQUEST_LOG_SAMPLE_RATE``, default 0.05) of normal requests, plus
+every 5xx response and every request slower than ``LCA_SLOW_REQUEST_MS``
+(default 500).
+
+A failing model is logged once per distinct error (``log_model_error``);
+later occurrences are counted in ``lca_model_errors_total`` and show up in
+the request records instead of a log line each.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+from flask import g, request
+
+from shared.service_metrics import close_request_scope, count_model_error, open_request_scope
+
+LOG_LEVEL = os.environ.get('LCA_LOG_LEVEL', 'INFO').upper()
+REQUEST_LOG_SAMPLE_RATE = float(os.environ.get('LCA_REQUEST_LOG_SAMPLE_RATE', 0.05))
+SLOW_REQUEST_MS = float(os.environ.get('LCA_SLOW_REQUEST_MS', 500))
+
+# Same layout basicConfig used, so existing log lines look unchanged
+LOG_FORMAT = logging.BASIC_FORMAT
+
+request_logger = logging.getLogger('lca.requests')
+logger = logging.getLogger(__name__)
+
+_queue_handler = None
+_listener = None
+_reported_errors = set()
+_reported_errors_lock = threading.Lock()
+# Own generator, so sampling does not advance the global random state
+_sampler = random.Random()
+
+
+class DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves message formatting to the listener thread
+
+    The stock handler formats every record in the calling thread before
+    enqueueing it (for queues that pickle); records on an in-process queue can
+    be handed over as they are.
+    """
+
+    def prepare(self, record):
+        if record.exc_info and not record.exc_text:
+            # Render tracebacks now, while the frames are still current
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        return record
+
+
+class StructuredFormatter(logging.Formatter):
+    """JSON lines for request records (``lca_request`` attribute), the plain format for the rest"""
+
+    def format(self, record):
+        fields = getattr(record, 'lca_request', None)
+        if fields is None:
+            return super().format(record)
+        return json.dumps({
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            **fields
+        }, default=str, ensure_ascii=False)
+
+
+def _start_listener():
+    global _listener
+    stream = logging.StreamHandler()
+    stream.setFormatter(StructuredFormatter(LOG_FORMAT))
+    # A fresh queue: one inherited across fork may have its lock held by the parent's listener
+    _queue_handler.queue = queue.SimpleQueue()
+    _listener = QueueListener(_queue_handler.queue, stream, respect_handler_level=True)
+    _listener.start()
+
+
+def _stop_listener():
+    if _listener is not None:
+        _listener.stop()
+
+
+def configure_logging(level=None):
+    """Route the root logger through a background queue listener (idempotent; replaces basicConfig)"""
+    global _queue_handler
+    if _queue_handler is not None:
+        return
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+
+    _queue_handler = DeferredQueueHandler(queue.SimpleQueue())
+    root.addHandler(_queue_handler)
+    root.setLevel(level or LOG_LEVEL)
+    _start_listener()
+
+    # The listener thread does not survive fork (gunicorn preload): start one in each child
+    os.register_at_fork(after_in_child=_start_listener)
+    atexit.register(_stop_listener)
+
+
+def log_model_error(log, metal, model, error):
+    """Log a model failure the first time it is seen; count it (and note it on the request) every time"""
+    count_model_error(metal, model, error)
+    key = (metal, model, str(error))
+    if key in _reported_errors:
+        return
+    with _reported_errors_lock:
+        if key in _reported_errors:
+            return
+        _reported_errors.add(key)
+    log.error(f"❌ {metal.title()} {model} model error (further occurrences counted in "
+              f"lca_model_errors_total): {str(error)}")
+
+
+def request_record(response, duration_ms, scope):
+    record = {
+        'event': 'request',
+        'method': request.method,
+        'path': request.path,
+        'endpoint': request.endpoint,
+        'status': response.status_code,
+        'duration_ms': round(duration_ms, 3),
+        'model_version': response.headers.get('X-LCA-Model-Version'),
+        **scope.fields,
+    }
+    if scope.stages:
+        record['stages_ms'] = {stage: round(seconds * 1e3, 3) for stage, seconds in scope.stages.items()}
+    if scope.fallbacks:
+        record['fallbacks'] = scope.fallbacks
+    if scope.errors:
+        record['model_errors'] = scope.errors
+    return record
+
+
+def init_request_logging(app):
+    """Emit one sampled structured record per request of an app"""
+
+    @app.before_request
+    def open_scope():
+        scope, token = open_request_scope()
+        g.request_log = (time.perf_counter(), scope, token)
+
+    @app.after_request
+    def log_request(response):
+        request_log = g.get('request_log')
+        if request_log is None:
+            return response
+        started, scope, _ = request_log
+        duration_ms = (time.perf_counter() - started) * 1e3
+
+        if response.status_code >= 500:
+            level, reason = logging.ERROR, 'error'
+        elif duration_ms >= SLOW_REQUEST_MS:
+            level, reason = logging.WARNING, 'slow'
+        elif _sampler.random() < REQUEST_LOG_SAMPLE_RATE:
+            level, reason = logging.INFO, 'sampled'
+        else:
+            return response
+
+        if request_logger.isEnabledFor(level):
+            record = request_record(response, duration_ms, scope)
+            record['logged_because'] = reason
+            request_logger.log(level, 'request', extra={'lca_request': record})
+        return response
+
+    @app.teardown_request
+    def close_scope(exc):
+        request_log = g.pop('request_log', None)
+        if request_log is not None:
+            close_request_scope(request_log[2])
+
+    return app
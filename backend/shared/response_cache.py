@@ -0,0 +1,126 @@
+"""
+Assessment Response Cache
+=========================
+
+LRU cache with a time-to-live in front of the assessment pipelines. Repeated
+submissions (form re-renders, demo templates) return the stored result instead
+of re-running feature prep, the model predicts and the LCA metrics.
+
+Keys are a SHA-256 of the normalized ``assessment_data`` (only the fields the
+pipeline reads, sorted, numbers as floats) together with the metal and the
+model version, so a model swap can never serve results from the previous
+version. Activating a version also drops that metal's entries.
+
+Configured with ``LCA_CACHE_SIZE`` (entries, 0 disables) and ``LCA_CACHE_TTL``
+(seconds).
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from datetime import datetime
+
+
+def normalize_assessment(assessment_data, input_fields=None):
+    """Canonical form of assessment_data: only the scored fields, with int/float values as floats"""
+    fields = input_fields if input_fields is not None else assessment_data.keys()
+    normalized = {}
+    for field in fields:
+        if field not in assessment_data:
+            continue
+        value = assessment_data[field]
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            value = float(value)
+        normalized[field] = value
+    return normalized
+
+
+def assessment_key(metal, model_version, assessment_data, input_fields=None):
+    """Cache key for one assessment, or None when the input cannot be normalized"""
+    if not isinstance(assessment_data, Mapping):
+        return None
+    try:
+        canonical = json.dumps(
+            [metal, model_version, normalize_assessment(assessment_data, input_fields)],
+            sort_keys=True, separators=(',', ':'), allow_nan=True
+        )
+    except (TypeError, ValueError):
+        return None
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """Thread-safe LRU cache whose entries expire after ttl seconds"""
+
+    def __init__(self, maxsize=1024, ttl=600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()   # key -> (expires_at, metal, result)
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.maxsize > 0
+
+    def get(self, key):
+        """Return a copy of the cached result with a fresh timestamp, or None on a miss"""
+        if key is None or not self.enabled:
+            return None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        return {**entry[2], "timestamp": datetime.now().isoformat()}
+
+    def set(self, key, metal, result):
+        if key is None or not self.enabled:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, metal, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, metal=None):
+        """Drop every entry of a metal (all entries when metal is None)"""
+        with self._lock:
+            if metal is None:
+                self._entries.clear()
+                return
+            for key in [key for key, entry in self._entries.items() if entry[1] == metal]:
+                del self._entries[key]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl
+            }
+
+
+# Cache shared by every pipeline in the process
+response_cache = ResponseCache(
+    maxsize=int(os.environ.get('LCA_CACHE_SIZE', 1024)),
+    ttl=float(os.environ.get('LCA_CACHE_TTL', 600))
+)
@@ -0,0 +1,304 @@
+"""
+Service Metrics
+===============
+
+In-process counters, gauges and histograms for the scoring hot path, rendered
+in the Prometheus text exposition format by ``GET /metrics``
+(shared/metrics_routes.py). No client library is needed.
+
+Scoring stages are timed with ``stage_timings(metal)`` around a scoring call
+and ``timed_stage(name)`` inside it; every stage's time within the call is
+summed and observed once when the call ends, so one request is one sample
+per stage:
+
+    with stage_timings("copper"):
+        with timed_stage("feature_prep"):
+            ...
+
+Inside an HTTP request (``open_request_scope()``, called by shared/request_logging.py)
+the same stage times, fallbacks and model errors are also gathered per request
+for its log record.
+
+Each process keeps its own values. Under gunicorn every worker answers
+``/metrics`` with its own numbers, so run one worker per scrape target or
+aggregate the ``process`` label.
+"""
+
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+
+# Seconds; scoring stages run from tens of microseconds to a few hundred ms
+STAGE_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+REQUEST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def format_labels(names, values):
+    if not names:
+        return ''
+    escaped = (str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n') for value in values)
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(names, escaped)) + '}'
+
+
+class Metric:
+    """A named metric family with one child per label value combination"""
+
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        values = tuple(str(value) for value in values)
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {values}")
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self.new_child())
+        return child
+
+    def new_child(self):
+        raise NotImplementedError
+
+    def samples(self):
+        """(sample name suffix, extra label names, extra label values, value) of every child"""
+        raise NotImplementedError
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        for values, child in sorted(self._children.items()):
+            for suffix, names, extra, value in child.samples():
+                labels = format_labels(self.labelnames + names, values + extra)
+                lines.append(f"{self.name}{suffix}{labels} {format_value(value)}")
+        return lines
+
+
+class _Value:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def set(self, value):
+        self.value = float(value)
+
+    def samples(self):
+        return [('', (), (), self.value)]
+
+
+class _Buckets:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def samples(self):
+        with self._lock:
+            counts, total = list(self.counts), self.sum
+        samples, cumulative = [], 0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += count
+            samples.append(('_bucket', ('le',), (format_value(float(bound)),), cumulative))
+        samples.append(('_sum', (), (), total))
+        samples.append(('_count', (), (), cumulative))
+        return samples
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def new_child(self):
+        return _Value()
+
+
+class Gauge(Metric):
+    type = 'gauge'
+
+    def new_child(self):
+        return _Value()
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=STAGE_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def new_child(self):
+        return _Buckets(self.buckets)
+
+
+class MetricsRegistry:
+    """Metrics of this process plus collectors that report values read at scrape time"""
+
+    def __init__(self):
+        self.metrics = []
+        self.collectors = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector):
+        """collector() returns Metric objects filled in at scrape time"""
+        self.collectors.append(collector)
+        return collector
+
+    def render(self):
+        lines = []
+        for metric in self.metrics + [metric for collector in self.collectors for metric in collector()]:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+metrics = MetricsRegistry()
+
+STAGE_SECONDS = metrics.register(Histogram(
+    'lca_stage_duration_seconds', 'Time spent in each scoring stage per scoring call', ('metal', 'stage')
+))
+FALLBACKS = metrics.register(Counter(
+    'lca_fallback_total', 'Rows served a default value instead of a model output', ('metal', 'output')
+))
+MODEL_LOAD_SECONDS = metrics.register(Gauge(
+    'lca_model_load_seconds', 'Time taken to load each model artifact', ('metal', 'kind', 'version', 'format')
+))
+MODEL_ERRORS = metrics.register(Counter(
+    'lca_model_errors_total', 'Predict calls that raised (their rows were served defaults)', ('metal', 'model')
+))
+MODEL_LOAD_ERRORS = metrics.register(Counter(
+    'lca_model_load_errors_total', 'Model artifacts that failed to load', ('metal', 'kind')
+))
+REQUEST_SECONDS = metrics.register(Histogram(
+    'lca_http_request_duration_seconds', 'HTTP request latency by endpoint and status',
+    ('endpoint', 'method', 'status'), buckets=REQUEST_BUCKETS
+))
+
+
+def process_info():
+    # Read at scrape time: with a preloading server, import time is in the master, not the worker
+    info = Gauge('lca_process_info', 'The process serving these metrics', ('process',))
+    info.labels(os.getpid()).set(1)
+    return [info]
+
+
+metrics.register_collector(process_info)
+
+
+_current_timings = ContextVar('lca_stage_timings', default=None)
+_request_scope = ContextVar('lca_request_scope', default=None)
+
+
+class RequestScope:
+    """Stage times (seconds), fallbacks, model errors and other fields gathered during one request"""
+
+    def __init__(self):
+        self.stages = {}
+        self.fallbacks = {}
+        self.errors = {}
+        self.fields = {}
+
+
+def open_request_scope():
+    """Start gathering for a request; returns (scope, token) - pass the token to close_request_scope()"""
+    scope = RequestScope()
+    return scope, _request_scope.set(scope)
+
+
+def close_request_scope(token):
+    _request_scope.reset(token)
+
+
+def annotate_request(**fields):
+    """Add fields to the current request's scope (no-op outside a request)"""
+    scope = _request_scope.get()
+    if scope is not None:
+        scope.fields.update(fields)
+
+
+def count_fallbacks(metal, output, rows):
+    """Count rows that were served the default for an output"""
+    rows = int(rows)
+    if rows:
+        FALLBACKS.labels(metal, output).inc(rows)
+        scope = _request_scope.get()
+        if scope is not None:
+            scope.fallbacks[output] = scope.fallbacks.get(output, 0) + rows
+
+
+def count_model_error(metal, model, error):
+    MODEL_ERRORS.labels(metal, model).inc()
+    scope = _request_scope.get()
+    if scope is not None:
+        scope.errors[model] = str(error)
+
+
+class StageTimings:
+    """Stage durations (seconds) accumulated over one scoring call"""
+
+    def __init__(self, metal, rows=None):
+        self.metal = metal
+        self.rows = rows
+        self.durations = {}
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.durations[name] = self.durations.get(name, 0.0) + time.perf_counter() - started
+
+    def record(self):
+        for stage, seconds in self.durations.items():
+            STAGE_SECONDS.labels(self.metal, stage).observe(seconds)
+
+        scope = _request_scope.get()
+        if scope is not None:
+            for stage, seconds in self.durations.items():
+                scope.stages[stage] = scope.stages.get(stage, 0.0) + seconds
+            scope.fields['metal'] = self.metal
+            if self.rows is not None:
+                scope.fields['rows'] = scope.fields.get('rows', 0) + self.rows
+
+
+@contextmanager
+def stage_timings(metal, rows=None):
+    """Collect the stages timed inside this block and record them when it ends"""
+    timings = StageTimings(metal, rows)
+    token = _current_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _current_timings.reset(token)
+        timings.record()
+
+
+def timed_stage(name):
+    """Time a block as a stage of the enclosing stage_timings() (no-op outside one)"""
+    timings = _current_timings.get()
+    return timings.stage(name) if timings is not None else nullcontext()
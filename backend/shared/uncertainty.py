@@ -0,0 +1,111 @@
+"""
+Prediction Uncertainty
+======================
+
+Prediction intervals and class confidence for the tree-ensemble models, from
+the spread of their estimators rather than a fixed band. Every function takes
+a whole feature matrix and is vectorized over rows and trees:
+
+    regression_intervals        per-tree mean, standard deviation and the
+                                central ``coverage`` quantile range
+    classification_confidence   mean class probability of the predicted class
+                                and the share of trees voting for it
+
+Both evaluate the trees once, and their mean is the model's own prediction
+(bit for bit), so a caller needing the prediction and its uncertainty takes
+both from one call instead of also running ``predict``.
+
+Compact exports (shared/compact_trees.py) give every tree's leaf value in one
+step; scikit-learn forests (``LCA_COMPACT_MODELS=0``) are evaluated tree by
+tree. Rows go through in chunks of ``PREDICT_CHUNK_ROWS`` so the
+(rows, trees, outputs) buffer stays bounded.
+
+The LLM enhancer (shared/llm_enhancer.py) is the only serving caller, for
+its single-assessment predictions; the batch, job and columnar scoring paths
+do not compute uncertainty.
+
+The intervals describe how much the trees disagree. They are not calibrated
+to a guaranteed coverage.
+"""
+
+import os
+
+import numpy as np
+
+from shared.compact_trees import PREDICT_CHUNK_ROWS
+
+# Central share of the estimator predictions an interval spans
+INTERVAL_COVERAGE = float(os.environ.get('LCA_INTERVAL_COVERAGE', 0.9))
+
+
+def has_estimators(model):
+    return hasattr(model, 'estimator_values') or hasattr(model, 'estimators_')
+
+
+def estimator_values(model, X):
+    """Prediction (regression) or class fractions (classification) of every tree: (rows, trees, width)"""
+    if hasattr(model, 'estimator_values'):
+        return model.estimator_values(X)
+    if not hasattr(model, 'estimators_'):
+        raise TypeError(f"{type(model).__name__} is not a tree ensemble")
+
+    # Converted once to float32, as the forest's own predict does, then each tree unchecked
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    if X.ndim != 2 or X.shape[1] != model.n_features_in_:
+        raise ValueError(f"X has shape {X.shape}, but {type(model).__name__} is expecting "
+                         f"{model.n_features_in_} features as input.")
+    if hasattr(model, 'classes_'):
+        values = [tree.predict_proba(X, check_input=False) for tree in model.estimators_]
+    else:
+        values = [tree.predict(X, check_input=False) for tree in model.estimators_]
+    values = np.stack(values, axis=1)
+    return values if values.ndim == 3 else values[:, :, np.newaxis]
+
+
+def tree_mean(values):
+    """Mean over the trees (axis 1) as the forests compute it"""
+    # cumsum adds trees strictly one by one in estimator order, like the forest's
+    # accumulation loop (mean() may reorder and differ in the last bit)
+    return np.cumsum(values, axis=1)[:, -1] / values.shape[1]
+
+
+def regression_intervals(model, X, coverage=INTERVAL_COVERAGE):
+    """{'mean', 'std', 'lower', 'upper'} arrays of shape (rows,) or (rows, outputs) from the tree spread;
+    'mean' equals model.predict(X)"""
+    X = np.asarray(X)
+    n_outputs = getattr(model, 'n_outputs_', 1)
+    columns = {name: np.empty((len(X), n_outputs)) for name in ('mean', 'std', 'lower', 'upper')}
+    tail = (1 - coverage) / 2
+
+    for start in range(0, len(X), PREDICT_CHUNK_ROWS):
+        values = estimator_values(model, X[start:start + PREDICT_CHUNK_ROWS])
+        stop = start + len(values)
+        columns['mean'][start:stop] = tree_mean(values)
+        columns['std'][start:stop] = values.std(axis=1)
+        columns['lower'][start:stop], columns['upper'][start:stop] = np.quantile(values, [tail, 1 - tail], axis=1)
+
+    if n_outputs == 1:
+        return {name: column[:, 0] for name, column in columns.items()}
+    return columns
+
+
+def classification_confidence(model, X):
+    """{'class_index', 'confidence', 'agreement'} arrays of shape (rows,) from the tree votes;
+    model.classes_[class_index] equals model.predict(X)"""
+    X = np.asarray(X)
+    columns = {
+        'class_index': np.empty(len(X), dtype=np.int64),
+        'confidence': np.empty(len(X)),
+        'agreement': np.empty(len(X)),
+    }
+
+    for start in range(0, len(X), PREDICT_CHUNK_ROWS):
+        values = estimator_values(model, X[start:start + PREDICT_CHUNK_ROWS])
+        stop = start + len(values)
+        proba = tree_mean(values)
+        predicted = proba.argmax(axis=1)
+        columns['class_index'][start:stop] = predicted
+        columns['confidence'][start:stop] = proba[np.arange(len(proba)), predicted]
+        columns['agreement'][start:stop] = (values.argmax(axis=2) == predicted[:, np.newaxis]).mean(axis=1)
+
+    return columns
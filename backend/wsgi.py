@@ -0,0 +1,60 @@
+"""
+Production WSGI Entry Point
+===========================
+
+Selects the app to serve with ``LCA_APP`` (``service`` - all metals, the
+default - or ``aluminum`` / ``copper``) and loads every model of the active
+versions at import time. Run under gunicorn with ``preload_app`` (see
+``gunicorn.conf.py``) so this happens once in the master: forked workers then
+share the model pages copy-on-write instead of each loading its own copy.
+
+    cd backend
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+import gc
+import importlib
+import logging
+import os
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent
+if str(BACKEND_DIR) not in sys.path:
+    sys.path.insert(0, str(BACKEND_DIR))
+
+from shared.claims_service import claims_service
+from shared.llm_pool import llm_pool
+from shared.model_registry import registry
+
+logger = logging.getLogger(__name__)
+
+APP_MODULES = {
+    'service': 'service.app',
+    'aluminum': 'aluminum.app',
+    'copper': 'copper.app',
+}
+APP_METALS = {
+    'service': None,   # every metal in the registry
+    'aluminum': ['aluminum'],
+    'copper': ['copper'],
+}
+
+LCA_APP = os.environ.get('LCA_APP', 'service').lower()
+if LCA_APP not in APP_MODULES:
+    raise ValueError(f"Unknown LCA_APP '{LCA_APP}', expected one of: {', '.join(APP_MODULES)}")
+
+# Load the claims classifier in each worker after the fork: torch state does not survive fork()
+claims_service.warm_up_after_fork()
+llm_pool.warm_up_after_fork()
+
+app = importlib.import_module(APP_MODULES[LCA_APP]).app
+
+# Load models before the fork so workers share them instead of loading lazily per worker
+registry.preload(APP_METALS[LCA_APP])
+
+# Move everything loaded so far out of the collector's generations; otherwise the
+# first gc pass in each worker writes to every object header and un-shares the pages
+gc.collect()
+gc.freeze()
+logger.info(f"🧊 {LCA_APP} app preloaded, {gc.get_freeze_count()} objects frozen for copy-on-write sharing")
@@ -20,6 +20,29 @@ const API_CONFIG = {
 // Create axios instance
 const apiClient = axios.create(API_CONFIG);
 
+// Client-side backend health state. Every backend response carries an
+// X-LCA-Ready header, so a successful submit refreshes it for free; /health is
+// only probed again after a failure, and then with If-None-Match.
+const HEALTH_RETRY_MS = 30000; // wait this long after a failure before probing again
+const healthState = {
+  healthy: null,      // null = unknown, true/false = backend reachable on last call
+  ready: null,        // X-LCA-Ready: backend is serving trained models
+  modelVersion: null,
+  checkedAt: 0,
+  etag: null,
+  data: null
+};
+
+const recordHealth = (healthy, response) => {
+  healthState.healthy = healthy;
+  healthState.checkedAt = Date.now();
+  const ready = response?.headers?.['x-lca-ready'];
+  if (ready !== undefined) {
+    healthState.ready = ready === 'true';
+    healthState.modelVersion = response.headers['x-lca-model-version'] || null;
+  }
+};
+
 // Request interceptor for authentication
 apiClient.interceptors.request.use(
   (config) => {
@@ -48,17 +71,54 @@ export class LCAAssessmentAPI {
   
   /**
    * Health check - verify backend connection
+   * Sends the cached ETag so an unchanged status comes back as an empty 304.
+   * @param {Object} options - { force: true } to skip the client-side cache
    * @returns {Promise<Object>} Backend health status
    */
-  static async checkHealth() {
+  static async checkHealth({ force = false } = {}) {
+    const fresh = Date.now() - healthState.checkedAt < HEALTH_RETRY_MS;
+    if (!force && healthState.healthy && healthState.data && fresh) {
+      return healthState.data;
+    }
+
     try {
-      const response = await apiClient.get('/health');
-      return response.data;
+      const response = await apiClient.get('/health', {
+        headers: healthState.etag ? { 'If-None-Match': healthState.etag } : {},
+        validateStatus: (status) => (status >= 200 && status < 300) || status === 304
+      });
+
+      if (response.status !== 304) {
+        healthState.data = response.data;
+        healthState.etag = response.headers?.etag || null;
+      }
+      recordHealth(Boolean(healthState.data?.success), response);
+      return healthState.data;
     } catch (error) {
+      recordHealth(false);
       throw new Error(`Health check failed: ${error.response?.data?.message || error.message}`);
     }
   }
 
+  /**
+   * Whether the backend should be tried for the next request.
+   * Unknown or healthy backends are called directly; after a failure the
+   * backend is re-probed (at most once per HEALTH_RETRY_MS) before use.
+   */
+  static async isBackendAvailable() {
+    if (healthState.healthy !== false) {
+      return true;
+    }
+    if (Date.now() - healthState.checkedAt < HEALTH_RETRY_MS) {
+      return false;
+    }
+    try {
+      const health = await this.checkHealth({ force: true });
+      return Boolean(health?.success);
+    } catch (error) {
+      return false;
+    }
+  }
+
   /**
    * Submit complete LCA assessment - UPDATED to work with ML-enhanced Flask backend
    * @param {Object} assessmentData - Complete form data
@@ -66,15 +126,15 @@ export class LCAAssessmentAPI {
    */
   static async submitAssessment(assessmentData) {
     try {
-      // First try to connect to ML-enhanced Flask backend
-      const healthCheck = await this.checkHealth();
-      if (healthCheck.success) {
+      // One round trip: readiness comes back on the submit response itself
+      if (await this.isBackendAvailable()) {
         console.log('🤖 Using ML-enhanced backend for assessment...');
         
         // Send assessment data directly to ML backend (simplified format)
         const response = await apiClient.post('/submit-solution', {
           assessment_data: assessmentData
         });
+        recordHealth(true, response);
 
         if (response.data.success) {
           // Convert ML backend response to expected frontend format
@@ -104,7 +164,13 @@ export class LCAAssessmentAPI {
           };
         }
       }
+      console.warn('🔄 ML backend not available, using fallback calculations');
+      return await MockDataFallback.generateMockResults(assessmentData);
     } catch (error) {
+      // Connection failures and 5xx mark the backend unhealthy until it is re-probed
+      if (!error.response || error.response.status >= 500) {
+        recordHealth(false);
+      }
       console.error('🔄 ML backend error details:', {
         message: error.message,
         status: error.response?.status,
@@ -114,8 +180,67 @@ export class LCAAssessmentAPI {
       });
       console.warn('🔄 ML backend not available, using fallback calculations:', error.message);
       // Fallback to local calculations
-      return await this.generateMockResults(assessmentData);
+      return await MockDataFallback.generateMockResults(assessmentData);
+    }
+  }
+
+  /**
+   * Queue a large portfolio of assessments as a background job.
+   * Returns at once, so large runs are not bound by the request timeout.
+   * @param {Array<Object>} assessments - assessment_data objects
+   * @param {string} metal - 'aluminum' or 'copper' (used by the unified service)
+   * @returns {Promise<Object>} Job record ({ id, status, total, ... })
+   */
+  static async submitPortfolioJob(assessments, metal = 'aluminum') {
+    try {
+      const response = await apiClient.post('/jobs', { metal, assessments });
+      return response.data.job;
+    } catch (error) {
+      throw new Error(`Job submission failed: ${error.response?.data?.error || error.message}`);
+    }
+  }
+
+  /**
+   * Job progress and one page of its results
+   * @param {string} jobId - Job id from submitPortfolioJob
+   * @param {Object} page - { offset, limit }
+   * @returns {Promise<Object>} { job, progress, results, next_offset }
+   */
+  static async getJob(jobId, { offset = 0, limit = 500 } = {}) {
+    try {
+      const response = await apiClient.get(`/jobs/${jobId}`, { params: { offset, limit } });
+      return response.data;
+    } catch (error) {
+      throw new Error(`Job status failed: ${error.response?.data?.error || error.message}`);
+    }
+  }
+
+  /**
+   * Poll a job until it finishes, then collect every page of results
+   * @param {string} jobId - Job id from submitPortfolioJob
+   * @param {Object} options - { intervalMs, pageSize, onProgress(progress, job) }
+   * @returns {Promise<Object>} { job, results }
+   */
+  static async waitForJob(jobId, { intervalMs = 2000, pageSize = 5000, onProgress } = {}) {
+    let status = await this.getJob(jobId, { limit: 1 });
+    while (status.job.status === 'queued' || status.job.status === 'running') {
+      onProgress?.(status.progress, status.job);
+      await new Promise(resolve => setTimeout(resolve, intervalMs));
+      status = await this.getJob(jobId, { limit: 1 });
+    }
+    onProgress?.(status.progress, status.job);
+    if (status.job.status === 'failed') {
+      throw new Error(`Job ${jobId} failed: ${status.job.error}`);
+    }
+
+    const results = [];
+    let offset = 0;
+    while (offset !== null) {
+      const page = await this.getJob(jobId, { offset, limit: pageSize });
+      results.push(...page.results);
+      offset = page.next_offset;
     }
+    return { job: status.job, results };
   }
 
   /**
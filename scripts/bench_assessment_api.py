@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""
+Assessment API Benchmark
+========================
+
+Drives ``POST /api/submit-solution`` on the aluminum and copper backends and
+reports latency percentiles (p50/p95/p99) and requests/second at several
+concurrency levels, against two targets:
+
+    test-client  the Flask test client, in this process (no network, no server)
+    server       a real local server: gunicorn (``backend/gunicorn.conf.py``)
+                 started per backend, or an already running one (--url)
+
+Aluminum payloads are built from ``data/aluminum/sample_data.txt`` (its form
+values plus the energy/recycled-content scenarios it lists, jittered); copper
+payloads are rows of ``data/copper/copper_industry_dataset.csv``. Every run
+uses the same seed, and the response cache is disabled (LCA_CACHE_SIZE=0)
+unless --cache is given, so each request is really scored.
+
+A per-stage breakdown times the scoring steps of one request in-process:
+feature prep, each model's predict, LCA metrics, evaluation and
+recommendations, and JSON serialization.
+
+Results are saved as JSON (commit, environment, settings and every number),
+and --compare prints the change against an earlier results file:
+
+    python scripts/bench_assessment_api.py                         # both targets
+    python scripts/bench_assessment_api.py --target test-client --concurrency 1 8
+    python scripts/bench_assessment_api.py --compare bench_results/assessment_api_<commit>.json
+"""
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import re
+import socket
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+BACKEND_DIR = PROJECT_ROOT / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+ALUMINUM_SAMPLE = PROJECT_ROOT / "data" / "aluminum" / "sample_data.txt"
+COPPER_DATASET = PROJECT_ROOT / "data" / "copper" / "copper_industry_dataset.csv"
+RESULTS_DIR = PROJECT_ROOT / "bench_results"
+
+METALS = ('aluminum', 'copper')
+SUBMIT_PATH = '/api/submit-solution'
+HEALTH_PATH = '/api/health'
+
+# Numeric form fields jittered around the sample values
+JITTERED_FIELDS = (
+    'productionScale', 'totalInputs', 'totalOutputs', 'materialEfficiency', 'secondaryMaterialFraction',
+    'scrapRatio', 'recyclingRate', 'wasteRatio', 'energyRecoveryRate', 'recycledContent'
+)
+# Scenarios listed in sample_data.txt (B: recycled content, D: energy mix) plus the other sources
+ALUMINUM_SCENARIOS = [
+    {}, {'recycledContent': 50}, {'energySource': 'coal'}, {'energySource': 'grid'}, {'energySource': 'renewable'}
+]
+
+
+def camel_case(label):
+    words = label.split()
+    return words[0].lower() + ''.join(word.title() for word in words[1:])
+
+
+def parse_form_value(value):
+    value = value.split(' (')[0].strip()
+    if value in ('Yes', 'No'):
+        return value == 'Yes'
+    try:
+        number = float(value)
+        return int(number) if number.is_integer() else number
+    except ValueError:
+        return value
+
+
+def aluminum_sample(path=ALUMINUM_SAMPLE):
+    """The form values of sample_data.txt as an assessment_data dict ("Production Scale: 1000" -> productionScale)"""
+    sample = {}
+    for line in path.read_text(encoding='utf-8').splitlines():
+        if line.startswith('EXPECTED RESULTS'):
+            break
+        match = re.match(r'^((?:[A-Z][a-z]+ ?)+): (\S.*)$', line)
+        if match and match.group(1) != 'Note':
+            sample[camel_case(match.group(1))] = parse_form_value(match.group(2))
+    return sample
+
+
+def aluminum_payloads(n_payloads, seed):
+    rng = np.random.default_rng(seed)
+    sample = aluminum_sample()
+    payloads = []
+    for i in range(n_payloads):
+        payload = {**sample, **ALUMINUM_SCENARIOS[i % len(ALUMINUM_SCENARIOS)]}
+        for field in JITTERED_FIELDS:
+            if isinstance(payload.get(field), (int, float)) and not isinstance(payload[field], bool):
+                payload[field] = round(float(payload[field]) * rng.uniform(0.8, 1.2), 2)
+        payloads.append(payload)
+    return payloads
+
+
+def copper_payloads(n_payloads, seed):
+    import pandas as pd
+    from shared.feature_builders import dataset_columns
+
+    frame = pd.read_csv(COPPER_DATASET).sample(frac=1.0, random_state=seed).head(n_payloads)
+    columns = dataset_columns(frame)
+    return [
+        {key: values[i].item() if hasattr(values[i], 'item') else values[i] for key, values in columns.items()}
+        for i in range(len(frame))
+    ]
+
+
+def build_payloads(n_payloads, seed):
+    return {
+        'aluminum': [{**payload, 'metalType': 'aluminum'} for payload in aluminum_payloads(n_payloads, seed)],
+        'copper': [{**payload, 'metalType': 'copper'} for payload in copper_payloads(n_payloads, seed)],
+    }
+
+
+def load_apps():
+    """The per-metal Flask apps, imported in this process"""
+    import importlib
+    import logging
+    logging.disable(logging.ERROR)
+    return {metal: importlib.import_module(f"{metal}.app").app for metal in METALS}
+
+
+# --- Request drivers ---------------------------------------------------------
+
+class TestClientDriver:
+    """Posts through app.test_client(), one client per thread"""
+
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+    def post(self, body):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        response = client.post(SUBMIT_PATH, data=body, content_type='application/json')
+        response.get_data()
+        return response.status_code
+
+    def close(self):
+        pass
+
+
+class HTTPDriver:
+    """Posts over keep-alive HTTP connections, one per thread"""
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self._local = threading.local()
+        self._connections = []
+
+    def post(self, body):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = http.client.HTTPConnection(self.host, self.port, timeout=60)
+            self._connections.append(connection)
+        connection.request('POST', SUBMIT_PATH, body=body, headers={'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        response.read()
+        return response.status
+
+    def close(self):
+        for connection in self._connections:
+            connection.close()
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+
+def start_server(metal, workers, cache):
+    """Start gunicorn for one backend on a free port; returns (process, base_url)"""
+    port = free_port()
+    env = dict(os.environ, LCA_APP=metal, LCA_BIND=f"127.0.0.1:{port}", LCA_WORKERS=str(workers))
+    if not cache:
+        env['LCA_CACHE_SIZE'] = '0'
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn for {metal} exited with code {process.returncode}")
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            connection.request('GET', HEALTH_PATH)
+            if connection.getresponse().status == 200:
+                connection.close()
+                return process, base_url
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"gunicorn for {metal} did not answer {HEALTH_PATH} within 60s")
+
+
+# --- Measurements --------------------------------------------------------------
+
+def percentiles(samples_ms):
+    samples = np.asarray(samples_ms)
+    return {
+        'p50_ms': round(float(np.percentile(samples, 50)), 3),
+        'p95_ms': round(float(np.percentile(samples, 95)), 3),
+        'p99_ms': round(float(np.percentile(samples, 99)), 3),
+        'mean_ms': round(float(samples.mean()), 3),
+    }
+
+
+def run_load(driver, bodies, concurrency, n_requests):
+    """n_requests spread over concurrency threads; per-request latency and overall requests/sec"""
+    latencies = [[] for _ in range(concurrency)]
+    errors = [0] * concurrency
+    start = threading.Barrier(concurrency + 1)
+
+    def worker(index):
+        start.wait()
+        for i in range(index, n_requests, concurrency):
+            started = time.perf_counter()
+            status = driver.post(bodies[i % len(bodies)])
+            latencies[index].append((time.perf_counter() - started) * 1e3)
+            errors[index] += status != 200
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    start.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    samples = [latency for thread_latencies in latencies for latency in thread_latencies]
+    return {
+        'concurrency': concurrency,
+        'requests': len(samples),
+        'errors': sum(errors),
+        'requests_per_sec': round(len(samples) / elapsed, 1),
+        **percentiles(samples),
+    }
+
+
+def feature_stages(metal, models):
+    """(stage name, features function) per model the metal's pipeline calls, in pipeline order"""
+    from shared import feature_builders as fb
+
+    if metal == 'aluminum':
+        return {
+            'environmental': lambda data: fb.build_aluminum_environmental_features(data),
+            'circularity': lambda data: fb.build_aluminum_circularity_features(data),
+        }
+    env = lambda data: fb.build_copper_environmental_features(
+        data, models.get('energy_encoder'), models.get('location_encoder'))
+    return {
+        'environmental': env,
+        'circularity': lambda data: fb.build_copper_circularity_features(data, models.get('energy_encoder')),
+        # The process classifier reuses the environmental features
+        'classification': env,
+    }
+
+
+def stage_breakdown(app, metal, payloads, repeats):
+    """Per-stage timings (ms) of scoring one assessment, stage by stage as the pipeline runs them"""
+    from shared.lca_metrics import calculate_lca_metrics
+    from shared.pipelines import get_pipeline
+
+    pipeline = get_pipeline(metal)
+    models = pipeline.active_models().preload()
+    builders = feature_stages(metal, models)
+    timings = {}
+    errors = {}
+
+    def timed(stage, function, *args):
+        started = time.perf_counter()
+        try:
+            return function(*args)
+        except Exception as e:
+            errors[stage] = f"{type(e).__name__}: {e}"
+        finally:
+            timings.setdefault(stage, []).append((time.perf_counter() - started) * 1e3)
+
+    for _ in range(repeats):
+        for payload in payloads:
+            features = {}
+            for kind, builder in builders.items():
+                features[kind] = timed('feature_prep', builder, [payload])
+            for kind, built in features.items():
+                model = models.get(kind)
+                if model is not None and built is not None:
+                    timed(f'{kind}_predict', model.predict, built[0])
+
+            predictions = pipeline.predict([payload], models)[0]
+            lca_metrics = timed('lca_metrics', calculate_lca_metrics, metal, payload,
+                                predictions['environmental_efficiency'])
+            result = timed('evaluation_recommendations', pipeline.finalize,
+                           pipeline.new_results(models, predictions), payload, lca_metrics)
+            timed('json_serialization', app.json.dumps, result)
+
+    # feature_prep ran once per model; report it per request
+    per_request = len(builders)
+    timings['feature_prep'] = [
+        sum(timings['feature_prep'][i:i + per_request]) for i in range(0, len(timings['feature_prep']), per_request)
+    ]
+    stages = {stage: percentiles(samples) for stage, samples in timings.items()}
+    for stage, error in errors.items():
+        stages[stage]['error'] = error
+    for kind in builders:
+        if models.get(kind) is None:
+            stages[f'{kind}_predict'] = {'skipped': 'model not available (defaults served)'}
+    return stages
+
+
+# --- Reporting -----------------------------------------------------------------
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_load(metal, target, rows):
+    print(f"\n🔬 {metal} via {target}")
+    print(f"   {'conc':>5} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for row in rows:
+        print(f"   {row['concurrency']:>5} {row['requests_per_sec']:>9.1f} {row['p50_ms']:>9.2f} "
+              f"{row['p95_ms']:>9.2f} {row['p99_ms']:>9.2f} {row['errors']:>7}")
+
+
+def print_stages(metal, stages):
+    print(f"\n⏱️  {metal} stage breakdown (per request)")
+    for stage, timing in stages.items():
+        if 'skipped' in timing:
+            print(f"   {stage:<28} skipped: {timing['skipped']}")
+            continue
+        note = f"  ⚠️ {timing['error']}" if 'error' in timing else ''
+        print(f"   {stage:<28} p50 {timing['p50_ms']:>8.3f} ms   mean {timing['mean_ms']:>8.3f} ms{note}")
+
+
+def change(old, new):
+    return f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+
+
+def compare(previous_path, results):
+    """Print p50/p95/p99 and requests/sec changes against an earlier results file"""
+    previous = json.loads(Path(previous_path).read_text())
+    print(f"\n📊 Change vs {previous_path} (commit {previous['meta'].get('commit')})")
+    for target, metals in results['load'].items():
+        for metal, rows in metals.items():
+            old_rows = {row['concurrency']: row for row in previous['load'].get(target, {}).get(metal, [])}
+            for row in rows:
+                old = old_rows.get(row['concurrency'])
+                if old:
+                    print(f"   {target:<11} {metal:<8} conc {row['concurrency']:>3}: "
+                          f"req/s {change(old['requests_per_sec'], row['requests_per_sec']):>7}  "
+                          f"p50 {change(old['p50_ms'], row['p50_ms']):>7}  "
+                          f"p95 {change(old['p95_ms'], row['p95_ms']):>7}  "
+                          f"p99 {change(old['p99_ms'], row['p99_ms']):>7}")
+    for metal, stages in results['stages'].items():
+        for stage, timing in stages.items():
+            old = previous['stages'].get(metal, {}).get(stage)
+            if old and 'p50_ms' in old and 'p50_ms' in timing:
+                print(f"   stage       {metal:<8} {stage:<28} p50 {change(old['p50_ms'], timing['p50_ms']):>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark latency and throughput of the assessment API")
+    parser.add_argument('--target', choices=['test-client', 'server', 'both'], default='both')
+    parser.add_argument('--metal', choices=METALS, action='append', help="Backend to benchmark (default: both)")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--requests', type=int, default=400, help="Requests per concurrency level")
+    parser.add_argument('--warmup', type=int, default=20, help="Unmeasured requests before each target")
+    parser.add_argument('--payloads', type=int, default=200, help="Distinct payloads per metal")
+    parser.add_argument('--stage-repeats', type=int, default=3, help="Passes over the payloads for the stage breakdown")
+    parser.add_argument('--server-workers', type=int, default=2, help="gunicorn workers per backend")
+    parser.add_argument('--url', action='append', default=[], metavar='METAL=URL',
+                        help="Use a running server instead of starting gunicorn, e.g. aluminum=http://localhost:5000")
+    parser.add_argument('--cache', action='store_true', help="Keep the response cache enabled")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--output', help="Results file (default: bench_results/assessment_api_<commit>.json)")
+    parser.add_argument('--compare', help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    if not args.cache:
+        os.environ['LCA_CACHE_SIZE'] = '0'
+    metals = args.metal or list(METALS)
+    targets = ['test-client', 'server'] if args.target == 'both' else [args.target]
+    urls = dict(entry.split('=', 1) for entry in args.url)
+
+    apps = load_apps()
+    payloads = build_payloads(args.payloads, args.seed)
+    bodies = {metal: [json.dumps(payload).encode('utf-8') for payload in payloads[metal]] for metal in metals}
+
+    commit = git_commit()
+    results = {
+        'meta': {
+            'commit': commit,
+            'timestamp': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'settings': {key: value for key, value in vars(args).items() if key not in ('output', 'compare')},
+        },
+        'load': {},
+        'stages': {},
+    }
+
+    print(f"📏 Assessment API benchmark, commit {commit}, {args.requests} requests per level")
+    for target in targets:
+        results['load'][target] = {}
+        for metal in metals:
+            process = None
+            if target == 'test-client':
+                driver = TestClientDriver(apps[metal])
+            else:
+                base_url = urls.get(metal)
+                if base_url is None:
+                    process, base_url = start_server(metal, args.server_workers, args.cache)
+                driver = HTTPDriver(base_url)
+
+            try:
+                run_load(driver, bodies[metal], min(args.concurrency), args.warmup)
+                rows = [run_load(driver, bodies[metal], level, args.requests) for level in args.concurrency]
+            finally:
+                driver.close()
+                if process is not None:
+                    process.terminate()
+                    process.wait()
+            results['load'][target][metal] = rows
+            print_load(metal, target, rows)
+
+    for metal in metals:
+        results['stages'][metal] = stage_breakdown(apps[metal], metal, payloads[metal][:50], args.stage_repeats)
+        print_stages(metal, results['stages'][metal])
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"assessment_api_{commit or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"\n💾 Results saved to {output}")
+
+    if args.compare:
+        compare(args.compare, results)
+
+
+if __name__ == "__main__":
+    main()
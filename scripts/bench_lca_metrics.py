@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+LCA Metric Engine Microbenchmark
+================================
+
+Rows/second of the table-driven metric engine (``shared.lca_metrics``)
+against the scalar ``calculate_aluminum_lca_metrics`` /
+``calculate_copper_lca_metrics`` functions it replaced (kept below, verbatim
+in behaviour, as the baseline), on synthetic facilities:
+
+    scalar      the old per-row functions, one call per assessment
+    engine-row  calculate_lca_metrics, one call per assessment
+    engine      calculate_lca_metric_columns over a list of assessment dicts
+    arrays      lca_metric_arrays over pre-parsed NumPy columns
+
+It also reports the largest difference between the scalar and engine results;
+Python's round() and np.round() can disagree by 0.01 on exact half-cent ties.
+
+Usage:
+    python scripts/bench_lca_metrics.py --rows 100000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from shared.lca_metrics import (
+    calculate_lca_metric_columns,
+    calculate_lca_metrics,
+    lca_metric_arrays
+)
+
+ENERGY_SOURCES = ['renewable', 'grid', 'coal', 'natural_gas']
+
+# Scalar coefficients of the replaced functions:
+# (base energy, emission factor, water factor) by source, other-source row, offset, process, water base/slope
+SCALAR_COEFFICIENTS = {
+    'aluminum': ({'renewable': (3.5, 0.02, 0.8), 'grid': (4.8, 0.15, 1.0)}, (6.2, 0.25, 1.0), 1.5, 0.08, 2.5, 5.0),
+    'copper': ({'renewable': (12.0, 0.03, 0.75), 'grid': (18.0, 0.18, 1.0)}, (25.0, 0.30, 1.0), 1.8, 0.15, 35.0, 50.0),
+}
+
+
+def scalar_lca_metrics(metal, assessment_data, env_efficiency):
+    """The pre-engine calculate_<metal>_lca_metrics: an if/elif chain per row"""
+    sources, other, offset, process_emissions, water_base, water_slope = SCALAR_COEFFICIENTS[metal]
+    production_scale = float(assessment_data.get('productionScale', 500))
+    energy_source = assessment_data.get('energySource', 'grid')
+
+    if energy_source == 'renewable':
+        base_energy, energy_emissions, water_factor = sources['renewable']
+    elif energy_source == 'grid':
+        base_energy, energy_emissions, water_factor = sources['grid']
+    else:
+        base_energy, energy_emissions, water_factor = other
+
+    energy_per_ton = base_energy * (offset - env_efficiency)
+    total_energy = energy_per_ton * production_scale
+    carbon_footprint = (total_energy * energy_emissions) + (production_scale * process_emissions)
+    water_per_ton = water_base + (water_slope * (1.0 - env_efficiency))
+    if energy_source == 'renewable':
+        water_per_ton *= water_factor
+    water_usage = water_per_ton * production_scale
+
+    return {
+        'carbon_footprint': round(carbon_footprint, 2),
+        'energy_consumption': round(total_energy * 1000, 2),
+        'water_usage': round(water_usage, 2)
+    }
+
+
+def synthetic_rows(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    production_scale = rng.uniform(10, 20000, n_rows)
+    energy_source = rng.choice(ENERGY_SOURCES, n_rows)
+    env_efficiency = rng.uniform(0.05, 0.98, n_rows)
+    assessments = [
+        {'productionScale': float(scale), 'energySource': str(source)}
+        for scale, source in zip(production_scale, energy_source)
+    ]
+    return assessments, env_efficiency, production_scale, energy_source.astype(object)
+
+
+def rows_per_second(function, n_rows, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return n_rows / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the LCA metric engine against the scalar functions")
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeats', type=int, default=3, help="Best of N runs")
+    args = parser.parse_args()
+
+    assessments, env_efficiency, production_scale, energy_source = synthetic_rows(args.rows)
+    env_list = env_efficiency.tolist()
+
+    print(f"📏 LCA metrics, {args.rows:,} rows (best of {args.repeats})")
+    for metal in SCALAR_COEFFICIENTS:
+        runs = {
+            'scalar': lambda: [scalar_lca_metrics(metal, row, env) for row, env in zip(assessments, env_list)],
+            'engine-row': lambda: [calculate_lca_metrics(metal, row, env) for row, env in zip(assessments, env_list)],
+            'engine': lambda: calculate_lca_metric_columns(metal, assessments, env_efficiency),
+            'arrays': lambda: lca_metric_arrays(metal, production_scale, energy_source, env_efficiency),
+        }
+        # The per-row engine path is slow by design; time it on a slice
+        sizes = {'engine-row': min(args.rows, 5000)}
+
+        print(f"\n🔬 {metal}")
+        baseline = None
+        for name, run in runs.items():
+            n_rows = sizes.get(name, args.rows)
+            if n_rows != args.rows:
+                subset = assessments[:n_rows], env_list[:n_rows]
+                run = lambda subset=subset: [calculate_lca_metrics(metal, row, env) for row, env in zip(*subset)]
+            rate = rows_per_second(run, n_rows, args.repeats)
+            baseline = baseline or rate
+            print(f"   {name:<11} {rate:>14,.0f} rows/s  {rate / baseline:>7.1f}x")
+
+        expected = [scalar_lca_metrics(metal, row, env) for row, env in zip(assessments, env_list)]
+        actual = calculate_lca_metric_columns(metal, assessments, env_efficiency)
+        for metric, values in actual.items():
+            diff = np.abs(values - np.array([row[metric] for row in expected]))
+            print(f"   {metric:<19} max diff {diff.max():.2f}, {int(np.sum(diff > 0))} rows differ")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Uncertainty Engine Microbenchmark
+=================================
+
+Cost of the ensemble uncertainty engine (``shared.uncertainty``) against a
+plain ``predict`` for every tree model of the active versions, on synthetic
+feature rows:
+
+    predict       the model's own predict
+    intervals     regression_intervals / classification_confidence
+
+Both are timed on a batch of ``--rows`` rows and on a single row (the
+per-request cost). The largest difference between the interval mean and
+``predict`` is reported as a consistency check.
+
+Usage:
+    python scripts/bench_uncertainty.py --rows 10000
+    LCA_COMPACT_MODELS=0 python scripts/bench_uncertainty.py    # scikit-learn pickles
+"""
+
+import argparse
+import sys
+import time
+import warnings
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from shared.model_registry import registry
+from shared.uncertainty import classification_confidence, has_estimators, regression_intervals
+
+MODEL_KINDS = ('environmental', 'circularity', 'classification')
+
+
+def best_seconds(function, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def n_trees(model):
+    return len(model.estimators_) if hasattr(model, 'estimators_') else model.meta['n_estimators']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ensemble uncertainty against plain predict")
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeats', type=int, default=3, help="Best of N runs")
+    args = parser.parse_args()
+    # Pickled forests fitted on DataFrames warn on every array predict
+    warnings.filterwarnings('ignore', message='X does not have valid feature names')
+
+    rng = np.random.default_rng(0)
+    print(f"📏 Ensemble uncertainty, {args.rows:,} rows and 1 row (best of {args.repeats})")
+    for metal in registry.metal_artifacts:
+        models = registry.active(metal)
+        for kind in MODEL_KINDS:
+            model = models.get(kind)
+            if model is None or not has_estimators(model):
+                continue
+            is_classifier = getattr(model, 'classes_', None) is not None
+            uncertainty = partial(classification_confidence if is_classifier else regression_intervals, model)
+            X = rng.uniform(0, 100, size=(args.rows, model.n_features_in_))
+
+            print(f"\n🔬 {metal} {kind} ({n_trees(model)} trees)")
+            timings = {}
+            for name, run in (('predict', model.predict), ('intervals', uncertainty)):
+                batch = best_seconds(lambda: run(X), args.repeats)
+                single = best_seconds(lambda: run(X[:1]), args.repeats * 10)
+                timings[name] = batch
+                print(f"   {name:<10} {args.rows / batch:>12,.0f} rows/s  {single * 1e3:>8.2f} ms/row")
+            print(f"   overhead   {timings['intervals'] / timings['predict']:>12.1f}x predict")
+
+            if is_classifier:
+                agree = model.classes_[uncertainty(X)['class_index']] == model.predict(X)
+                print(f"   same class {agree.mean():>12.1%}")
+            else:
+                diff = np.abs(uncertainty(X)['mean'] - model.predict(X)).max()
+                print(f"   mean vs predict max diff {diff:.2e}")
+
+
+if __name__ == "__main__":
+    main()
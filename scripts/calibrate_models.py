@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Conformal Calibration of Model Versions
+=======================================
+
+Precomputes the split-conformal interval tables of a model version
+(shared/calibration.py) so serving an interval is one array lookup. Each
+regression model scores the calibration rows through the same feature
+builders the pipelines use; the absolute residual quantile at every
+``--coverage`` level is stored per process class and pooled, in
+``<model dir>/<prefix>calibration_<version>.json`` next to the version's
+training summary, where the model registry loads it.
+
+Run it from the training pipeline right after a version is written, on rows
+the models were not fitted on (``--data``): residuals of training rows are
+too small and give intervals that are too narrow. Without a held-out file the
+metal's dataset is used, and the script says so.
+
+Only copper is calibrated for now: it is the only metal with regression
+models and a labelled dataset under ``data/``. Models that cannot score the
+rows (missing, or rejecting the features) are skipped with a message.
+
+Usage:
+    python scripts/calibrate_models.py --metal copper --data holdout.csv
+    python scripts/calibrate_models.py --metal copper --version 20250919_025639 --coverage 0.9 0.95
+"""
+
+import argparse
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "backend"))
+
+from shared.calibration import DEFAULT_COVERAGES, residual_half_widths, save_calibration
+from shared.feature_builders import (
+    build_copper_circularity_features,
+    build_copper_environmental_features,
+    dataset_columns
+)
+from shared.model_registry import METAL_ARTIFACTS, registry
+from shared.pipelines.base import predict_column
+
+# Per metal: default calibration rows, the dataset's process class column, and for each
+# regression model its target column, output index and feature builder
+CALIBRATION_SPECS = {
+    'copper': {
+        'data': REPO_ROOT / "data" / "copper" / "copper_industry_dataset.csv",
+        'class_column': 'process_classification',
+        'models': {
+            'environmental': {
+                'target': 'environmental_efficiency',
+                'output': 0,
+                'features': lambda data, models: build_copper_environmental_features(
+                    data, models.get('energy_encoder'), models.get('location_encoder')
+                ),
+            },
+            'circularity': {
+                'target': 'circularity_index',
+                'output': 0,   # the pipeline serves the first output as the circularity index
+                'features': lambda data, models: build_copper_circularity_features(data, models.get('energy_encoder')),
+            },
+        },
+    },
+}
+
+
+def class_ids(labels, classes):
+    """Encoder id of each class label, -1 for labels the encoder does not know"""
+    index = {name: i for i, name in enumerate(classes)}
+    return np.array([index.get(label, -1) for label in labels])
+
+
+def calibrate(metal, models, frame, coverages, min_class_rows):
+    spec = CALIBRATION_SPECS[metal]
+    data = dataset_columns(frame)
+    encoder = models.get('classification_encoder')
+    classes = [str(name) for name in encoder.classes_] if encoder is not None else []
+    ids = class_ids(frame[spec['class_column']].astype(str), classes) if classes else np.full(len(frame), -1)
+
+    tables = {}
+    for kind, model_spec in spec['models'].items():
+        model = models.get(kind)
+        if model is None:
+            print(f"   ⚠️ {kind}: no model in version {models.version}, skipped")
+            continue
+        try:
+            features, valid = model_spec['features'](data, models)
+            predictions, predicted = predict_column(model, features, valid)
+        except Exception as e:
+            print(f"   ⚠️ {kind}: cannot score the calibration rows ({e}), skipped")
+            continue
+
+        predictions = predictions[:, model_spec['output']] if predictions.ndim == 2 else predictions
+        target = pd.to_numeric(frame[model_spec['target']], errors='coerce').to_numpy()
+        rows = predicted & np.isfinite(target)
+        residuals = np.abs(target[rows] - predictions[rows])
+        half_widths, class_rows = residual_half_widths(residuals, ids[rows], len(classes), coverages, min_class_rows)
+
+        tables[kind] = {
+            'target': model_spec['target'],
+            'output': model_spec['output'],
+            'rows': int(rows.sum()),
+            'class_rows': class_rows.tolist(),
+            'half_widths': half_widths.tolist(),
+        }
+        pooled = ', '.join(f"{coverage:.0%} ±{width:.4f}" for coverage, width in zip(coverages, half_widths[-1]))
+        print(f"   ✅ {kind}: {int(rows.sum()):,} rows, pooled {pooled}")
+    return classes, tables
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute conformal calibration tables for a model version")
+    parser.add_argument('--metal', choices=list(CALIBRATION_SPECS), default='copper')
+    parser.add_argument('--version', help="Model version (default: the newest)")
+    parser.add_argument('--data', type=Path, help="Held-out calibration rows (default: the metal's dataset)")
+    parser.add_argument('--coverage', type=float, nargs='+', default=list(DEFAULT_COVERAGES))
+    parser.add_argument('--min-class-rows', type=int, default=30, help="Fewer rows use the pooled widths")
+    args = parser.parse_args()
+
+    spec = CALIBRATION_SPECS[args.metal]
+    version = args.version or registry.versions(args.metal)[-1]
+    models = registry.version(args.metal, version)
+    data_path = args.data or spec['data']
+    if args.data is None:
+        print(f"⚠️ No --data: calibrating on {data_path.name}, which the models may have been trained on; "
+              f"intervals will be too narrow")
+
+    frame = pd.read_csv(data_path)
+    coverages = sorted(args.coverage)
+    print(f"📐 Calibrating {args.metal} {version} on {len(frame):,} rows of {data_path.name}")
+    classes, tables = calibrate(args.metal, models, frame, coverages, args.min_class_rows)
+    if not tables:
+        sys.exit("❌ No model could be calibrated")
+
+    output = registry.model_dir(args.metal) / METAL_ARTIFACTS[args.metal]['artifacts']['calibration'].format(version=version)
+    save_calibration(output, {
+        'metal': args.metal,
+        'version': version,
+        'created': datetime.now().isoformat(),
+        'data': data_path.name,
+        'coverages': coverages,
+        'classes': classes,
+        'models': tables,
+    })
+    print(f"💾 Wrote {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Backend Startup Import Budget
+=============================
+
+Imports each backend app (``aluminum.app``, ``copper.app``, ``service.app``)
+in a fresh interpreter under ``python -X importtime`` and checks that
+
+  * the total import time stays within ``--budget-ms`` (default 1000 ms), and
+  * no heavy optional dependency (torch, transformers, pandas, scikit-learn,
+    joblib...) is imported at startup: those belong to the feature that needs
+    them and are imported when it is first used.
+
+The slowest imports made directly by each app module are listed. The claims
+classifier warm-up is turned off for the measurement (``LCA_CLAIMS_ENABLED=0``):
+it imports transformers in a background thread by design, after startup.
+Exits non-zero when a backend is over budget or imports a heavy module.
+
+Usage:
+    python scripts/check_startup_time.py
+    python scripts/check_startup_time.py --backend service --budget-ms 600 --top 15
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+
+BACKENDS = {
+    'aluminum': 'aluminum.app',
+    'copper': 'copper.app',
+    'service': 'service.app',
+}
+
+# Imported lazily by the features that need them; never at backend startup
+HEAVY_MODULES = (
+    'torch', 'transformers', 'optimum', 'onnxruntime', 'pandas', 'sklearn', 'scipy',
+    'joblib', 'xgboost', 'lightgbm', 'pyarrow', 'matplotlib', 'shap'
+)
+
+
+def parse_importtime(stderr):
+    """[(module, self_us, cumulative_us, depth)] from ``-X importtime`` output"""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        imports.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return imports
+
+
+def measure(module):
+    env = {**os.environ, 'LCA_CLAIMS_ENABLED': '0', 'PYTHONPATH': str(BACKEND_DIR)}
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    wall_seconds = time.perf_counter() - started
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr[-2000:]}")
+    return parse_importtime(completed.stderr), wall_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check backend startup import time and heavy imports")
+    parser.add_argument('--backend', action='append', choices=list(BACKENDS), help="Backend to check (default: all)")
+    parser.add_argument('--budget-ms', type=float, default=1000, help="Maximum total import time per backend")
+    parser.add_argument('--top', type=int, default=10, help="Slowest direct imports of the app to list")
+    args = parser.parse_args()
+
+    ok = True
+    for backend in args.backend or list(BACKENDS):
+        imports, wall_seconds = measure(BACKENDS[backend])
+        top_level = [entry for entry in imports if entry[3] == 0]
+        total_ms = sum(cumulative for _, _, cumulative, _ in top_level) / 1e3
+        heavy = sorted({name.split('.')[0] for name, _, _, _ in imports if name.split('.')[0] in HEAVY_MODULES})
+
+        within_budget = total_ms <= args.budget_ms
+        print(f"{'✅' if within_budget and not heavy else '❌'} {backend}: {total_ms:.0f} ms of imports "
+              f"(budget {args.budget_ms:.0f} ms), {len(imports)} modules, {wall_seconds:.2f}s to start")
+        direct = [entry for entry in imports if entry[3] == 1]
+        for name, _, cumulative, _ in sorted(direct, key=lambda entry: -entry[2])[:args.top]:
+            print(f"     {cumulative / 1e3:8.1f} ms  {name}")
+        if heavy:
+            print(f"   ⚠️ Heavy modules imported at startup: {', '.join(heavy)}")
+        ok &= within_budget and not heavy
+
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Export the Claims Classifier to Quantized ONNX
+==============================================
+
+Exports the environmental claims model (``LCA_CLAIMS_MODEL``, a local
+directory or HuggingFace id) to ONNX and quantizes it with dynamic int8
+quantization for CPU inference. The result lands in ``models/claims/onnx-int8``
+(``LCA_CLAIMS_ONNX_DIR``), where EnvironmentalClaimsAnalyzer picks it up.
+
+Every export is checked for parity against the fp32 transformers model on the
+fixture claims in ``data/claims/parity_claims.txt``: label agreement and score
+differences are reported with the latency of both runtimes, and the script
+exits non-zero when agreement is below ``--min-agreement``.
+
+Needs ``optimum[onnxruntime]`` (``pip install "optimum[onnxruntime]"``).
+
+Usage:
+    python scripts/export_claims_onnx.py
+    python scripts/export_claims_onnx.py --model path/to/environmental-claims --arch avx512_vnni
+    python scripts/export_claims_onnx.py --check-only     # parity of an existing export
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "backend" / "shared" / "ai_models"))
+
+from environmental_claims_analyzer import (
+    CLAIMS_MODEL_PATH,
+    CLAIMS_ONNX_DIR,
+    ONNX_QUANTIZED_FILE,
+    EnvironmentalClaimsAnalyzer
+)
+
+FIXTURES = REPO_ROOT / "data" / "claims" / "parity_claims.txt"
+QUANTIZATION_ARCHS = ('avx2', 'avx512', 'avx512_vnni', 'arm64')
+
+
+def export(model_path, output_dir, arch):
+    """ONNX export of the model plus its dynamically int8-quantized version and tokenizer"""
+    try:
+        from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    except ImportError:
+        sys.exit('❌ The ONNX export needs optimum: pip install "optimum[onnxruntime]"')
+    from transformers import AutoTokenizer
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory() as fp32_dir:
+        model = ORTModelForSequenceClassification.from_pretrained(model_path, export=True)
+        model.save_pretrained(fp32_dir)
+
+        # Dynamic quantization: int8 weights, activations quantized on the fly - no calibration data
+        quantizer = ORTQuantizer.from_pretrained(fp32_dir)
+        config = getattr(AutoQuantizationConfig, arch)(is_static=False, per_channel=False)
+        quantizer.quantize(save_dir=output_dir, quantization_config=config)
+        model.config.save_pretrained(output_dir)
+    AutoTokenizer.from_pretrained(model_path).save_pretrained(output_dir)
+
+    size_mb = (output_dir / ONNX_QUANTIZED_FILE).stat().st_size / 1e6
+    print(f"✅ Exported {model_path} to {output_dir / ONNX_QUANTIZED_FILE} ({size_mb:.1f} MB, {arch}) "
+          f"in {time.perf_counter() - started:.1f}s")
+
+
+def timed_classify(analyzer, claims):
+    started = time.perf_counter()
+    results = analyzer.classify(claims)
+    return results, time.perf_counter() - started
+
+
+def check_parity(model_path, onnx_dir, claims, min_agreement):
+    """Label agreement and score differences of the int8 export against the fp32 model"""
+    fp32 = EnvironmentalClaimsAnalyzer(model_path, cache_size=0, runtime='torch')
+    int8 = EnvironmentalClaimsAnalyzer(model_path, cache_size=0, runtime='onnx', onnx_dir=onnx_dir)
+    if fp32.classifier is None or int8.classifier is None:
+        print("❌ Could not load both classifiers")
+        return False
+
+    # Warm-up, so the timings below measure inference rather than first-call setup
+    fp32.classify(claims[:2])
+    int8.classify(claims[:2])
+    expected, fp32_seconds = timed_classify(fp32, claims)
+    actual, int8_seconds = timed_classify(int8, claims)
+
+    agree = np.array([e['label'] == a['label'] for e, a in zip(expected, actual)])
+    score_diff = np.array([abs(e['score'] - a['score']) for e, a in zip(expected, actual)])
+    agreement = agree.mean()
+
+    print(f"   • Claims: {len(claims)}")
+    print(f"   • Label agreement: {agreement:.1%} ({int((~agree).sum())} mismatches)")
+    print(f"   • Score difference: mean {score_diff.mean():.4f}, max {score_diff.max():.4f}")
+    print(f"   • Latency: fp32 {fp32_seconds * 1e3:.0f} ms, int8 {int8_seconds * 1e3:.0f} ms "
+          f"({fp32_seconds / int8_seconds:.1f}x)")
+    for i in np.flatnonzero(~agree):
+        print(f"     ⚠️ {expected[i]['label']} -> {actual[i]['label']}: {claims[i]}")
+
+    ok = agreement >= min_agreement
+    print(f"{'✅' if ok else '❌'} Parity {'passed' if ok else 'failed'} (minimum agreement {min_agreement:.0%})")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the claims classifier to quantized ONNX")
+    parser.add_argument('--model', default=CLAIMS_MODEL_PATH, help="Model directory or HuggingFace id")
+    parser.add_argument('--output', type=Path, default=CLAIMS_ONNX_DIR, help="Directory of the int8 export")
+    parser.add_argument('--arch', choices=QUANTIZATION_ARCHS, default='avx2',
+                        help="CPU instruction set the quantized kernels target")
+    parser.add_argument('--check-only', action='store_true', help="Only check parity of an existing export")
+    parser.add_argument('--fixtures', type=Path, default=FIXTURES, help="Claims to check, one per line")
+    parser.add_argument('--min-agreement', type=float, default=0.97, help="Minimum label agreement with fp32")
+    args = parser.parse_args()
+
+    if not args.check_only:
+        export(args.model, args.output, args.arch)
+    elif not (args.output / ONNX_QUANTIZED_FILE).exists():
+        sys.exit(f"❌ No export at {args.output / ONNX_QUANTIZED_FILE}")
+
+    claims = [line.strip() for line in args.fixtures.read_text(encoding='utf-8').splitlines() if line.strip()]
+    print(f"🔍 Checking parity against the fp32 model on {args.fixtures.name}")
+    if not check_parity(args.model, args.output, claims, args.min_agreement):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Export Tree Models to the Compact Inference Format
+==================================================
+
+Compiles the environmental, circularity and classification models in
+``models/aluminum`` and ``models/copper`` into flat array-backed tree tables
+(``<model>.compact/`` next to each pickle) that the backends load instead of
+the joblib pickle. The label encoders are exported alongside them.
+
+Every export is checked for parity against scikit-learn on synthetic rows
+drawn around the models' own split thresholds, and the script reports load
+time and single-row latency for both formats. It exits non-zero if any model
+disagrees.
+
+Usage:
+    python scripts/export_compact_models.py                  # active versions
+    python scripts/export_compact_models.py --all-versions
+    python scripts/export_compact_models.py --check-only     # parity of existing exports
+"""
+
+import argparse
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from shared.compact_trees import compact_path, load_compact, save_compact
+from shared.model_registry import ModelRegistry
+
+MODEL_KINDS = ('environmental', 'circularity', 'classification')
+
+
+def parity_inputs(model, n_rows, seed=0):
+    """Rows whose features sit on, just below and just above the model's split thresholds"""
+    rng = np.random.default_rng(seed)
+    estimators = getattr(model, 'estimators_', [model])
+    X = rng.normal(size=(n_rows, model.n_features_in_))
+
+    for feature in range(model.n_features_in_):
+        thresholds = np.concatenate([
+            estimator.tree_.threshold[estimator.tree_.feature == feature] for estimator in estimators
+        ])
+        if len(thresholds) == 0:
+            continue
+        picks = rng.choice(thresholds, size=n_rows)
+        # Land exactly on a split, a hair to either side, or well past it
+        offsets = rng.choice([0.0, -1e-6, 1e-6, 1.0], size=n_rows) * (np.abs(picks) + 1.0)
+        X[:, feature] = picks + offsets
+    return X
+
+
+def single_row_latency(model, row, repeats=200):
+    started = time.perf_counter()
+    for _ in range(repeats):
+        model.predict(row)
+    return (time.perf_counter() - started) / repeats
+
+
+def check_parity(model, compact, n_rows):
+    """Max absolute difference between scikit-learn and compact predictions (and predict_proba)"""
+    X = parity_inputs(model, n_rows)
+    with warnings.catch_warnings():
+        # The models were fitted on DataFrames; plain arrays are what the backends pass
+        warnings.simplefilter('ignore', UserWarning)
+        expected = model.predict(X)
+        proba = model.predict_proba(X) if hasattr(model, 'predict_proba') else None
+
+    actual = compact.predict(X)
+    if hasattr(model, 'classes_'):
+        mismatches = int(np.sum(expected != actual))
+        max_diff = float(np.abs(proba - compact.predict_proba(X)).max())
+        return mismatches == 0 and max_diff <= 1e-12, f"{mismatches} label mismatches, max proba diff {max_diff:.2e}"
+
+    max_diff = float(np.abs(expected - actual).max())
+    return max_diff <= 1e-12, f"max diff {max_diff:.2e}"
+
+
+def check_encoder_parity(encoder, compact):
+    codes = np.arange(len(encoder.classes_))
+    passed = (
+        np.array_equal(encoder.classes_, compact.classes_)
+        and np.array_equal(encoder.inverse_transform(codes), compact.inverse_transform(codes))
+        and np.array_equal(encoder.transform(encoder.classes_), compact.transform(encoder.classes_))
+    )
+    return passed, f"{len(codes)} classes"
+
+
+def export_encoders(models, args):
+    ok = True
+    for kind in models.artifact_paths:
+        if not kind.endswith('encoder') or not models.is_available(kind):
+            continue
+        path = models.artifact_paths[kind]
+        encoder = joblib.load(path)
+        target = compact_path(path)
+        if not args.check_only:
+            save_compact(encoder, target)
+        elif not target.exists():
+            print(f"  ⚠️ {path.name}: no compact export")
+            continue
+
+        passed, detail = check_encoder_parity(encoder, load_compact(target))
+        ok &= passed
+        print(f"  {'✅' if passed else '❌'} {path.name}: {detail}")
+    return ok
+
+
+def export_version(models, args):
+    ok = export_encoders(models, args)
+    for kind in MODEL_KINDS:
+        if not models.is_available(kind):
+            continue
+        path = models.artifact_paths[kind]
+
+        started = time.perf_counter()
+        model = joblib.load(path)
+        joblib_load = time.perf_counter() - started
+
+        target = compact_path(path)
+        if not args.check_only:
+            save_compact(model, target)
+        elif not target.exists():
+            print(f"  ⚠️ {path.name}: no compact export")
+            continue
+
+        started = time.perf_counter()
+        compact = load_compact(target)
+        compact_load = time.perf_counter() - started
+
+        passed, detail = check_parity(model, compact, args.rows)
+        ok &= passed
+
+        row = parity_inputs(model, 1, seed=1)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)
+            sklearn_latency = single_row_latency(model, row)
+        compact_latency = single_row_latency(compact, row)
+
+        print(f"  {'✅' if passed else '❌'} {path.name}: {detail}")
+        print(f"     load {joblib_load * 1e3:.1f} ms -> {compact_load * 1e3:.1f} ms | "
+              f"single row {sklearn_latency * 1e3:.2f} ms -> {compact_latency * 1e3:.3f} ms")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export tree models to the compact inference format")
+    parser.add_argument('--metal', action='append', help="Metal to export (default: all)")
+    parser.add_argument('--all-versions', action='store_true', help="Export every version, not only the active one")
+    parser.add_argument('--check-only', action='store_true', help="Only check parity of existing exports")
+    parser.add_argument('--rows', type=int, default=20000, help="Rows used for the parity check")
+    args = parser.parse_args()
+
+    registry = ModelRegistry()
+    ok = True
+    for metal in args.metal or registry.metal_artifacts:
+        versions = registry.versions(metal) if args.all_versions else registry.versions(metal)[-1:]
+        for version in versions:
+            print(f"🔬 {metal} {version}")
+            ok &= export_version(registry.version(metal, version), args)
+
+    if not ok:
+        print("❌ Compact models disagree with scikit-learn")
+        sys.exit(1)
+    print("✅ All compact models match scikit-learn")
+
+
+if __name__ == "__main__":
+    main()
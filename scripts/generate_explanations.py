@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Precompute LLM Explanation Summaries
+====================================
+
+Generates the explanation summary of every bucket (energy source, efficiency
+band, process class; see shared/explanations.py) a model version can serve,
+once, and writes them to ``<model dir>/explanations_<version>.json``, where the
+model registry loads them. Serving processes never generate summaries: they
+look them up when ``LCA_LLM_SUMMARIES=1``.
+
+Run it after a version is trained (and again when ``LCA_LLM_MODEL`` changes).
+The process classes come from the version's classification encoder; without
+one only the default classes are covered. Prompts run through the pipeline in
+batches of ``--batch-size``.
+
+Only aluminum has LLM-enhanced explanations for now.
+
+Usage:
+    python scripts/generate_explanations.py
+    python scripts/generate_explanations.py --version 20250919_005442 --batch-size 16
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "backend"))
+
+from shared.explanations import bucket_key, explanation_buckets, explanation_prompt, save_explanations
+from shared.llm_pool import GENERATION_KWARGS, LLM_MODEL, load_text_generation_pipeline
+from shared.model_registry import METAL_ARTIFACTS, registry
+
+METAL = 'aluminum'
+
+
+def generate(llm, buckets, batch_size):
+    summaries = {}
+    for start in range(0, len(buckets), batch_size):
+        batch = buckets[start:start + batch_size]
+        outputs = llm([explanation_prompt(bucket) for bucket in batch], batch_size=len(batch), **GENERATION_KWARGS)
+        for bucket, output in zip(batch, outputs):
+            # One list of candidates per prompt
+            candidate = output[0] if isinstance(output, list) else output
+            summaries[bucket_key(bucket)] = candidate['generated_text'].strip()
+        print(f"   {len(summaries):,}/{len(buckets):,} buckets")
+    return summaries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Precompute LLM explanation summaries for a model version")
+    parser.add_argument('--version', help="Model version (default: the newest)")
+    parser.add_argument('--batch-size', type=int, default=8)
+    args = parser.parse_args()
+
+    version = args.version or registry.versions(METAL)[-1]
+    encoder = registry.version(METAL, version).get('classification_encoder')
+    process_classes = list(encoder.classes_) if encoder is not None else []
+    if encoder is None:
+        print(f"⚠️ No classification encoder in {version}: only the default process classes are covered")
+    buckets = explanation_buckets(process_classes)
+
+    try:
+        started = time.perf_counter()
+        llm = load_text_generation_pipeline()
+    except Exception as e:
+        sys.exit(f"❌ Cannot load the LLM pipeline ({LLM_MODEL}): {e}")
+    print(f"🤖 {LLM_MODEL} loaded in {time.perf_counter() - started:.1f}s; "
+          f"generating {len(buckets):,} summaries for {METAL} {version}")
+
+    started = time.perf_counter()
+    summaries = generate(llm, buckets, args.batch_size)
+    print(f"✅ Generated in {time.perf_counter() - started:.1f}s")
+
+    output = registry.model_dir(METAL) / METAL_ARTIFACTS[METAL]['artifacts']['explanations'].format(version=version)
+    save_explanations(output, {
+        'metal': METAL,
+        'version': version,
+        'created': datetime.now().isoformat(),
+        'llm_model': LLM_MODEL,
+        'summaries': summaries,
+    })
+    print(f"💾 Wrote {output}")
+
+
+if __name__ == '__main__':
+    main()
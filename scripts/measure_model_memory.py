@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Per-Worker Model Memory Report
+==============================
+
+Starts N worker processes the way a multi-worker server would, has each one
+load every active aluminum and copper artifact through the shared registry and
+run a prediction with each model, then reports each worker's resident memory:
+
+    RSS      pages mapped into the worker (shared pages counted in full)
+    PSS      RSS with shared pages split between the processes sharing them
+    Private  pages only this worker holds
+
+Sum of PSS is the physical memory the workers really use. Each loading mode is
+measured separately:
+
+    joblib        pickles deserialized into every worker's heap
+    compact       compact array exports read into the heap
+    compact-mmap  compact exports memory-mapped (the default serving mode)
+
+Workers are spawned, not forked, so nothing is shared through a preloaded
+master (see backend/wsgi.py for that) - any sharing comes from the mmap.
+Compact modes need ``python scripts/export_compact_models.py`` first.
+Linux only for PSS/Private (read from /proc/self/smaps_rollup).
+
+Usage:
+    python scripts/measure_model_memory.py --workers 4
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+
+MODES = {
+    'joblib': {'LCA_COMPACT_MODELS': '0', 'LCA_MMAP_MODELS': '0'},
+    'compact': {'LCA_COMPACT_MODELS': '1', 'LCA_MMAP_MODELS': '0'},
+    'compact-mmap': {'LCA_COMPACT_MODELS': '1', 'LCA_MMAP_MODELS': '1'},
+}
+MODEL_KINDS = ('environmental', 'circularity', 'classification')
+
+
+def memory_usage():
+    """RSS, PSS and private memory of this process in MB (PSS/private None where /proc is unavailable)"""
+    try:
+        fields = {}
+        with open('/proc/self/smaps_rollup') as rollup:
+            for line in rollup:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].endswith(':'):
+                    fields[parts[0][:-1]] = int(parts[1]) / 1024
+        private = fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0)
+        return {'rss': fields['Rss'], 'pss': fields['Pss'], 'private': private}
+    except (OSError, KeyError):
+        import resource
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return {'rss': max_rss / (1024 * 1024 if sys.platform == 'darwin' else 1024), 'pss': None, 'private': None}
+
+
+def worker(mode, barrier, results):
+    os.environ.update(MODES[mode])
+    sys.path.insert(0, str(BACKEND_DIR))
+
+    import logging
+    import warnings
+    import numpy as np
+    logging.disable(logging.WARNING)
+    warnings.filterwarnings('ignore')
+
+    from shared.model_registry import registry
+
+    before = memory_usage()
+    formats = set()
+    for metal in registry.metal_artifacts:
+        # Encoders too, as serving loads them (they are small but import scikit-learn)
+        models = registry.active(metal).preload()
+        for kind in MODEL_KINDS:
+            model = models.get(kind)
+            if model is not None:
+                model.predict(np.zeros((1, model.n_features_in_)))
+                formats.add(models.formats[kind])
+
+    # Measure once every worker has loaded, so PSS reflects the pages they share
+    barrier.wait()
+    after = memory_usage()
+    results.put((os.getpid(), before, after, sorted(formats)))
+    barrier.wait()
+
+
+def measure(mode, n_workers):
+    context = multiprocessing.get_context('spawn')
+    barrier = context.Barrier(n_workers)
+    results = context.Queue()
+    processes = [context.Process(target=worker, args=(mode, barrier, results)) for _ in range(n_workers)]
+    for process in processes:
+        process.start()
+    reports = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return reports
+
+
+def fmt(value):
+    return f"{value:8.1f}" if value is not None else "     n/a"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report resident memory per worker for each model loading mode")
+    parser.add_argument('--workers', type=int, default=4, help="Worker processes per mode")
+    parser.add_argument('--modes', nargs='+', choices=list(MODES), default=list(MODES))
+    args = parser.parse_args()
+
+    print(f"📏 Resident memory per worker (MB), {args.workers} workers")
+    for mode in args.modes:
+        reports = measure(mode, args.workers)
+        print(f"\n🔬 {mode}  (loaded as: {', '.join(reports[0][3]) or 'nothing'})")
+        print(f"   {'pid':>7} {'RSS before':>11} {'RSS after':>10} {'PSS':>8} {'Private':>8}")
+        for pid, before, after, _ in reports:
+            print(f"   {pid:>7} {fmt(before['rss']):>11} {fmt(after['rss']):>10} {fmt(after['pss'])} {fmt(after['private'])}")
+
+        model_rss = [after['rss'] - before['rss'] for _, before, after, _ in reports]
+        print(f"   models add {sum(model_rss) / len(model_rss):.1f} MB RSS per worker", end='')
+        if reports[0][2]['pss'] is not None:
+            print(f"; total PSS {sum(after['pss'] for _, _, after, _ in reports):.1f} MB")
+        else:
+            print()
+
+
+if __name__ == "__main__":
+    main()
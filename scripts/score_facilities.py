@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Bulk Facility Scoring
+=====================
+
+Scores a facility file (shaped like ``data/copper/copper_industry_dataset.csv``)
+with a metal's assessment pipeline and streams the predictions to CSV or
+Parquet. The input is read in fixed-size chunks and every chunk is scored
+column-wise (one predict call per model per chunk), so memory stays bounded
+by the chunk size whatever the file size.
+
+Dataset columns are mapped to assessment fields by
+``shared.feature_builders.DATASET_COLUMNS`` (fractions are rescaled to the
+percentages the API takes); columns already named like assessment_data keys
+(``productionScale``, ``energySource``...) are used as they are. The output
+keeps the input columns and adds one ``predicted_*`` column per model output
+and LCA metric, plus ``predicted_model_version``.
+
+``--workers N`` scores chunks in N processes (0 = all cores); chunks are still
+written in input order, and at most ``2 * N`` are held in memory at once.
+Parquet input/output needs pyarrow.
+
+Usage:
+    python scripts/score_facilities.py data/copper/copper_industry_dataset.csv scores.csv --metal copper
+    python scripts/score_facilities.py facilities.parquet scores.parquet --metal aluminum --workers 0
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+OUTPUT_PREFIX = 'predicted_'
+
+_pipeline = None
+
+
+def file_format(path, explicit=None):
+    if explicit:
+        return explicit
+    return 'parquet' if Path(path).suffix.lower() in ('.parquet', '.pq') else 'csv'
+
+
+def require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        sys.exit("❌ Parquet files need pyarrow: pip install pyarrow")
+    return pyarrow
+
+
+def read_chunks(path, fmt, chunk_size):
+    """Yield the input file as DataFrames of at most chunk_size rows"""
+    if fmt == 'parquet':
+        pa = require_pyarrow()
+        for batch in pa.parquet.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+class ChunkWriter:
+    """Appends scored chunks to a CSV or Parquet file"""
+
+    def __init__(self, path, fmt):
+        self.path = path
+        self.fmt = fmt
+        self._writer = None
+        self._header = True
+
+    def write(self, frame):
+        if self.fmt == 'parquet':
+            pa = require_pyarrow()
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._writer is None:
+                self._writer = pa.parquet.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table.cast(self._writer.schema))
+        else:
+            frame.to_csv(self.path, mode='w' if self._header else 'a', header=self._header, index=False)
+            self._header = False
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def init_worker(metal):
+    """Load the pipeline (and, lazily, its active models) once per process"""
+    global _pipeline
+    import logging
+    import warnings
+    logging.disable(logging.WARNING)
+    warnings.filterwarnings('ignore')
+
+    from shared.pipelines import get_pipeline
+    _pipeline = get_pipeline(metal)
+
+
+def score_chunk(frame, keep_input=True):
+    from shared.feature_builders import dataset_columns
+
+    models = _pipeline.active_models()
+    columns = _pipeline.score_columns(dataset_columns(frame), models)
+    scores = pd.DataFrame({f"{OUTPUT_PREFIX}{name}": values for name, values in columns.items()},
+                          index=frame.index)
+    scores[f"{OUTPUT_PREFIX}model_version"] = models.version
+    return pd.concat([frame, scores], axis=1) if keep_input else scores
+
+
+def score_file(args):
+    in_format = file_format(args.input, args.input_format)
+    out_format = file_format(args.output, args.output_format)
+    workers = args.workers if args.workers > 0 else os.cpu_count()
+    writer = ChunkWriter(args.output, out_format)
+
+    rows = 0
+    started = time.perf_counter()
+
+    def written(frame):
+        nonlocal rows
+        writer.write(frame)
+        rows += len(frame)
+        print(f"  {rows:>10,} rows  {rows / (time.perf_counter() - started):>10,.0f} rows/s", flush=True)
+
+    chunks = read_chunks(args.input, in_format, args.chunk_size)
+    try:
+        if workers == 1:
+            init_worker(args.metal)
+            for chunk in chunks:
+                written(score_chunk(chunk, not args.scores_only))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                     initargs=(args.metal,)) as executor:
+                # Bounded read-ahead keeps memory flat; results are written in submission order
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(executor.submit(score_chunk, chunk, not args.scores_only))
+                    if len(pending) >= 2 * workers:
+                        written(pending.popleft().result())
+                while pending:
+                    written(pending.popleft().result())
+    finally:
+        writer.close()
+
+    return rows, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a facility file in chunks and stream the results out")
+    parser.add_argument('input', help="Facility CSV or Parquet file")
+    parser.add_argument('output', help="Output CSV or Parquet file")
+    parser.add_argument('--metal', required=True, choices=['aluminum', 'copper'])
+    parser.add_argument('--chunk-size', type=int, default=10000, help="Rows per chunk")
+    parser.add_argument('--workers', type=int, default=1, help="Scoring processes (0 = all cores)")
+    parser.add_argument('--input-format', choices=['csv', 'parquet'], help="Default: from the file extension")
+    parser.add_argument('--output-format', choices=['csv', 'parquet'], help="Default: from the file extension")
+    parser.add_argument('--scores-only', action='store_true', help="Write only the predicted_* columns")
+    args = parser.parse_args()
+
+    print(f"🔬 Scoring {args.input} with the {args.metal} pipeline -> {args.output}")
+    rows, elapsed = score_file(args)
+    print(f"✅ Scored {rows:,} rows in {elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
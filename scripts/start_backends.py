@@ -3,7 +3,8 @@
 Quick Start Script for LCA Backend Services
 ==========================================
 
-This script starts both aluminum and copper backend services.
+This script starts the aluminum and copper backend services, or the unified
+service that serves every metal from one process.
 """
 
 import subprocess
@@ -26,19 +27,22 @@ def main():
     # Backend paths
     aluminum_app = project_root / "backend" / "aluminum" / "app.py"
     copper_app = project_root / "backend" / "copper" / "app.py"
+    service_app = project_root / "backend" / "service" / "app.py"
     
     print("\n📋 Services to start:")
     print(f"  • Aluminum API: {aluminum_app}")
     print(f"  • Copper API: {copper_app}")
+    print(f"  • Unified API: {service_app}")
     
     print("\n" + "=" * 50)
     print("Choose an option:")
     print("  1. Start Aluminum Backend (Port 5000)")
     print("  2. Start Copper Backend (Port 5001)")
     print("  3. Start Both (in separate windows)")
-    print("  4. Exit")
+    print("  4. Start Unified Service, all metals (Port 8000)")
+    print("  5. Exit")
     
-    choice = input("\nEnter choice (1-4): ").strip()
+    choice = input("\nEnter choice (1-5): ").strip()
     
     if choice == "1":
         print("\n🔬 Starting Aluminum Backend...")
@@ -62,6 +66,10 @@ def main():
             print("✅ Both backends started in separate terminals")
     
     elif choice == "4":
+        print("\n🔬 Starting Unified Service...")
+        subprocess.run([str(python_exe), str(service_app)])
+    
+    elif choice == "5":
         print("\n👋 Goodbye!")
         return
     